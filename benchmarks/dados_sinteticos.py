@@ -0,0 +1,119 @@
+"""Gera catálogos, históricos, logs, planilhas de upload e NF-e sintéticos (reprodutíveis pela semente)."""
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+PRODUTOS = ["ARROZ", "FEIJAO", "ACUCAR", "CAFE", "LEITE", "OLEO", "MACARRAO", "FARINHA", "SABAO", "DETERGENTE",
+            "BISCOITO", "REFRIGERANTE", "SUCO", "AGUA", "MARGARINA", "SAL", "MOLHO", "SARDINHA", "ACHOCOLATADO", "PAPEL"]
+MARCAS = ["TIO JOAO", "CAMIL", "UNIAO", "PILAO", "ITALAC", "SOYA", "RENATA", "DONA BENTA", "OMO", "YPE",
+          "PIRAQUE", "COCA COLA", "DEL VALLE", "INDAIA", "QUALY", "CISNE", "POMAROLA", "GOMES DA COSTA", "NESCAU", "NEVE"]
+VARIANTES = ["TIPO 1", "CARIOCA", "REFINADO", "TRADICIONAL", "INTEGRAL", "ZERO", "LIGHT", "ORIGINAL", "LIMAO", "UVA"]
+MEDIDAS = ["1KG", "500G", "5KG", "1L", "2L", "350ML", "200G", "900ML", "250G", "12UN"]
+FORNECEDORES = ["ATACADAO", "ASSAI", "MAKRO", "DISTRIBUIDORA NORTE", "COMERCIAL MANAUS"]
+
+
+def nomes_produtos(n, rng):
+    return [f"{rng.choice(PRODUTOS)} {rng.choice(MARCAS)} {rng.choice(VARIANTES)} {rng.choice(MEDIDAS)} {i}" for i in range(n)]
+
+
+def gerar_catalogo(n, semente=42):
+    """Aba de estoque com n produtos (todos os campos como texto, igual vem da planilha)."""
+    rng = random.Random(semente)
+    nomes = nomes_produtos(n, rng)
+    hoje = datetime(2026, 1, 1)
+    linhas = []
+    for i, nome in enumerate(nomes):
+        custo = round(rng.uniform(1, 50), 2)
+        linhas.append({
+            'código de barras': str(7890000000000 + i), 'nome do produto': nome,
+            'qtd.estoque': str(rng.randint(0, 80)), 'qtd_central': str(rng.randint(0, 200)), 'qtd_minima': str(rng.randint(2, 15)),
+            'validade': (hoje + timedelta(days=rng.randint(-30, 400))).strftime("%d/%m/%Y") if rng.random() < 0.7 else "",
+            'status_compra': 'OK', 'qtd_comprada': '0', 'preco_custo': str(custo).replace('.', ','),
+            'preco_venda': str(round(custo * 1.4, 2)), 'categoria': 'GERAL', 'ultimo_fornecedor': rng.choice(FORNECEDORES),
+            'preco_sem_desconto': str(custo), 'status': 'Ativo',
+        })
+    return pd.DataFrame(linhas)
+
+
+def com_duplicados(catalogo, fracao=0.1, semente=42):
+    """Acrescenta linhas repetidas (mesmo código de barras, nome às vezes diferente) para a unificação."""
+    rng = random.Random(semente)
+    extras = catalogo.sample(frac=fracao, random_state=semente).copy()
+    extras['nome do produto'] = [n if rng.random() < 0.5 else n + " PROMO" for n in extras['nome do produto']]
+    return pd.concat([catalogo, extras], ignore_index=True)
+
+
+def gerar_historico(catalogo, n, semente=42):
+    rng = random.Random(semente)
+    nomes = catalogo['nome do produto'].tolist()
+    inicio = datetime(2025, 1, 1)
+    linhas = []
+    for i in range(n):
+        qtd = rng.randint(1, 48)
+        preco = round(rng.uniform(1, 50), 2)
+        data = inicio + timedelta(minutes=rng.randint(0, 525600))
+        linhas.append({'data': str(data), 'data_emissao': data.strftime("%d/%m/%Y %H:%M"), 'produto': rng.choice(nomes),
+                       'fornecedor': rng.choice(FORNECEDORES), 'qtd': str(qtd), 'preco_pago': str(preco), 'total_gasto': str(round(qtd * preco, 2)),
+                       'numero_nota': str(100000 + i // 20), 'desconto_total_money': '0', 'preco_sem_desconto': str(preco), 'obs_importacao': ''})
+    return pd.DataFrame(linhas)
+
+
+def gerar_log_auditoria(catalogo, n, semente=42):
+    rng = random.Random(semente)
+    nomes = catalogo['nome do produto'].tolist()
+    inicio = datetime(2025, 1, 1)
+    return pd.DataFrame([{'data_hora': str(inicio + timedelta(seconds=rng.randint(0, 31536000))), 'produto': rng.choice(nomes),
+                          'qtd_antes': str(rng.randint(0, 50)), 'qtd_nova': str(rng.randint(0, 50)), 'acao': 'Ajuste', 'motivo': 'Manual'}
+                         for _ in range(n)])
+
+
+def gerar_vendas(catalogo, n, semente=42):
+    rng = random.Random(semente)
+    nomes = catalogo['nome do produto'].tolist()
+    inicio = datetime(2025, 1, 1)
+    return pd.DataFrame([{'data_hora': str(inicio + timedelta(seconds=rng.randint(0, 31536000))), 'produto': rng.choice(nomes),
+                          'qtd_vendida': str(rng.randint(1, 5)), 'estoque_restante': str(rng.randint(0, 50))}
+                         for _ in range(n)])
+
+
+def gerar_picklist(catalogo, n, semente=42):
+    """Planilha de transferência: códigos do catálogo (alguns inexistentes) e quantidades."""
+    rng = random.Random(semente)
+    codigos = catalogo['código de barras'].tolist()
+    return pd.DataFrame({'CODIGO': [rng.choice(codigos) if rng.random() < 0.95 else str(1000 + i) for i in range(n)],
+                         'QTD': [rng.randint(1, 12) for _ in range(n)]})
+
+
+def gerar_planograma(catalogo, n, semente=42):
+    """Planograma lido com header=None: primeira linha é o título, colunas posicionais."""
+    rng = random.Random(semente)
+    amostra = catalogo.sample(n=min(n, len(catalogo)), random_state=semente)
+    linhas = [['CODIGO', 'NOME', 'PRECO', 'QTD']]
+    linhas += [[c, nome, round(rng.uniform(1, 70), 2), rng.randint(0, 60)] for c, nome in zip(amostra['código de barras'], amostra['nome do produto'])]
+    linhas += [[str(5000000 + i), f"PRODUTO NOVO {i}", 9.9, 3] for i in range(max(0, n - len(amostra)))]
+    return pd.DataFrame(linhas)
+
+
+def gerar_relatorio_vendas(catalogo, n, semente=42):
+    rng = random.Random(semente)
+    nomes = catalogo['nome do produto'].tolist()
+    return pd.DataFrame({'PRODUTO': [rng.choice(nomes) for _ in range(n)], 'QTD': [rng.randint(1, 4) for _ in range(n)],
+                         'DATA': ["01/02/2026"] * n})
+
+
+def gerar_xml_nfe(catalogo, n_itens, semente=42):
+    """NF-e (layout SEFAZ) com n_itens; ~30% dos itens sem GTIN para exercitar o match por nome."""
+    rng = random.Random(semente)
+    amostra = catalogo.sample(n=n_itens, replace=n_itens > len(catalogo), random_state=semente)
+    dets = []
+    for i, (cod, nome) in enumerate(zip(amostra['código de barras'], amostra['nome do produto']), start=1):
+        qtd = rng.randint(1, 24)
+        preco = round(rng.uniform(1, 50), 2)
+        ean = "SEM GTIN" if rng.random() < 0.3 else cod
+        dets.append(f'<det nItem="{i}"><prod><cProd>{i}</cProd><cEAN>{ean}</cEAN><xProd>{escape(nome)}</xProd>'
+                    f'<qCom>{qtd}.0000</qCom><vProd>{qtd * preco:.2f}</vProd><vDesc>0.00</vDesc></prod></det>')
+    return ('<?xml version="1.0" encoding="UTF-8"?><nfeProc xmlns="http://www.portalfiscal.inf.br/nfe"><NFe><infNFe>'
+            '<ide><nNF>123456</nNF><dhEmi>2026-01-15T10:30:00-04:00</dhEmi></ide><emit><xNome>ATACADAO</xNome></emit>'
+            + "".join(dets) + '</infNFe></NFe></nfeProc>').encode('utf-8')
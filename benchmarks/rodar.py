@@ -0,0 +1,232 @@
+"""
+Benchmarks offline do app: sem credenciais do Google, com a planilha servida de CSVs locais
+(planilha_local.py) e latência de rede simulada.
+
+    python benchmarks/rodar.py
+    python benchmarks/rodar.py --escalas 1000 10000 100000 --latencia-ms 150
+    python benchmarks/rodar.py --comparar benchmarks/resultados/antes.json benchmarks/resultados/depois.json
+
+Os resultados vão para benchmarks/resultados/<data>_<commit>.json.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import dados_sinteticos as ds  # noqa: E402
+import planilha_local  # noqa: E402
+
+PREFIXO = "loja1"
+
+
+def carregar_app():
+    """Junta as funções do núcleo num dicionário (importar o núcleo não desenha nada na tela)."""
+    import streamlit as st
+    from nucleo import auditoria, busca, compras, estoque, metricas, planilha
+    app = {'st': st}
+    for modulo in (metricas, planilha, busca, estoque, compras, auditoria): app.update(vars(modulo))
+    return app
+
+
+def chamadas_api(app):
+    return getattr(app['CONTEXTO_METRICAS'], 'chamadas_api', 0)
+
+
+# --- CENÁRIOS: cada um devolve (preparar, executar); só o executar é cronometrado ---
+def cenario_carregar_dados(app, dados):
+    return app['st'].cache_data.clear, lambda: app['carregar_dados'](PREFIXO)
+
+def cenario_salvar_no_google(app, dados):
+    return None, lambda: app['salvar_no_google'](dados['estoque_bruto'], f"{PREFIXO}_estoque")
+
+def cenario_ler_xml_nfe(app, dados):
+    return None, lambda: app['ler_xml_nfe'](BytesIO(dados['xml']), dados['df'])
+
+def cenario_encontrar_melhor_match(app, dados):
+    opcoes = dados['df']['nome do produto'].tolist()
+    buscas = dados['buscas']
+    return None, lambda: [app['encontrar_melhor_match'](b, opcoes) for b in buscas]
+
+def cenario_unificar(app, dados):
+    return None, lambda: app['unificar_produtos_por_codigo'](dados['df_duplicado'].copy())
+
+def cenario_picklist(app, dados):
+    estado = {}
+    def preparar(): estado['df'] = dados['df'].copy()
+    return preparar, lambda: app['aplicar_picklist'](estado['df'], dados['picklist'], 'CODIGO', 'QTD')
+
+def cenario_planograma(app, dados):
+    estado = {}
+    def preparar(): estado['df'] = dados['df'].copy()
+    return preparar, lambda: app['sincronizar_planograma'](estado['df'], dados['planograma'], 0, 1, 3, 2)
+
+def cenario_vendas(app, dados):
+    estado = {}
+    def preparar(): estado['df'] = dados['df'].copy()
+    return preparar, lambda: app['baixar_vendas_relatorio'](estado['df'], dados['relatorio_vendas'], 'PRODUTO', 'QTD')
+
+def cenario_registrar_auditoria(app, dados):
+    return None, lambda: app['registrar_auditoria'](PREFIXO, "PRODUTO BENCHMARK", 1, 2, "Benchmark")
+
+def cenario_consultar_auditoria(app, dados):
+    from datetime import date
+    return app['st'].cache_data.clear, lambda: app['consultar_auditoria'](PREFIXO, date(2025, 3, 1), date(2025, 3, 31))
+
+CENARIOS = {
+    'carregar_dados': cenario_carregar_dados,
+    'salvar_no_google': cenario_salvar_no_google,
+    'ler_xml_nfe': cenario_ler_xml_nfe,
+    'encontrar_melhor_match': cenario_encontrar_melhor_match,
+    'unificar_produtos_por_codigo': cenario_unificar,
+    'picklist': cenario_picklist,
+    'planograma': cenario_planograma,
+    'baixar_vendas': cenario_vendas,
+    'registrar_auditoria': cenario_registrar_auditoria,
+    'consultar_auditoria': cenario_consultar_auditoria,
+}
+
+
+def preparar_dados(app, pasta, escala, semente):
+    """Gera a massa sintética da escala e grava as abas da loja na planilha local."""
+    estoque = ds.gerar_catalogo(escala, semente)
+    abas = {
+        f"{PREFIXO}_estoque": estoque,
+        f"{PREFIXO}_historico_compras": ds.gerar_historico(estoque, escala, semente),
+        f"{PREFIXO}_log_auditoria": ds.gerar_log_auditoria(estoque, escala, semente),
+        f"{PREFIXO}_vendas": ds.gerar_vendas(estoque, escala, semente),
+    }
+    planilha = planilha_local.abrir(pasta, latencia_ms=0)
+    for nome, df_aba in abas.items():
+        planilha.add_worksheet(nome).gravar([df_aba.columns.tolist()] + df_aba.astype(str).values.tolist())
+    app['st'].cache_data.clear()
+    app['particionar_log_legado'](PREFIXO)  # Log de auditoria nas abas mensais, como depois da migração
+    df = app['carregar_dados'](PREFIXO)
+    n_lote = max(10, escala // 10)
+    return {
+        'estoque_bruto': estoque,
+        'df': df,
+        'df_duplicado': ds.com_duplicados(df, 0.1, semente),
+        'xml': ds.gerar_xml_nfe(df, n_lote, semente),
+        'buscas': df['nome do produto'].sample(n=min(50, len(df)), random_state=semente).str.rsplit(' ', n=1).str[0].tolist(),
+        'picklist': ds.gerar_picklist(df, n_lote, semente),
+        'planograma': ds.gerar_planograma(df, n_lote, semente),
+        'relatorio_vendas': ds.gerar_relatorio_vendas(df, n_lote, semente),
+    }
+
+
+def cronometrar(app, preparar, executar, repeticoes):
+    tempos, chamadas = [], []
+    for _ in range(repeticoes):
+        if preparar: preparar()
+        antes = chamadas_api(app)
+        inicio = time.perf_counter()
+        executar()
+        tempos.append(time.perf_counter() - inicio)
+        chamadas.append(chamadas_api(app) - antes)
+    return tempos, chamadas
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def rodar(args):
+    pasta = tempfile.mkdtemp(prefix="bench_planilha_")
+    os.environ.update({
+        "PLANILHA_LOCAL": pasta,
+        "PLANILHA_LOCAL_LATENCIA_MS": str(args.latencia_ms),
+        "PASTA_CACHE_COLUNAR": os.path.join(pasta, ".cache_colunar"),
+        "ARQUIVO_METRICAS": os.path.join(pasta, "metricas.sqlite"),
+        "ARQUIVO_DIARIO": os.path.join(pasta, "diario.sqlite"),
+        # A planilha local não tem cota: o token bucket não pode entrar na medição
+        "COTA_LEITURAS_POR_MINUTO": "1000000",
+        "COTA_ESCRITAS_POR_MINUTO": "1000000",
+    })
+    app = carregar_app()
+    import pandas as pd
+
+    escolhidos = args.cenarios or list(CENARIOS)
+    resultados = []
+    ultimo = {}  # cenário -> (escala, mediana) para estimar a próxima escala
+    for escala in sorted(args.escalas):
+        print(f"\n=== escala {escala:,} ===")
+        dados = preparar_dados(app, pasta, escala, args.semente)
+        for nome in escolhidos:
+            registro = {'cenario': nome, 'escala': escala, 'repeticoes': args.repeticoes}
+            if nome in ultimo:
+                escala_ant, mediana_ant = ultimo[nome]
+                estimativa = mediana_ant * escala / escala_ant
+                if estimativa * args.repeticoes > args.limite_segundos:
+                    registro.update({'status': 'pulado', 'estimativa_s': round(estimativa, 3)})
+                    resultados.append(registro)
+                    print(f"  {nome:<30} pulado (estimativa {estimativa:.1f}s por execução)")
+                    continue
+            preparar, executar = CENARIOS[nome](app, dados)
+            tempos, chamadas = cronometrar(app, preparar, executar, args.repeticoes)
+            mediana = statistics.median(tempos)
+            ultimo[nome] = (escala, mediana)
+            registro.update({'status': 'ok', 'tempos_s': [round(t, 5) for t in tempos], 'mediana_s': round(mediana, 5),
+                             'min_s': round(min(tempos), 5), 'chamadas_api': max(chamadas)})
+            resultados.append(registro)
+            print(f"  {nome:<30} mediana {mediana:9.4f}s  mín {min(tempos):9.4f}s  API {max(chamadas)}")
+
+    saida = args.saida or os.path.join(RAIZ, "benchmarks", "resultados", f"{time.strftime('%Y%m%d_%H%M%S')}_{commit_atual()}.json")
+    os.makedirs(os.path.dirname(saida), exist_ok=True)
+    meta = {'commit': commit_atual(), 'data': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(),
+            'pandas': pd.__version__, 'plataforma': platform.platform(), 'latencia_ms': args.latencia_ms,
+            'semente': args.semente, 'escalas': sorted(args.escalas)}
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump({'meta': meta, 'resultados': resultados}, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em {saida}")
+
+
+def comparar(caminho_antes, caminho_depois, tolerancia):
+    """Compara medianas de dois resultados; sai com código 1 se algum cenário piorou além da tolerância."""
+    with open(caminho_antes, encoding="utf-8") as f: antes = json.load(f)
+    with open(caminho_depois, encoding="utf-8") as f: depois = json.load(f)
+    base = {(r['cenario'], r['escala']): r for r in antes['resultados'] if r['status'] == 'ok'}
+    print(f"{'cenário':<30} {'escala':>8} {'antes (s)':>11} {'depois (s)':>11} {'razão':>7}")
+    piorou = []
+    for r in depois['resultados']:
+        chave = (r['cenario'], r['escala'])
+        if r['status'] != 'ok' or chave not in base: continue
+        razao = r['mediana_s'] / base[chave]['mediana_s'] if base[chave]['mediana_s'] else float('inf')
+        marca = "  ⚠️" if razao > tolerancia else ""
+        if razao > tolerancia: piorou.append(chave)
+        print(f"{r['cenario']:<30} {r['escala']:>8} {base[chave]['mediana_s']:>11.4f} {r['mediana_s']:>11.4f} {razao:>6.2f}x{marca}")
+    print(f"\n{antes['meta']['commit']} -> {depois['meta']['commit']}: {len(piorou)} cenário(s) acima de {tolerancia:.2f}x")
+    return 1 if piorou else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline do app (planilha local com latência simulada).")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--cenarios", nargs="+", choices=list(CENARIOS))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latência simulada por chamada à planilha.")
+    parser.add_argument("--limite-segundos", type=float, default=120.0, help="Pula a escala se a estimativa passar disso.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"))
+    parser.add_argument("--tolerancia", type=float, default=1.2, help="Razão depois/antes considerada regressão.")
+    args = parser.parse_args()
+    if args.comparar:
+        sys.exit(comparar(*args.comparar, args.tolerancia))
+    rodar(args)
+
+
+if __name__ == "__main__":
+    main()
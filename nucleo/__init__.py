@@ -0,0 +1 @@
+"""Núcleo do app (dados e regras), importável sem desenhar nada na tela."""
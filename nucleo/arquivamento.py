@@ -0,0 +1,85 @@
+"""Arquivamento: linhas antigas de vendas, movimentações e histórico de compras saem das abas do dia a dia para abas anuais."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+from nucleo.util import linhas_ainda_ausentes, obter_hora_manaus
+from nucleo.planilha import anexar_no_google, carregar_do_google, ler_aba_sem_cache, listar_abas, salvar_no_google
+from nucleo.auditoria import compactar_indice_auditoria
+
+# ==============================================================================
+# 🗄️ ARQUIVO ANUAL (JANELA QUENTE + ABAS {aba}_arquivo_AAAA)
+# ==============================================================================
+# Sufixo da aba -> coluna de data usada para decidir o que é antigo
+ABAS_ARQUIVAVEIS = {"_vendas": "data_hora", "_movimentacoes": "data_hora", "_historico_compras": "data"}
+MESES_JANELA_QUENTE = int(os.environ.get("MESES_JANELA_QUENTE", "12"))  # Abas do dia a dia guardam só esse período
+COLUNA_ORIGEM_ARQUIVO = 'origem_arquivo'  # Marca as linhas que vieram do arquivo (incluir_arquivo=True)
+
+def aba_arquivo(prefixo, sufixo, ano):
+    return f"{prefixo}{sufixo}_arquivo_{ano}"
+
+def datas_da_coluna(serie):
+    return pd.to_datetime(serie.fillna("").astype(str).str[:19], errors='coerce', format='mixed')
+
+def arquivar_linhas_antigas(prefixo, meses=MESES_JANELA_QUENTE):
+    """
+    Move para as abas anuais as linhas mais antigas que a janela (linhas sem data legível ficam).
+    Leituras direto da nuvem (erro levanta, nada de tabela vazia no lugar): um ano cuja aba anual não pôde
+    ser lida ou gravada continua na aba quente. A aba anual só recebe as linhas que ainda não tem e a aba
+    quente só é regravada depois: se cair no meio, repetir não perde nem duplica nada. Devolve {aba: linhas movidas}.
+    """
+    limite = obter_hora_manaus() - pd.DateOffset(months=meses)
+    movidas = {}
+    for sufixo, col_data in ABAS_ARQUIVAVEIS.items():
+        aba = f"{prefixo}{sufixo}"
+        try: df_quente = ler_aba_sem_cache(aba)
+        except Exception as e:
+            print(f"Erro arquivamento ({aba}): {e}")
+            continue
+        if df_quente.empty or col_data not in df_quente.columns: continue
+        datas = datas_da_coluna(df_quente[col_data])
+        antigas = (datas < limite).to_numpy()
+        if not antigas.any(): continue
+        anos = datas.dt.year.to_numpy()
+        arquivadas = np.zeros(len(df_quente), dtype=bool)
+        for ano, df_ano in df_quente[antigas].groupby(anos[antigas]):
+            aba_ano = aba_arquivo(prefixo, sufixo, int(ano))
+            try: df_arquivo = ler_aba_sem_cache(aba_ano)
+            except Exception as e:
+                print(f"Erro arquivamento ({aba_ano}), o ano fica na aba quente: {e}")
+                continue
+            if anexar_no_google(linhas_ainda_ausentes(df_ano, df_arquivo), aba_ano): arquivadas |= antigas & (anos == ano)
+        if arquivadas.any() and salvar_no_google(df_quente[~arquivadas], aba, permitir_vazio=True):
+            movidas[aba] = int(arquivadas.sum())
+    return movidas
+
+@st.cache_resource(show_spinner="Arquivando registros antigos...")
+def arquivar_se_vencido(prefixo):
+    """Uma vez por processo e loja: mantém as abas quentes dentro da janela e compacta o índice do log de auditoria."""
+    try:
+        movidas = arquivar_linhas_antigas(prefixo)
+        compactar_indice_auditoria(prefixo)
+        return movidas
+    except Exception as e:
+        print(f"Erro arquivamento: {e}")
+        return {}
+
+def carregar_arquivo(prefixo, sufixo):
+    """Todas as abas anuais da aba (mais antigas primeiro), com a coluna de origem preenchida."""
+    inicio = f"{prefixo}{sufixo}_arquivo_"
+    partes = []
+    for aba in sorted(t for t in listar_abas() if t.startswith(inicio)):
+        df_ano = carregar_do_google(aba)
+        if not df_ano.empty: partes.append(df_ano.assign(**{COLUNA_ORIGEM_ARQUIVO: aba}))
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+def juntar_com_arquivo(df_quente, prefixo, sufixo):
+    """Arquivo + aba quente numa tabela só; as linhas quentes ficam com a origem vazia."""
+    df_arq = carregar_arquivo(prefixo, sufixo)
+    if df_arq.empty: return df_quente
+    return pd.concat([df_arq, df_quente.assign(**{COLUNA_ORIGEM_ARQUIVO: ""})], ignore_index=True)
+
+def somente_linhas_quentes(df):
+    """Antes de gravar a aba quente: tira as linhas que vieram do arquivo (elas continuam nas abas anuais)."""
+    if COLUNA_ORIGEM_ARQUIVO not in df.columns: return df
+    return df[df[COLUNA_ORIGEM_ARQUIVO].fillna("") == ""].drop(columns=COLUNA_ORIGEM_ARQUIVO)
@@ -0,0 +1,60 @@
+"""Leitura de planilhas enviadas pelo usuário (uploads)."""
+import streamlit as st
+import pandas as pd
+from io import BytesIO
+import hashlib
+
+# --- 📂 LEITURA DE UPLOADS (UMA VEZ POR ARQUIVO, REAPROVEITADA ENTRE RERUNS) ---
+def motor_excel():
+    """Usa o leitor calamine (rápido, só leitura) quando instalado; senão o padrão do pandas (openpyxl read-only)."""
+    try:
+        import python_calamine
+        return "calamine"
+    except ImportError:
+        return None
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def ler_planilha_upload_bruta(chave, nome, _conteudo):
+    """
+    Lê o arquivo enviado uma única vez, sem cabeçalho (linha 0 = primeira linha do arquivo).
+    A chave é o hash do conteúdo; `_conteudo` não entra no hash do cache.
+    """
+    buffer = BytesIO(_conteudo)
+    if nome.lower().endswith('.csv'): return pd.read_csv(buffer, header=None, dtype=str)
+    return pd.read_excel(buffer, header=None, engine=motor_excel())
+
+def nomes_das_colunas(linha):
+    """Cabeçalho como o pandas monta: célula vazia vira 'Unnamed: i' e nome repetido ganha '.1', '.2'..."""
+    nomes, vistos = [], {}
+    for i, valor in enumerate(linha):
+        nome = valor if pd.notna(valor) else f"Unnamed: {i}"
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        vistos.setdefault(nome, 0)
+        nomes.append(nome)
+    return nomes
+
+def tipar_colunas(df):
+    """Tipos de cada coluna depois do recorte, como o pandas infere na leitura: coluna de texto só com números vira número."""
+    df = df.infer_objects()
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col]): continue
+        numeros = pd.to_numeric(df[col], errors='coerce')
+        if numeros.notna().sum() == df[col].notna().sum(): df[col] = numeros
+    return df
+
+def ler_planilha_upload(arquivo, header=0, nrows=None, tipar=True):
+    """
+    Lê um upload (xlsx/xls/csv) uma única vez: reruns, trocas da linha de cabeçalho e prévias (nrows)
+    são recortes da mesma leitura crua, guardada pelo hash do arquivo.
+    tipar=False devolve as células como foram lidas (para códigos/IDs: número grande não passa por float
+    e zero à esquerda não some).
+    """
+    conteudo = arquivo.getvalue()
+    df_bruto = ler_planilha_upload_bruta(hashlib.md5(conteudo).hexdigest(), arquivo.name, conteudo)
+    inicio = 0 if header is None else header + 1
+    df = df_bruto.iloc[inicio:] if nrows is None else df_bruto.iloc[inicio:inicio + nrows]
+    if header is not None: df = df.set_axis(nomes_das_colunas(df_bruto.iloc[header]) if header < len(df_bruto) else df.columns, axis=1)
+    df = df.reset_index(drop=True)
+    return tipar_colunas(df) if tipar else df
@@ -0,0 +1,111 @@
+"""Log de auditoria particionado por mês (uma aba por mês) com índice produto/mês para consultas por período."""
+import pandas as pd
+from nucleo.util import linhas_ainda_ausentes, normalizar_para_busca, normalizar_serie_texto, obter_hora_manaus
+from nucleo.planilha import anexar_no_google, carregar_do_google, ler_aba_sem_cache, salvar_no_google
+
+# ==============================================================================
+# 🔐 LOG DE AUDITORIA (ABAS MENSAIS + ÍNDICE)
+# ==============================================================================
+# {prefixo}_log_auditoria_AAAA_MM guarda os registros do mês; só recebe linhas no fim (nunca é reescrita).
+# {prefixo}_log_auditoria_indice diz quais meses ler: cada gravação anexa uma linha por mês, produto e ação do lote,
+# e a compactação (no arquivamento, uma vez por processo e loja) junta as repetidas numa linha por mês, produto e ação.
+COLUNAS_AUDITORIA = ['data_hora', 'produto', 'qtd_antes', 'qtd_nova', 'acao', 'motivo']
+COLUNAS_INDICE_AUDITORIA = ['mes', 'produto', 'acao', 'registros', 'primeiro', 'ultimo']
+
+def aba_auditoria_mes(prefixo, mes):
+    return f"{prefixo}_log_auditoria_{mes}"
+
+def aba_indice_auditoria(prefixo):
+    return f"{prefixo}_log_auditoria_indice"
+
+def mes_do_registro(serie_data_hora):
+    """'AAAA_MM' de cada data_hora (sem data legível: mês atual)."""
+    datas = pd.to_datetime(serie_data_hora.fillna("").astype(str).str[:19], errors='coerce', format='mixed')
+    return datas.dt.strftime('%Y_%m').fillna(obter_hora_manaus().strftime('%Y_%m'))
+
+def resumir_para_indice(df_logs):
+    """Uma linha por mês, produto e ação com a quantidade de registros e o primeiro/último horário."""
+    df_i = df_logs.assign(data_hora=df_logs['data_hora'].fillna("").astype(str), produto=df_logs['produto'].fillna("").astype(str),
+                          acao=df_logs['acao'].fillna("").astype(str))
+    return (df_i.groupby(['mes', 'produto', 'acao'], sort=False)['data_hora']
+            .agg(registros='size', primeiro='min', ultimo='max').reset_index()[COLUNAS_INDICE_AUDITORIA])
+
+def anexar_logs_auditoria(prefixo, lista_logs):
+    """Acrescenta os registros às abas dos seus meses e ao índice. Nada é relido nem reescrito."""
+    if not lista_logs: return
+    df_novos = pd.DataFrame(lista_logs)
+    df_novos = df_novos.reindex(columns=COLUNAS_AUDITORIA + [c for c in df_novos.columns if c not in COLUNAS_AUDITORIA])
+    df_novos['mes'] = mes_do_registro(df_novos['data_hora'])
+    for mes, df_mes in df_novos.groupby('mes', sort=True):
+        anexar_no_google(df_mes.drop(columns='mes'), aba_auditoria_mes(prefixo, mes))
+    anexar_no_google(resumir_para_indice(df_novos), aba_indice_auditoria(prefixo))
+
+def compactar_indice(df_i):
+    """Uma linha por mês, produto e ação (soma os registros; primeiro/último horário de todas as linhas juntadas)."""
+    df_i = df_i.reindex(columns=COLUNAS_INDICE_AUDITORIA)
+    for col in ['mes', 'produto', 'acao', 'primeiro', 'ultimo']: df_i[col] = df_i[col].fillna("").astype(str)
+    df_i['registros'] = pd.to_numeric(df_i['registros'], errors='coerce').fillna(0).astype(int)
+    return (df_i.groupby(['mes', 'produto', 'acao'], sort=False)
+            .agg(registros=('registros', 'sum'), primeiro=('primeiro', 'min'), ultimo=('ultimo', 'max')).reset_index()[COLUNAS_INDICE_AUDITORIA])
+
+def carregar_indice_auditoria(prefixo):
+    """Índice já compactado em memória (linhas anexadas depois da última compactação incluídas)."""
+    df_i = carregar_do_google(aba_indice_auditoria(prefixo))
+    if df_i.empty or 'mes' not in df_i.columns: return pd.DataFrame(columns=COLUNAS_INDICE_AUDITORIA)
+    return compactar_indice(df_i)
+
+def compactar_indice_auditoria(prefixo):
+    """Regrava a aba do índice compactada, se houver linhas repetidas. Devolve quantas linhas saíram."""
+    df_bruto = ler_aba_sem_cache(aba_indice_auditoria(prefixo))  # Vai regravar: sem cache e erro levanta
+    if df_bruto.empty or 'mes' not in df_bruto.columns: return 0
+    df_i = compactar_indice(df_bruto)
+    if len(df_i) == len(df_bruto): return 0
+    salvar_no_google(df_i, aba_indice_auditoria(prefixo))
+    return len(df_bruto) - len(df_i)
+
+def filtrar_indice_auditoria(df_indice, inicio, fim, busca_produto="", acoes=None):
+    """Entradas do índice que podem ter registros no período (datas inclusive) para o produto/ações pedidos."""
+    meses = set(pd.period_range(inicio, fim, freq='M').strftime('%Y_%m'))
+    sel = df_indice[df_indice['mes'].isin(meses)]
+    sel = sel[(sel['ultimo'].astype(str).str[:10] >= str(inicio)) & (sel['primeiro'].astype(str).str[:10] <= str(fim))]
+    if acoes: sel = sel[sel['acao'].isin(acoes)]
+    if busca_produto: sel = sel[normalizar_serie_texto(sel['produto']).str.contains(normalizar_para_busca(busca_produto), regex=False)]
+    return sel
+
+def consultar_auditoria(prefixo, inicio, fim, busca_produto="", acoes=None, df_indice=None):
+    """
+    Registros do período (datas inclusive) filtrados por produto e ação, do mais novo para o mais antigo.
+    Só as abas dos meses que o índice aponta são lidas.
+    """
+    if df_indice is None: df_indice = carregar_indice_auditoria(prefixo)
+    sel = filtrar_indice_auditoria(df_indice, inicio, fim, busca_produto, acoes)
+    if sel.empty: return pd.DataFrame(columns=COLUNAS_AUDITORIA)
+    partes = [carregar_do_google(aba_auditoria_mes(prefixo, mes)) for mes in sorted(sel['mes'].unique(), reverse=True)]
+    df_r = pd.concat([p for p in partes if not p.empty] or [pd.DataFrame(columns=COLUNAS_AUDITORIA)], ignore_index=True)
+    if df_r.empty: return df_r
+    dia = df_r['data_hora'].astype(str).str[:10]
+    df_r = df_r[(dia >= str(inicio)) & (dia <= str(fim))]
+    if acoes: df_r = df_r[df_r['acao'].isin(acoes)]
+    if busca_produto: df_r = df_r[df_r['produto'].isin(set(sel['produto']))]
+    return df_r.sort_values('data_hora', ascending=False, kind='stable').reset_index(drop=True)
+
+def particionar_log_legado(prefixo):
+    """
+    Migração: leva a aba única antiga ({prefixo}_log_auditoria) para as abas mensais e o índice
+    e deixa a antiga só com o cabeçalho. Pode ser repetida: cada mês recebe só as linhas que ainda não tem
+    (registros iguais e legítimos continuam todos). Leitura que falha ou mês que não grava levanta antes de
+    esvaziar a aba antiga: a migração não é marcada como feita e roda de novo no próximo acesso.
+    """
+    aba_legada = f"{prefixo}_log_auditoria"
+    df_legado = ler_aba_sem_cache(aba_legada)
+    if df_legado.empty or 'data_hora' not in df_legado.columns: return
+    colunas = df_legado.columns.tolist()
+    df_legado['mes'] = mes_do_registro(df_legado['data_hora'])
+    for mes, df_mes in df_legado.groupby('mes', sort=True):
+        aba = aba_auditoria_mes(prefixo, mes)
+        if not anexar_no_google(linhas_ainda_ausentes(df_mes[colunas], ler_aba_sem_cache(aba)), aba):
+            raise RuntimeError(f"Não foi possível gravar {aba}; o log antigo fica como está.")
+    # Entradas novas no fim do índice: a leitura já compacta e compactar_indice_auditoria regrava depois
+    if not anexar_no_google(resumir_para_indice(df_legado).astype(str), aba_indice_auditoria(prefixo)):
+        raise RuntimeError(f"Não foi possível gravar {aba_indice_auditoria(prefixo)}; o log antigo fica como está.")
+    salvar_no_google(pd.DataFrame(columns=colunas), aba_legada, permitir_vazio=True)
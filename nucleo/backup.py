@@ -0,0 +1,284 @@
+"""Backup em ZIP, snapshots incrementais e restauração do histórico de compras."""
+import pandas as pd
+from datetime import datetime, timedelta
+import os
+from io import BytesIO, StringIO
+import zipfile
+import csv
+import json
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from nucleo.util import normalizar_serie_texto, obter_hora_manaus
+from nucleo.planilha import anexar_no_google, listar_abas, ler_valores_aba, limpar_cabecalhos, salvar_no_google
+from nucleo.estoque import carregar_historico
+from nucleo.lojas import ABA_LOJAS, prefixos_das_lojas
+from nucleo.arquivamento import carregar_arquivo
+from nucleo.esquema import completar_colunas_do_esquema
+
+# --- 🛡️ BACKUP EM STREAMING (TODAS AS LOJAS) ---
+LIMITE_BACKUP_MEMORIA = 32 * 1024 * 1024  # Acima disso o ZIP vai para arquivo temporário em disco
+LINHAS_POR_BLOCO_CSV = 5000
+
+def listar_abas_backup(lojas):
+    todas = listar_abas()
+    abas = []
+    for loja in lojas:
+        abas += [
+            f"{loja}_estoque", f"{loja}_historico_compras", f"{loja}_movimentacoes",
+            f"{loja}_vendas", f"{loja}_lista_compras", f"{loja}_log_auditoria",
+            f"{loja}_ids_vendas", f"{loja}_lotes"
+        ]
+        abas += [t for t in todas if t.startswith(f"{loja}_log_auditoria_") or (t.startswith(f"{loja}_") and "_arquivo_" in t)]  # Abas mensais/índice do log e arquivo anual
+    return abas + ["casa_lotes", "meus_produtos_oficiais", ABA_LOJAS]
+
+def baixar_abas_em_paralelo(abas, max_paralelo=4):
+    """
+    Gera (aba, valores crus) baixando várias abas ao mesmo tempo.
+    Janela limitada: no máximo `max_paralelo` abas em andamento/na memória por vez.
+    """
+    with ThreadPoolExecutor(max_workers=max_paralelo) as executor:
+        pendentes = {}
+        for aba in abas:
+            if len(pendentes) >= max_paralelo:
+                prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                for fut in prontos: yield pendentes.pop(fut), fut.result()
+            pendentes[executor.submit(ler_valores_aba, aba)] = aba
+        for fut in list(pendentes):
+            yield pendentes.pop(fut), fut.result()
+
+def escrever_csv_em_blocos(zip_file, nome_arquivo, dados):
+    """Grava as linhas no ZIP em blocos de CSV (sem montar o arquivo inteiro na memória). Retorna tamanho e checksum."""
+    sha = hashlib.sha256()
+    total_bytes = 0
+    with zip_file.open(nome_arquivo, "w") as destino:
+        for inicio in range(0, len(dados), LINHAS_POR_BLOCO_CSV):
+            bloco = StringIO()
+            csv.writer(bloco, lineterminator="\n").writerows(dados[inicio:inicio + LINHAS_POR_BLOCO_CSV])
+            bloco_bytes = bloco.getvalue().encode('utf-8')
+            sha.update(bloco_bytes)
+            total_bytes += len(bloco_bytes)
+            destino.write(bloco_bytes)
+    return total_bytes, sha.hexdigest()
+
+def gerar_backup_zip_nuvem(lojas=None, max_paralelo=4):
+    """
+    Backup de todas as lojas em um único ZIP, com manifesto (linhas e SHA-256 de cada aba).
+    As abas são baixadas em paralelo e gravadas em blocos direto no ZIP, que fica em memória
+    só até LIMITE_BACKUP_MEMORIA (depois vai para arquivo temporário). O teto vale para a montagem:
+    quem entrega o arquivo pelo st.download_button passa o ZIP inteiro (comprimido) para a memória.
+    """
+    lojas = lojas or prefixos_das_lojas()
+    arquivo = tempfile.SpooledTemporaryFile(max_size=LIMITE_BACKUP_MEMORIA)
+    manifesto = {'gerado_em': str(obter_hora_manaus()), 'lojas': lojas, 'abas': {}}
+
+    with zipfile.ZipFile(arquivo, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for aba, dados in baixar_abas_em_paralelo(listar_abas_backup(lojas), max_paralelo):
+            if not dados: continue
+            dados[0] = limpar_cabecalhos(dados[0])
+            tamanho, checksum = escrever_csv_em_blocos(zip_file, f"{aba}.csv", dados)
+            manifesto['abas'][aba] = {'linhas': len(dados) - 1, 'bytes': tamanho, 'sha256': checksum}
+        zip_file.writestr("manifesto.json", json.dumps(manifesto, ensure_ascii=False, indent=2))
+    arquivo.seek(0)
+    return arquivo
+
+# --- 📸 SNAPSHOTS INCREMENTAIS (LOCAL, PARQUET) ---
+# Cada snapshot grava só as linhas novas/alteradas (identificadas pelo hash do conteúdo) e a lista
+# ordenada de hashes do estado da aba naquele momento. Qualquer ponto no tempo é remontado a partir daí.
+PASTA_SNAPSHOTS = os.environ.get("PASTA_SNAPSHOTS", "snapshots")
+INTERVALO_SNAPSHOT_AUTO_HORAS = 1
+
+def pasta_snapshots_aba(aba):
+    pasta = os.path.join(PASTA_SNAPSHOTS, aba)
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+def ler_indice_snapshots(aba):
+    caminho = os.path.join(PASTA_SNAPSHOTS, aba, "indice.json")
+    if not os.path.exists(caminho): return []
+    with open(caminho, encoding="utf-8") as f: return json.load(f)
+
+def salvar_indice_snapshots(aba, indice):
+    caminho = os.path.join(pasta_snapshots_aba(aba), "indice.json")
+    with open(caminho + ".tmp", "w", encoding="utf-8") as f: json.dump(indice, f, ensure_ascii=False, indent=1)
+    os.replace(caminho + ".tmp", caminho)
+
+def hash_linhas(df):
+    """Hash estável (uint64) do conteúdo de cada linha."""
+    return pd.util.hash_pandas_object(df, index=False).astype('uint64')
+
+def registrar_snapshot_aba(aba, dados, carimbo):
+    """Grava o snapshot de uma aba: linhas inéditas + estado (hashes). Retorna o resumo ou None se nada mudou."""
+    if not dados: return None
+    df = pd.DataFrame(dados[1:], columns=limpar_cabecalhos(dados[0]))
+    hashes = hash_linhas(df)
+    indice = ler_indice_snapshots(aba)
+    pasta = pasta_snapshots_aba(aba)
+
+    if indice:
+        ultimo = indice[-1]
+        estado_anterior = pd.read_parquet(os.path.join(pasta, f"{ultimo['carimbo']}_estado.parquet"))['__hash']
+        if ultimo['colunas'] == df.columns.tolist() and estado_anterior.equals(hashes.reset_index(drop=True)): return None
+        conhecidos = pd.concat([pd.read_parquet(os.path.join(pasta, f"{s['carimbo']}_novas.parquet"), columns=['__hash'])['__hash'] for s in indice], ignore_index=True)
+        mask_novas = ~hashes.isin(conhecidos)
+    else:
+        mask_novas = pd.Series(True, index=df.index)
+
+    df_novas = df[mask_novas.values].copy()
+    df_novas['__hash'] = hashes[mask_novas.values].values
+    df_novas.drop_duplicates('__hash').to_parquet(os.path.join(pasta, f"{carimbo}_novas.parquet"), index=False)
+    pd.DataFrame({'__hash': hashes.values}).to_parquet(os.path.join(pasta, f"{carimbo}_estado.parquet"), index=False)
+
+    resumo = {'carimbo': carimbo, 'linhas': len(df), 'novas': int(mask_novas.sum()), 'colunas': df.columns.tolist()}
+    indice.append(resumo)
+    salvar_indice_snapshots(aba, indice)
+    return resumo
+
+def criar_snapshot_incremental(lojas=None):
+    """Snapshot incremental de todas as abas de todas as lojas. Retorna {aba: resumo} só das abas que mudaram."""
+    carimbo = obter_hora_manaus().strftime("%Y%m%d_%H%M%S")
+    resultado = {}
+    for aba, dados in baixar_abas_em_paralelo(listar_abas_backup(lojas or prefixos_das_lojas())):
+        resumo = registrar_snapshot_aba(aba, dados, carimbo)
+        if resumo: resultado[aba] = resumo
+    return resultado
+
+def listar_carimbos_snapshot(aba):
+    return [s['carimbo'] for s in ler_indice_snapshots(aba)]
+
+def restaurar_snapshot(aba, carimbo):
+    """Remonta a aba exatamente como estava no snapshot `carimbo`."""
+    indice = ler_indice_snapshots(aba)
+    ate_carimbo = [s for s in indice if s['carimbo'] <= carimbo]
+    if not ate_carimbo: return pd.DataFrame()
+    alvo = ate_carimbo[-1]
+    pasta = pasta_snapshots_aba(aba)
+    estado = pd.read_parquet(os.path.join(pasta, f"{alvo['carimbo']}_estado.parquet"))['__hash']
+    linhas = pd.concat([pd.read_parquet(os.path.join(pasta, f"{s['carimbo']}_novas.parquet")) for s in ate_carimbo], ignore_index=True)
+    linhas = linhas.drop_duplicates('__hash', keep='last').set_index('__hash')
+    df = linhas.reindex(estado.values).reset_index(drop=True)
+    return df.reindex(columns=alvo['colunas']).fillna("")
+
+def exportar_mudancas_snapshot_zip(carimbo):
+    """ZIP (CSV por aba) só com as linhas adicionadas/alteradas no snapshot `carimbo`."""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        if os.path.isdir(PASTA_SNAPSHOTS):
+            for aba in sorted(os.listdir(PASTA_SNAPSHOTS)):
+                caminho = os.path.join(PASTA_SNAPSHOTS, aba, f"{carimbo}_novas.parquet")
+                if os.path.exists(caminho):
+                    df_novas = pd.read_parquet(caminho).drop(columns=['__hash'])
+                    zip_file.writestr(f"{aba}_{carimbo}.csv", df_novas.to_csv(index=False).encode('utf-8'))
+    buffer.seek(0)
+    return buffer
+
+def ultimo_carimbo_snapshot():
+    if not os.path.isdir(PASTA_SNAPSHOTS): return None
+    carimbos = [c for aba in os.listdir(PASTA_SNAPSHOTS) for c in listar_carimbos_snapshot(aba)]
+    return max(carimbos) if carimbos else None
+
+def snapshot_automatico_se_vencido():
+    """Cria um snapshot se o último tiver mais de INTERVALO_SNAPSHOT_AUTO_HORAS horas."""
+    ultimo = ultimo_carimbo_snapshot()
+    if ultimo and datetime.strptime(ultimo, "%Y%m%d_%H%M%S") > obter_hora_manaus() - timedelta(hours=INTERVALO_SNAPSHOT_AUTO_HORAS):
+        return None
+    return criar_snapshot_incremental()
+
+# --- ♻️ MOTOR DE RESTAURAÇÃO (HASH) ---
+COLS_CHAVE_HISTORICO = ['data', 'produto', 'qtd', 'total_gasto']
+LINHAS_POR_BLOCO_LEITURA = 20000
+
+def normalizar_data_serie(serie):
+    return pd.to_datetime(serie, errors='coerce', format='mixed')
+
+def hash_chaves_historico(df):
+    """
+    Hash estável das colunas-chave já normalizadas:
+    data no minuto, nome sem acento/maiúsculo, números com 2 casas (aceita vírgula).
+    """
+    chaves = pd.DataFrame(index=df.index)
+    for col in COLS_CHAVE_HISTORICO:
+        if col not in df.columns: continue
+        if col == 'data':
+            chaves[col] = normalizar_data_serie(df[col]).dt.strftime('%Y-%m-%d %H:%M').fillna(df[col].fillna("").astype(str))
+        elif col == 'produto':
+            chaves[col] = normalizar_serie_texto(df[col])
+        else:
+            valores = pd.to_numeric(df[col].astype(str).str.replace(',', '.', regex=False), errors='coerce')
+            chaves[col] = valores.round(2).map(lambda v: f"{v:.2f}" if pd.notnull(v) else "")
+    return pd.util.hash_pandas_object(chaves, index=False).astype('uint64')
+
+def ler_backup_em_blocos(arquivo, prefixo, nome_interno=None, tamanho_bloco=LINHAS_POR_BLOCO_LEITURA):
+    """
+    Gera blocos (DataFrame) de um backup CSV/XLSX/ZIP sem carregar o arquivo inteiro de uma vez.
+    No ZIP (que traz todas as lojas) só entra o histórico da loja `prefixo`.
+    """
+    nome = (nome_interno or arquivo.name).lower()
+    if nome.endswith('.zip'):
+        alvo = f"{prefixo}_historico_compras.csv"
+        with zipfile.ZipFile(arquivo) as zf:
+            internos = [i for i in zf.namelist() if os.path.basename(i) == alvo]
+            if not internos: raise FileNotFoundError(f"{arquivo.name}: o ZIP não tem o histórico desta loja ({alvo}).")
+            with zf.open(internos[0]) as f: yield from ler_backup_em_blocos(f, prefixo, internos[0], tamanho_bloco)
+        return
+    if nome.endswith('.csv'):
+        cabecalho = arquivo.readline()
+        if isinstance(cabecalho, bytes): cabecalho = cabecalho.decode('utf-8', errors='ignore')
+        separador = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+        arquivo.seek(0)
+        yield from pd.read_csv(arquivo, sep=separador, dtype=str, keep_default_na=False, chunksize=tamanho_bloco)
+        return
+    import openpyxl
+    wb = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        linhas = wb.active.iter_rows(values_only=True)
+        colunas = limpar_cabecalhos(next(linhas, []))
+        bloco = []
+        for linha in linhas:
+            bloco.append(linha)
+            if len(bloco) >= tamanho_bloco:
+                yield pd.DataFrame(bloco, columns=colunas); bloco = []
+        if bloco: yield pd.DataFrame(bloco, columns=colunas)
+    finally:
+        wb.close()
+
+def restaurar_historico_por_hash(prefixo, arquivos, substituir=False, ao_ler_arquivo=None):
+    """
+    Restaura o histórico de compras a partir de backups, deduplicando por hash das chaves normalizadas.
+    UNIFICAR: só as linhas inéditas são ANEXADAS à aba. SUBSTITUIR: a aba é reescrita com as linhas únicas dos backups.
+    Linhas que já estão no arquivo anual (_arquivo_AAAA) contam como vistas nos dois modos: não voltam para a aba quente.
+    Retorna estatísticas {lidas, duplicadas, novas}.
+    """
+    aba = f"{prefixo}_historico_compras"
+    df_atual = carregar_arquivo(prefixo, "_historico_compras") if substituir else carregar_historico(prefixo, incluir_arquivo=True)
+    vistos = set(hash_chaves_historico(df_atual).tolist()) if not df_atual.empty else set()
+    blocos_novos = []
+    lidas = 0
+
+    for arq in arquivos:
+        linhas_arq = 0
+        for bloco in ler_backup_em_blocos(arq, prefixo):
+            bloco.columns = bloco.columns.astype(str).str.strip().str.lower()
+            bloco = bloco[[c for c in bloco.columns if c not in ['display_combo', 'produto_str', 'selecionar', 'status_temp']]]
+            if not any(c in bloco.columns for c in COLS_CHAVE_HISTORICO): raise ValueError(f"{arq.name}: sem as colunas padrão (data, produto, qtd).")
+            lidas += len(bloco); linhas_arq += len(bloco)
+            hashes = hash_chaves_historico(bloco).tolist()
+            mascara = []
+            for h in hashes:
+                mascara.append(h not in vistos)
+                vistos.add(h)
+            bloco = bloco[mascara]
+            if not bloco.empty: blocos_novos.append(bloco)
+        if ao_ler_arquivo: ao_ler_arquivo(arq.name, linhas_arq)
+
+    df_novas = pd.concat(blocos_novos, ignore_index=True) if blocos_novos else pd.DataFrame()
+    if not df_novas.empty and 'data' in df_novas.columns:
+        datas = normalizar_data_serie(df_novas['data'])
+        df_novas['data'] = datas.dt.strftime('%Y-%m-%d %H:%M:%S').fillna(df_novas['data'].fillna("").astype(str))
+        df_novas = df_novas.assign(_ordem=datas).sort_values(by='_ordem', ascending=False).drop(columns=['_ordem'])
+
+    if substituir:
+        if not df_novas.empty: salvar_no_google(completar_colunas_do_esquema(df_novas, aba), aba)  # Backup antigo: colunas de hoje
+    elif not df_novas.empty:
+        anexar_no_google(df_novas, aba)
+    return {'lidas': lidas, 'duplicadas': lidas - len(df_novas), 'novas': len(df_novas)}
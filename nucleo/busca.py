@@ -0,0 +1,48 @@
+"""Busca de produtos por nome (pontuação por palavras e índice invertido)."""
+from nucleo.util import normalizar_para_busca
+
+def calcular_pontuacao(nome_xml, nome_sistema):
+    set_xml = set(normalizar_para_busca(nome_xml).split())
+    set_sis = set(normalizar_para_busca(nome_sistema).split())
+    return pontuar_palavras(set_xml, set_sis)
+
+def pontuar_palavras(set_xml, set_sis):
+    common = set_xml.intersection(set_sis)
+    if not common: return 0.0
+    total = set_xml.union(set_sis)
+    score = len(common) / len(total)
+    for palavra in common:
+        if any(u in palavra for u in ['L', 'ML', 'KG', 'G', 'M']): 
+            if any(c.isdigit() for c in palavra):
+                score += 0.5
+    return score
+
+def indexar_nomes(nomes):
+    """Índice invertido (palavra -> posições) para pontuar só os nomes que têm alguma palavra em comum."""
+    tokens = [set(normalizar_para_busca(n).split()) for n in nomes]
+    invertido = {}
+    for i, palavras in enumerate(tokens):
+        for palavra in palavras: invertido.setdefault(palavra, []).append(i)
+    return {'nomes': list(nomes), 'tokens': tokens, 'invertido': invertido}
+
+def ranquear_candidatos(nome_buscado, indice, top=20):
+    """Mesma pontuação de calcular_pontuacao, mas só sobre os candidatos do índice. Retorna [(posição, score)]."""
+    set_busca = set(normalizar_para_busca(nome_buscado).split())
+    candidatos = set()
+    for palavra in set_busca: candidatos.update(indice['invertido'].get(palavra, ()))
+    pontuados = [(i, pontuar_palavras(set_busca, indice['tokens'][i])) for i in candidatos]
+    pontuados.sort(key=lambda x: (-x[1], x[0]))
+    return pontuados[:top]
+
+def encontrar_melhor_match(nome_buscado, lista_opcoes, cutoff=0.3):
+    melhor_match = None
+    maior_score = 0.0
+    for opcao in lista_opcoes:
+        if opcao == "(CRIAR NOVO)": continue
+        score = calcular_pontuacao(nome_buscado, opcao)
+        if score > maior_score:
+            maior_score = score
+            melhor_match = opcao
+    if maior_score >= cutoff:
+        return melhor_match, "Nome Similar (Palavras)"
+    return None, "Nenhum"
@@ -0,0 +1,259 @@
+"""Compras: otimização de pedido por fornecedor e importação de NF-e (XML)."""
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+import xml.etree.ElementTree as ET
+from nucleo.util import normalizar_serie_texto, normalizar_texto, obter_hora_manaus
+from nucleo.busca import indexar_nomes, ranquear_candidatos
+
+# --- 🧮 OTIMIZADOR DE PEDIDOS (FORNECEDOR MAIS BARATO) ---
+def montar_cubo_precos(df_hist, dias_recentes=90):
+    """Último preço pago por (produto, fornecedor) dentro da janela recente do histórico."""
+    if df_hist.empty: return pd.DataFrame(columns=['produto', 'fornecedor', 'preco_recente', 'data_ultima'])
+    df_h = df_hist[['data', 'produto', 'fornecedor', 'preco_pago']].copy()
+    df_h['fornecedor'] = df_h['fornecedor'].fillna('').astype(str).str.strip()
+    limite = obter_hora_manaus() - timedelta(days=dias_recentes)
+    df_h = df_h[(df_h['preco_pago'] > 0.01) & (df_h['fornecedor'] != '') & (df_h['data'] >= limite)]
+    if df_h.empty: return pd.DataFrame(columns=['produto', 'fornecedor', 'preco_recente', 'data_ultima'])
+    df_h = df_h.sort_values(by='data')
+    cubo = df_h.groupby(['produto', 'fornecedor'], sort=False).agg(preco_recente=('preco_pago', 'last'), data_ultima=('data', 'last')).reset_index()
+    return cubo
+
+def otimizar_pedido_compras(df_lista, df_hist, dias_recentes=90):
+    """
+    Escolhe o fornecedor mais barato (preço recente) para cada item da lista de compras.
+    Retorna (itens com sugestão, resumo de pedidos por fornecedor). Tudo em uma passada vetorizada.
+    """
+    cols_pedido = ['fornecedor_sugerido', 'itens', 'total_atual', 'total_otimizado', 'economia']
+    if df_lista.empty: return pd.DataFrame(), pd.DataFrame(columns=cols_pedido)
+
+    itens = df_lista[df_lista['status'].isin(['A Comprar', 'Manual'])].copy()
+    if itens.empty: return pd.DataFrame(), pd.DataFrame(columns=cols_pedido)
+    itens['qtd_sugerida'] = pd.to_numeric(itens['qtd_sugerida'], errors='coerce').fillna(0)
+    itens['custo_previsto'] = pd.to_numeric(itens['custo_previsto'].astype(str).str.replace(',', '.', regex=False), errors='coerce').fillna(0)
+    itens['fornecedor'] = itens['fornecedor'].fillna('').astype(str).str.strip()
+
+    cubo = montar_cubo_precos(df_hist, dias_recentes)
+    mais_barato = cubo.sort_values(by=['preco_recente', 'data_ultima'], ascending=[True, False]).drop_duplicates('produto')
+    mais_barato = mais_barato.rename(columns={'fornecedor': 'fornecedor_sugerido', 'preco_recente': 'preco_sugerido'})[['produto', 'fornecedor_sugerido', 'preco_sugerido']]
+    preco_atual = cubo.rename(columns={'preco_recente': 'preco_fornecedor_atual'})[['produto', 'fornecedor', 'preco_fornecedor_atual']]
+
+    itens = itens.merge(mais_barato, on='produto', how='left').merge(preco_atual, on=['produto', 'fornecedor'], how='left')
+
+    # Custo de referência: preço recente do fornecedor atual > custo previsto > preço sugerido (sem economia)
+    itens['custo_atual_un'] = itens['preco_fornecedor_atual']
+    sem_ref = itens['custo_atual_un'].isna() & (itens['custo_previsto'] > 0)
+    itens.loc[sem_ref, 'custo_atual_un'] = itens.loc[sem_ref, 'custo_previsto']
+    itens['custo_atual_un'] = itens['custo_atual_un'].fillna(itens['preco_sugerido']).fillna(0)
+
+    # Sem preço recente no histórico: mantém fornecedor e custo atuais
+    sem_hist = itens['fornecedor_sugerido'].isna()
+    itens.loc[sem_hist, 'fornecedor_sugerido'] = itens.loc[sem_hist, 'fornecedor'].replace('', 'SEM FORNECEDOR')
+    itens.loc[sem_hist, 'preco_sugerido'] = itens.loc[sem_hist, 'custo_atual_un']
+
+    itens['total_atual'] = itens['qtd_sugerida'] * itens['custo_atual_un']
+    itens['total_otimizado'] = itens['qtd_sugerida'] * itens['preco_sugerido']
+    itens['economia'] = itens['total_atual'] - itens['total_otimizado']
+    itens = itens.drop(columns=['preco_fornecedor_atual'])
+
+    pedidos = itens.groupby('fornecedor_sugerido').agg(itens=('produto', 'count'), total_atual=('total_atual', 'sum'), total_otimizado=('total_otimizado', 'sum'), economia=('economia', 'sum')).reset_index()
+    pedidos = pedidos.sort_values(by='total_otimizado', ascending=False).reset_index(drop=True)
+    return itens, pedidos
+
+# --- XML ---
+def ler_xml_nfe(arquivo_xml, df_referencia):
+    tree = ET.parse(arquivo_xml)
+    root = tree.getroot()
+    def tag_limpa(element): return element.tag.split('}')[-1]
+
+    dados_nota = {'numero': '', 'fornecedor': '', 'data_emissao': '', 'itens': []}
+    indice_ref = None
+    dict_ref_ean = {}
+    if not df_referencia.empty:
+        nomes_ref = normalizar_serie_texto(df_referencia['nome do produto'])
+        dict_ref_ean = dict(zip(nomes_ref, df_referencia['código de barras'].astype(str).str.strip()))
+        indice_ref = indexar_nomes(nomes_ref.tolist())
+
+    def ean_por_nome(nome, padrao):
+        """Mesmo critério de encontrar_melhor_match (corte 0.3), usando o índice da base de referência."""
+        ranking = ranquear_candidatos(nome, indice_ref, top=1)
+        if ranking and ranking[0][1] >= 0.3: return dict_ref_ean.get(indice_ref['nomes'][ranking[0][0]], padrao)
+        return padrao
+
+    if tag_limpa(root) == 'NotaFiscal':
+        info = root.find('Info')
+        if info is not None:
+            dados_nota['numero'] = info.find('NumeroNota').text if info.find('NumeroNota') is not None else ""
+            dados_nota['fornecedor'] = info.find('Fornecedor').text if info.find('Fornecedor') is not None else ""
+            try: dados_nota['data_emissao'] = info.find('DataCompra').text
+            except: pass
+        produtos = root.findall('.//Produtos/Item')
+        for item_xml in produtos:
+            item = {'codigo_interno': '', 'ean': '', 'nome': '', 'qtd': 0.0, 'preco_un_liquido': 0.0, 'preco_un_bruto': 0.0, 'desconto_total_item': 0.0}
+            nome_raw = item_xml.find('Nome').text
+            qtd_raw = float(item_xml.find('Quantidade').text)
+            val_final = float(item_xml.find('ValorPagoFinal').text)
+            desc_val = float(item_xml.find('ValorDesconto').text)
+            cod_barras = item_xml.find('CodigoBarras').text
+            item['nome'] = normalizar_texto(nome_raw)
+            item['qtd'] = qtd_raw
+            item['ean'] = cod_barras if cod_barras else ""
+            item['codigo_interno'] = item['ean']
+            item['desconto_total_item'] = desc_val
+            if qtd_raw > 0:
+                item['preco_un_liquido'] = val_final / qtd_raw
+                item['preco_un_bruto'] = (val_final + desc_val) / qtd_raw
+            
+            ean_xml = str(item['ean']).strip()
+            if ean_xml in ['SEM GTIN', '', 'None', 'NAN']:
+                item['ean'] = item['codigo_interno']
+                if indice_ref: item['ean'] = ean_por_nome(item['nome'], item['codigo_interno'])
+            dados_nota['itens'].append(item)
+        return dados_nota
+
+    for elem in root.iter():
+        tag = tag_limpa(elem)
+        if tag == 'nNF': dados_nota['numero'] = elem.text
+        elif tag == 'xNome' and dados_nota['fornecedor'] == '': dados_nota['fornecedor'] = elem.text
+        elif tag == 'dhEmi':
+            raw_date = elem.text
+            if raw_date:
+                try:
+                    dt_obj = datetime.strptime(raw_date[:19], "%Y-%m-%dT%H:%M:%S")
+                    dados_nota['data_emissao'] = dt_obj.strftime("%d/%m/%Y %H:%M")
+                except:
+                    dados_nota['data_emissao'] = raw_date 
+
+    dets = [e for e in root.iter() if tag_limpa(e) == 'det']
+    for det in dets:
+        prod = next((child for child in det if tag_limpa(child) == 'prod'), None)
+        if prod:
+            item = {'codigo_interno': '', 'ean': '', 'nome': '', 'qtd': 0.0, 'preco_un_liquido': 0.0, 'preco_un_bruto': 0.0, 'desconto_total_item': 0.0, 'lotes': []}
+            vProd = 0.0; vDesc = 0.0; qCom = 0.0
+            for info in prod:
+                t = tag_limpa(info)
+                if t == 'cProd': item['codigo_interno'] = info.text
+                elif t == 'cEAN': item['ean'] = info.text
+                elif t == 'xProd': item['nome'] = normalizar_texto(info.text)
+                elif t == 'qCom': qCom = float(info.text)
+                elif t == 'vProd': vProd = float(info.text) 
+                elif t == 'vDesc': vDesc = float(info.text) 
+                elif t == 'rastro':  # Lote do item (medicamentos/perecíveis): número, quantidade e validade
+                    campos = {tag_limpa(c): c.text for c in info}
+                    item['lotes'].append({'lote': campos.get('nLote') or "", 'qtd': float(campos.get('qLote') or 0), 'validade': campos.get('dVal') or ""})
+            if qCom > 0:
+                item['qtd'] = qCom
+                item['preco_un_bruto'] = vProd / qCom  
+                item['desconto_total_item'] = vDesc    
+                item['preco_un_liquido'] = (vProd - vDesc) / qCom 
+            ean_xml = str(item['ean']).strip()
+            if ean_xml in ['SEM GTIN', '', 'None', 'NAN']:
+                item['ean'] = item['codigo_interno']
+                if indice_ref: item['ean'] = ean_por_nome(item['nome'], item['codigo_interno'])
+            dados_nota['itens'].append(item)
+    return dados_nota
+
+# --- 🔗 PRÉ-ASSOCIAÇÃO DOS ITENS DO XML ---
+LIMIAR_MATCH_AUTOMATICO = 0.8  # Acima disso o match por nome é aceito sem revisão
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def indice_catalogo(nomes):
+    """Índice de nomes do catálogo (tupla), reaproveitado entre reruns enquanto o catálogo não muda."""
+    return indexar_nomes(nomes)
+
+def rotulo_sistema(cod, nome):
+    return f"[SISTEMA] {cod} - {nome}"
+
+def associar_itens_xml(itens, df, limiar_auto=LIMIAR_MATCH_AUTOMATICO, top=15):
+    """
+    Pré-passo da importação: EAN exato (vetorizado) e, para o resto, nome parecido via índice.
+    Retorna um DataFrame por item com a opção sugerida, origem, score, se é confiável e os candidatos.
+    """
+    df_itens = pd.DataFrame(itens)
+    if df_itens.empty: return df_itens
+    df_itens['opcao'] = "(CRIAR NOVO)"; df_itens['origem'] = "Nenhum"; df_itens['score'] = 0.0
+    df_itens['confiante'] = False
+    df_itens['candidatos'] = [[] for _ in range(len(df_itens))]
+    if df.empty: return df_itens
+
+    codigos = df['código de barras'].astype(str)
+    nomes = df['nome do produto'].astype(str)
+    primeiro_por_cod = pd.DataFrame({'cod': codigos, 'nome': nomes})
+    primeiro_por_cod = primeiro_por_cod[~primeiro_por_cod['cod'].str.strip().str.upper().isin(['SEM GTIN', '', 'NONE', 'NAN'])].drop_duplicates('cod').set_index('cod')['nome']
+
+    nome_ean = df_itens['ean'].astype(str).map(primeiro_por_cod)
+    mask_ean = nome_ean.notna()
+    df_itens.loc[mask_ean, 'opcao'] = [rotulo_sistema(c, n) for c, n in zip(df_itens.loc[mask_ean, 'ean'].astype(str), nome_ean[mask_ean])]
+    df_itens.loc[mask_ean, 'origem'] = "EAN Exato"
+    df_itens.loc[mask_ean, 'score'] = 1.0
+    df_itens.loc[mask_ean, 'confiante'] = True
+
+    indice = indice_catalogo(tuple(nomes))
+    for pos in df_itens.index:
+        ranking = ranquear_candidatos(df_itens.at[pos, 'nome'], indice, top=top)
+        df_itens.at[pos, 'candidatos'] = [rotulo_sistema(codigos.iat[i], nomes.iat[i]) for i, _ in ranking]
+        if mask_ean[pos] or not ranking: continue
+        i_melhor, score = ranking[0]
+        if score >= 0.3:
+            df_itens.at[pos, 'opcao'] = rotulo_sistema(codigos.iat[i_melhor], nomes.iat[i_melhor])
+            df_itens.at[pos, 'origem'] = "Nome Similar (Palavras)"
+            df_itens.at[pos, 'score'] = score
+            df_itens.at[pos, 'confiante'] = score >= limiar_auto
+    return df_itens
+
+def aplicar_importacao_xml(df, dados, escolhas, atualizar_estoque, data_lancamento, data_emissao):
+    """
+    Confirmação da importação em lote (colunar): produtos novos, deltas de estoque,
+    histórico e logs são montados de uma vez. Retorna (df, df_hist_novos, df_logs, atualizacoes_casa).
+    """
+    itens = pd.DataFrame(dados['itens']).reset_index(drop=True)
+    if itens.empty: return df, pd.DataFrame(), pd.DataFrame(), []
+    itens['escolha'] = [escolhas[i] for i in range(len(itens))]
+    eh_sistema = itens['escolha'].str.contains("[SISTEMA]", regex=False)
+    nome_sistema = itens['escolha'].str.replace("[SISTEMA] ", "", regex=False).str.split(' - ', n=1).str[1]
+    itens['nome_final'] = nome_sistema.where(eh_sistema, itens['nome'].str.upper())
+    eh_novo = itens['escolha'] == "(CRIAR NOVO)"
+    data_str = str(data_lancamento)
+    logs = []
+
+    # --- Produtos existentes: uma atualização indexada por produto ---
+    posicoes = pd.Series(df.index, index=df['nome do produto'].astype(str)) if not df.empty else pd.Series(dtype=object)
+    posicoes = posicoes[~posicoes.index.duplicated()]
+    itens['idx'] = itens['nome_final'].map(posicoes)
+    existentes = itens[~eh_novo & itens['idx'].notna()].copy()
+    atualizacoes_casa = []
+    if not existentes.empty:
+        existentes['idx'] = existentes['idx'].astype(df.index.dtype)
+        if atualizar_estoque:
+            base = df.loc[existentes['idx'], 'qtd_central'].values
+            existentes['qtd_nova'] = base + existentes.groupby('idx')['qtd'].cumsum().values
+            existentes['qtd_antes'] = existentes['qtd_nova'] - existentes['qtd']
+            somas = existentes.groupby('idx')['qtd'].sum()
+            df.loc[somas.index, 'qtd_central'] = df.loc[somas.index, 'qtd_central'].values + somas.values
+            logs.append(pd.DataFrame({'pos': existentes.index, 'data_hora': data_str, 'produto': existentes['nome_final'], 'qtd_antes': existentes['qtd_antes'], 'qtd_nova': existentes['qtd_nova'], 'acao': "XML Entrada", 'motivo': "Entrada"}))
+        ultimos = existentes.groupby('idx').last()
+        df.loc[ultimos.index, 'preco_custo'] = ultimos['preco_un_liquido'].values
+        df.loc[ultimos.index, 'ultimo_fornecedor'] = dados['fornecedor']
+        df.loc[ultimos.index, 'status'] = 'Ativo'
+        atualizacoes_casa = [{'produto': nome, 'qtd_central': qtd, 'custo': custo} for nome, qtd, custo in zip(ultimos['nome_final'], df.loc[ultimos.index, 'qtd_central'], ultimos['preco_un_liquido'])]
+
+    # --- Produtos novos: um único concat ---
+    novos = itens[eh_novo]
+    if not novos.empty:
+        df_novos = pd.DataFrame({
+            'código de barras': novos['ean'], 'nome do produto': novos['nome_final'],
+            'qtd.estoque': novos['qtd'] if atualizar_estoque else 0, 'qtd_central': 0, 'qtd_minima': 5, 'validade': None,
+            'status_compra': 'OK', 'qtd_comprada': 0, 'preco_custo': novos['preco_un_liquido'], 'preco_venda': novos['preco_un_liquido'] * 2,
+            'categoria': 'GERAL', 'ultimo_fornecedor': dados['fornecedor'], 'preco_sem_desconto': novos['preco_un_bruto'], 'status': 'Ativo'
+        })
+        df = pd.concat([df, df_novos], ignore_index=True)
+        if atualizar_estoque:
+            logs.append(pd.DataFrame({'pos': novos.index, 'data_hora': data_str, 'produto': novos['nome_final'], 'qtd_antes': 0, 'qtd_nova': novos['qtd'], 'acao': "XML Novo", 'motivo': "Entrada"}))
+
+    df_logs = pd.concat(logs).sort_values(by='pos').drop(columns=['pos']).reset_index(drop=True) if logs else pd.DataFrame()
+    df_hist_novos = pd.DataFrame({
+        'data': data_str, 'data_emissao': data_emissao, 'produto': itens['nome_final'], 'fornecedor': dados['fornecedor'],
+        'qtd': itens['qtd'], 'preco_pago': itens['preco_un_liquido'], 'preco_sem_desconto': itens['preco_un_bruto'],
+        'desconto_total_money': itens['desconto_total_item'], 'total_gasto': itens['qtd'] * itens['preco_un_liquido']
+    })
+    return df, df_hist_novos, df_logs, atualizacoes_casa
@@ -0,0 +1,53 @@
+"""Conciliação do estoque do app com o planograma do Shoppbud."""
+import pandas as pd
+from nucleo.util import normalizar_codigo_serie, obter_hora_manaus
+
+# --- ⚖️ MOTOR DE CONCILIAÇÃO (APP x SHOPPBUD) ---
+COL_ACEITAR_CONCILIACAO = '✅ Aceitar Qtd Shoppbud (Corrigir App)'
+
+def detectar_colunas_planograma(df_plan):
+    col_cod_plan = next((c for c in df_plan.columns if ('código' in str(c).lower() or 'codigo' in str(c).lower()) and 'barras' in str(c).lower()), None)
+    col_qtd_plan = next((c for c in df_plan.columns if 'qtd' in str(c).lower() and 'estoque' in str(c).lower()), None)
+    return col_cod_plan, col_qtd_plan
+
+def conciliar_estoque(df_app, df_plan, col_cod_plan, col_qtd_plan):
+    """
+    Junta App e Planograma por código normalizado (outer join) e classifica cada linha:
+    OK, Divergente, Só no App ou Só no Shoppbud. `idx_app` aponta para a linha no estoque do App.
+    """
+    app = pd.DataFrame({
+        'código normalizado': normalizar_codigo_serie(df_app['código de barras'].fillna("")), 'nome do produto': df_app['nome do produto'],
+        'qtd_app': df_app['qtd.estoque'], 'idx_app': df_app.index
+    })
+    app = app[app['código normalizado'] != ""].drop_duplicates('código normalizado')
+    plan = pd.DataFrame({
+        'código normalizado': normalizar_codigo_serie(df_plan[col_cod_plan].fillna("")),  # Célula vazia: fora (não é um código)
+        'qtd_shoppbud': pd.to_numeric(df_plan[col_qtd_plan], errors='coerce').fillna(0)
+    })
+    plan = plan[~plan['código normalizado'].isin(["", "nan"])].drop_duplicates('código normalizado')
+
+    conc = app.merge(plan, on='código normalizado', how='outer', indicator=True)
+    conc['Diferença'] = conc['qtd_app'].fillna(0) - conc['qtd_shoppbud'].fillna(0)
+    conc['classificação'] = conc['_merge'].map({'both': 'OK', 'left_only': 'Só no App', 'right_only': 'Só no Shoppbud'}).astype(str)
+    conc.loc[(conc['_merge'] == 'both') & (conc['Diferença'] != 0), 'classificação'] = 'Divergente'
+    return conc.drop(columns=['_merge']).reset_index(drop=True)
+
+def aplicar_correcoes_conciliacao(df, df_aceitos):
+    """Grava a qtd do Shoppbud no App para as linhas aceitas (atualização indexada). Retorna (qtd corrigida, logs)."""
+    aceitos = df_aceitos[df_aceitos['idx_app'].notna() & df_aceitos['qtd_shoppbud'].notna()]
+    if aceitos.empty: return 0, []
+    idx = aceitos['idx_app'].astype(df.index.dtype).values
+    qtd_antiga = df.loc[idx, 'qtd.estoque'].values
+    df.loc[idx, 'qtd.estoque'] = aceitos['qtd_shoppbud'].values
+    logs = pd.DataFrame({
+        'data_hora': str(obter_hora_manaus()), 'produto': df.loc[idx, 'nome do produto'].values, 'qtd_antes': qtd_antiga,
+        'qtd_nova': aceitos['qtd_shoppbud'].values, 'acao': "Correção Conciliação", 'motivo': "Origem: Shoppbud"
+    })
+    return len(aceitos), logs.to_dict('records')
+
+def arquivo_ajuste_shoppbud(df_conc, incluir_so_app=False):
+    """Linhas para o Shoppbud receber a qtd do App (divergentes não aceitas)."""
+    classes = ['Divergente', 'Só no App'] if incluir_so_app else ['Divergente']
+    mask = df_conc['classificação'].isin(classes)
+    if COL_ACEITAR_CONCILIACAO in df_conc.columns: mask &= ~df_conc[COL_ACEITAR_CONCILIACAO].astype(bool)
+    return pd.DataFrame({'Código de Barras': df_conc.loc[mask, 'código normalizado'], 'Quantidade': df_conc.loc[mask, 'qtd_app']})
@@ -0,0 +1,105 @@
+"""Diário local de gravações (write-ahead): cada gravação na nuvem é anotada antes de ir e confirmada depois."""
+import pandas as pd
+from datetime import timedelta
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from nucleo.util import obter_hora_manaus
+
+# ==============================================================================
+# 📓 DIÁRIO DE GRAVAÇÕES (NADA SE PERDE SE A NUVEM FALHAR NO MEIO)
+# ==============================================================================
+ARQUIVO_DIARIO = os.environ.get("ARQUIVO_DIARIO", ".diario_gravacoes.sqlite")
+DIAS_RETENCAO_DIARIO = 7  # Entradas confirmadas (só o resumo, sem os dados) ficam esse tempo para consulta
+TRAVA_DIARIO = threading.Lock()
+
+def conectar_diario():
+    con = sqlite3.connect(ARQUIVO_DIARIO, timeout=10)
+    con.execute("""CREATE TABLE IF NOT EXISTS diario (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, momento TEXT, aba TEXT, tipo TEXT, chave TEXT,
+        dados TEXT, linhas INTEGER, status TEXT, tentativas INTEGER DEFAULT 0, erro TEXT DEFAULT '')""")
+    return con
+
+def anotar_gravacao(tipo, aba, dados):
+    """
+    Anota a gravação ('salvar' = aba inteira, 'anexar' = linhas no fim, 'celulas' = campos achados pela chave da linha) como pendente, ANTES de enviá-la.
+    Um 'salvar' idêntico a outro ainda pendente reaproveita a mesma entrada.
+    Devolve o id da entrada, ou None se o diário não puder ser gravado (a gravação segue sem ele).
+    """
+    texto = json.dumps(dados, ensure_ascii=False)
+    chave = hashlib.sha1(f"{tipo}|{aba}|{texto}".encode('utf-8')).hexdigest()
+    try:
+        with TRAVA_DIARIO:
+            con = conectar_diario()
+            with con:
+                existente = con.execute("SELECT id FROM diario WHERE chave = ? AND tipo = 'salvar' AND status = 'pendente'", (chave,)).fetchone()
+                if existente: id_gravacao = existente[0]
+                else:
+                    id_gravacao = con.execute("INSERT INTO diario (momento, aba, tipo, chave, dados, linhas, status) VALUES (?,?,?,?,?,?,'pendente')",
+                                              (str(obter_hora_manaus()), aba, tipo, chave, texto, max(len(dados) - 1, 0))).lastrowid
+            con.close()
+        return id_gravacao
+    except sqlite3.Error as e:
+        print(f"Diário de gravações indisponível: {e}")
+        return None
+
+def confirmar_gravacao(id_gravacao):
+    """
+    Gravação chegou à nuvem: descarta os dados e dá por substituídos os 'salvar' e 'celulas' mais antigos da mesma aba.
+    Um 'anexar' feito depois de um 'salvar' ainda pendente continua pendente: o reenvio do 'salvar'
+    sobrescreve a aba, e o 'anexar' precisa ser conferido (e refeito se sumiu) depois dele.
+    """
+    if id_gravacao is None: return
+    try:
+        with TRAVA_DIARIO:
+            con = conectar_diario()
+            with con:
+                aba, tipo = con.execute("SELECT aba, tipo FROM diario WHERE id = ?", (id_gravacao,)).fetchone()
+                salvar_pendente_antes = con.execute("SELECT 1 FROM diario WHERE aba = ? AND tipo = 'salvar' AND status = 'pendente' AND id < ?",
+                                                    (aba, id_gravacao)).fetchone()
+                if tipo == 'salvar' or not salvar_pendente_antes:
+                    con.execute("UPDATE diario SET status = 'confirmado', dados = '', erro = '' WHERE id = ?", (id_gravacao,))
+                if tipo == 'salvar':
+                    con.execute("UPDATE diario SET status = 'substituido', dados = '' WHERE aba = ? AND tipo IN ('salvar', 'celulas') AND status = 'pendente' AND id < ?",
+                                (aba, id_gravacao))
+            con.close()
+    except (sqlite3.Error, TypeError) as e:
+        print(f"Diário de gravações indisponível: {e}")
+
+def registrar_falha_gravacao(id_gravacao, erro):
+    """A gravação continua pendente; guarda o erro e conta a tentativa."""
+    if id_gravacao is None: return
+    try:
+        with TRAVA_DIARIO:
+            con = conectar_diario()
+            with con:
+                con.execute("UPDATE diario SET tentativas = tentativas + 1, erro = ? WHERE id = ?", (str(erro)[:500], id_gravacao))
+            con.close()
+    except sqlite3.Error as e:
+        print(f"Diário de gravações indisponível: {e}")
+
+def gravacoes_pendentes():
+    """Gravações ainda não confirmadas, na ordem em que foram feitas (com os dados)."""
+    try:
+        with TRAVA_DIARIO:
+            con = conectar_diario()
+            linhas = con.execute("SELECT id, aba, tipo, dados FROM diario WHERE status = 'pendente' ORDER BY id").fetchall()
+            con.close()
+        return [{'id': id_, 'aba': aba, 'tipo': tipo, 'dados': json.loads(dados)} for id_, aba, tipo, dados in linhas]
+    except sqlite3.Error:
+        return []
+
+def resumo_diario():
+    """Entradas do diário sem os dados (para o Diagnóstico); apaga as confirmadas mais antigas que a retenção."""
+    try:
+        with TRAVA_DIARIO:
+            con = conectar_diario()
+            with con:
+                con.execute("DELETE FROM diario WHERE status != 'pendente' AND momento < ?", (str(obter_hora_manaus() - timedelta(days=DIAS_RETENCAO_DIARIO)),))
+            df_d = pd.read_sql_query("SELECT id, momento, aba, tipo, linhas, status, tentativas, erro FROM diario ORDER BY id DESC", con)
+            con.close()
+        return df_d
+    except sqlite3.Error:
+        return pd.DataFrame()
@@ -0,0 +1,111 @@
+"""Esquema das abas de cada loja: criação, versão gravada na planilha e migrações de colunas."""
+import streamlit as st
+import pandas as pd
+from nucleo.util import obter_hora_manaus
+from nucleo.planilha import carregar_do_google, salvar_no_google
+from nucleo.auditoria import COLUNAS_INDICE_AUDITORIA, particionar_log_legado
+from nucleo.lotes import COLUNAS_LOTES, criar_lotes_iniciais
+from nucleo.ids_vendas import COLUNAS_IDS_VENDAS
+
+COLUNAS_ESTOQUE = ['código de barras', 'nome do produto', 'qtd.estoque', 'qtd_central', 'qtd_minima', 'validade', 'status_compra', 'qtd_comprada', 'preco_custo', 'preco_venda', 'categoria', 'ultimo_fornecedor', 'preco_sem_desconto', 'status']
+
+# Cabeçalho atual de cada aba da loja (sufixo -> colunas)
+ABAS_DA_LOJA = {
+    "_estoque": COLUNAS_ESTOQUE,
+    "_historico_compras": ['data', 'data_emissao', 'produto', 'fornecedor', 'qtd', 'preco_pago', 'total_gasto', 'numero_nota', 'desconto_total_money', 'preco_sem_desconto', 'obs_importacao'],
+    "_movimentacoes": ['data_hora', 'produto', 'qtd_movida'],
+    "_vendas": ['data_hora', 'produto', 'qtd_vendida', 'estoque_restante'],
+    "_lista_compras": ['produto', 'código_barras', 'qtd_sugerida', 'fornecedor', 'custo_previsto', 'data_inclusao', 'status'],
+    "_lotes": COLUNAS_LOTES,
+    "_ids_vendas": COLUNAS_IDS_VENDAS,
+    "_log_auditoria_indice": COLUNAS_INDICE_AUDITORIA,  # Os registros ficam em _log_auditoria_AAAA_MM (nucleo/auditoria.py)
+}
+ABA_ESQUEMA = "config_esquema"  # Uma linha por loja com a versão do esquema já aplicada
+
+def criar_abas_faltantes(prefixo):
+    """Grava o cabeçalho nas abas da loja que não existem ou estão vazias."""
+    for sufixo, colunas in ABAS_DA_LOJA.items():
+        aba = f"{prefixo}{sufixo}"
+        if carregar_do_google(aba).empty: salvar_no_google(pd.DataFrame(columns=colunas), aba, permitir_vazio=True)
+
+def acrescentar_colunas(prefixo, sufixo, padroes):
+    """
+    Acrescenta à aba as colunas que ainda não existem, preenchendo as linhas antigas com o padrão.
+    O padrão pode ser um valor fixo ou uma função que recebe o DataFrame da aba.
+    """
+    aba = f"{prefixo}{sufixo}"
+    df = carregar_do_google(aba)
+    if df.columns.empty: return
+    existentes = set(df.columns.str.strip().str.lower())
+    faltando = {col: padrao for col, padrao in padroes.items() if col not in existentes}
+    if not faltando: return
+    for col, padrao in faltando.items():
+        df[col] = padrao(df) if callable(padrao) else padrao
+    salvar_no_google(df, aba, permitir_vazio=True)
+
+def desconto_total_legado(df_h):
+    """Planilhas antigas guardavam o desconto por unidade (desconto_obtido)."""
+    if 'desconto_obtido' not in df_h.columns: return 0.0
+    por_unidade = pd.to_numeric(df_h['desconto_obtido'].astype(str).str.replace(',', '.', regex=False), errors='coerce').fillna(0)
+    qtd = pd.to_numeric(df_h['qtd'].astype(str).str.replace(',', '.', regex=False), errors='coerce').fillna(0)
+    return por_unidade * qtd
+
+# --- ⏪ ABA REGRAVADA POR INTEIRO (RESTAURAÇÕES) ---
+# As migrações rodam uma vez por loja: uma aba restaurada de um backup/snapshot antigo não ganharia as colunas
+# de novo. Quem regrava uma aba da loja por inteiro passa o DataFrame por aqui antes.
+PADROES_COLUNAS = {
+    "_estoque": {'preco_sem_desconto': 0.0, 'status': 'Ativo'},
+    "_historico_compras": {'desconto_total_money': desconto_total_legado, 'preco_sem_desconto': 0.0},
+}
+
+def completar_colunas_do_esquema(df, nome_aba):
+    """Acrescenta as colunas do esquema atual que faltam (mesmos padrões das migrações; demais colunas vazias)."""
+    sufixo = next((s for s in ABAS_DA_LOJA if nome_aba.endswith(s)), None)
+    if sufixo is None or df.columns.empty: return df
+    existentes = set(df.columns.astype(str).str.strip().str.lower())
+    faltando = [col for col in ABAS_DA_LOJA[sufixo] if col not in existentes]
+    if not faltando: return df
+    df = df.copy()
+    for col in faltando:
+        padrao = PADROES_COLUNAS.get(sufixo, {}).get(col, "")
+        df[col] = padrao(df) if callable(padrao) else padrao
+    return df
+
+# --- 🧬 MIGRAÇÕES (NUNCA EDITAR UMA JÁ PUBLICADA: ACRESCENTAR UMA NOVA NO FIM) ---
+MIGRACOES = [
+    (1, "Abas da loja com cabeçalho", criar_abas_faltantes),
+    (2, "Estoque: preco_sem_desconto e status",
+     lambda prefixo: acrescentar_colunas(prefixo, "_estoque", {'preco_sem_desconto': 0.0, 'status': 'Ativo'})),
+    (3, "Histórico: numero_nota, obs_importacao, data_emissao, desconto_total_money e preco_sem_desconto",
+     lambda prefixo: acrescentar_colunas(prefixo, "_historico_compras", {'numero_nota': "", 'obs_importacao': "", 'data_emissao': "", 'desconto_total_money': desconto_total_legado, 'preco_sem_desconto': 0.0})),
+    (4, "Lista de compras: código_barras",
+     lambda prefixo: acrescentar_colunas(prefixo, "_lista_compras", {'código_barras': ""})),
+    (5, "Log de auditoria: aba única dividida em abas mensais com índice", particionar_log_legado),
+    (6, "Lotes: validade por lote (loja e Casa) a partir da validade do cadastro", criar_lotes_iniciais),
+]
+VERSAO_ESQUEMA = MIGRACOES[-1][0]
+
+def ler_versoes_esquema():
+    df = carregar_do_google(ABA_ESQUEMA)
+    if df.empty or 'loja' not in df.columns: return {}
+    return dict(zip(df['loja'], pd.to_numeric(df['versao'], errors='coerce').fillna(0).astype(int)))
+
+def gravar_versao_esquema(prefixo, versao):
+    df = carregar_do_google(ABA_ESQUEMA)
+    if df.empty or 'loja' not in df.columns: df = pd.DataFrame(columns=['loja', 'versao', 'atualizado_em'])
+    df = pd.concat([df[df['loja'] != prefixo], pd.DataFrame([{'loja': prefixo, 'versao': versao, 'atualizado_em': str(obter_hora_manaus())}])], ignore_index=True)
+    salvar_no_google(df, ABA_ESQUEMA)
+
+@st.cache_resource(show_spinner="Conferindo as abas da loja...")
+def preparar_esquema(prefixo):
+    """
+    Uma vez por processo e loja: aplica as migrações que faltam e grava a versão a cada passo.
+    Com a loja em dia custa uma leitura (a aba de versões); os reruns seguintes não tocam na planilha.
+    """
+    versao = ler_versoes_esquema().get(prefixo, 0)
+    for numero, descricao, migrar in MIGRACOES:
+        if numero <= versao: continue
+        migrar(prefixo)
+        gravar_versao_esquema(prefixo, numero)
+        versao = numero
+    return versao
@@ -0,0 +1,440 @@
+"""Estoque das lojas: carregamento, gravação, auditoria, Casa global, cadastro e processamentos em lote."""
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from nucleo.util import normalizar_codigo_serie, normalizar_texto, obter_hora_manaus
+from nucleo.planilha import anexar_no_google, atualizar_campos_no_google, carregar_do_google, salvar_no_google
+from nucleo.lojas import prefixos_das_lojas
+from nucleo.esquema import COLUNAS_ESTOQUE
+from nucleo.auditoria import anexar_logs_auditoria
+from nucleo.arquivamento import juntar_com_arquivo, somente_linhas_quentes
+
+# --- 🔐 LOG DE AUDITORIA EM LOTE (ABAS MENSAIS, SÓ APPEND: VER nucleo/auditoria.py) ---
+def registrar_auditoria(prefixo, produto, qtd_antes, qtd_nova, acao, motivo="Manual"):
+    try:
+        novo_log = {
+            'data_hora': str(obter_hora_manaus()), 'produto': produto,
+            'qtd_antes': qtd_antes, 'qtd_nova': qtd_nova,
+            'acao': acao, 'motivo': motivo
+        }
+        anexar_logs_auditoria(prefixo, [novo_log])
+    except Exception as e: print(f"Erro log: {e}")
+
+def salvar_logs_em_lote(prefixo, lista_logs):
+    if not lista_logs: return
+    try:
+        anexar_logs_auditoria(prefixo, lista_logs)
+    except Exception as e: print(f"Erro log lote: {e}")
+
+# --- 🏡 ATUALIZAÇÃO DE CASA GLOBAL (AS OUTRAS LOJAS EM PARALELO) ---
+def propagar_para_lojas(prefixo_origem, pipeline):
+    """
+    Roda pipeline(loja) ao mesmo tempo em cada uma das outras lojas (ler, mesclar, gravar e logar):
+    o tempo total é o da loja mais lenta, e o erro de uma loja não impede as outras.
+    Devolve o relatório {loja: {'produtos': alterados, 'erro': texto ou ""}}.
+    """
+    outras = [loja for loja in prefixos_das_lojas() if loja != prefixo_origem]
+    if not outras: return {}
+    def rodar(loja):
+        try: return {'produtos': pipeline(loja), 'erro': ""}
+        except Exception as e:
+            print(f"Erro propagação Casa ({loja}): {e}")
+            return {'produtos': 0, 'erro': f"{type(e).__name__}: {e}"}
+    with ThreadPoolExecutor(max_workers=len(outras)) as executor:
+        return dict(zip(outras, executor.map(rodar, outras)))
+
+def falhas_da_propagacao(relatorio):
+    """Texto com as lojas que falharam no relatório de propagar_para_lojas ("" se todas foram atualizadas)."""
+    return "; ".join(f"{loja}: {r['erro']}" for loja, r in relatorio.items() if r['erro'])
+
+def ler_estoque_da_loja(loja):
+    """Aba de estoque de outra loja como está na planilha (sem tratar os valores), para saber quem ela tem e a Casa de antes."""
+    df_outra = carregar_do_google(f"{loja}_estoque")
+    if not df_outra.empty: df_outra.columns = df_outra.columns.str.strip().str.lower()
+    return df_outra
+
+def campos_do_produto(df_outra, nome_produto, valores):
+    """(nome, coluna, valor) para gravar {coluna: valor} no produto, só nas colunas que a aba da outra loja tem."""
+    return [(nome_produto, col, valor) for col, valor in valores.items() if col in df_outra.columns]
+
+def gravar_campos_da_loja(loja, campos, logs):
+    """
+    Grava só os campos mudados no estoque de outra loja (a linha de cada produto é achada pelo nome na hora do envio)
+    e o log dela; erro de gravação vira exceção (para o relatório).
+    """
+    if not atualizar_campos_no_google(f"{loja}_estoque", 'nome do produto', campos):
+        raise RuntimeError(f"{loja}_estoque não gravou (ficou no diário para reenvio)")
+    salvar_logs_em_lote(loja, logs)
+
+def atualizar_casa_global(nome_produto, qtd_nova_casa, novo_custo, novo_venda, nova_validade, prefixo_ignorar):
+    """Atualiza 1 produto em todas as outras lojas (Modo Antigo). Devolve o relatório por loja."""
+    valores = {'qtd_central': qtd_nova_casa, 'preco_custo': novo_custo, 'preco_venda': novo_venda, 'validade': nova_validade}
+    valores = {col: valor for col, valor in valores.items() if valor is not None}
+    def pipeline(loja):
+        df_outra = ler_estoque_da_loja(loja)
+        if df_outra.empty: return 0
+        achados = (df_outra['nome do produto'].astype(str) == str(nome_produto)).to_numpy().nonzero()[0]
+        if not len(achados): return 0
+        posicao = achados[0]
+        gravar_campos_da_loja(loja, campos_do_produto(df_outra, str(nome_produto), valores), [{
+            'data_hora': str(obter_hora_manaus()), 'produto': nome_produto,
+            'qtd_antes': df_outra['qtd_central'].iat[posicao], 'qtd_nova': qtd_nova_casa,
+            'acao': "Sincronização Automática", 'motivo': f"Origem: {prefixo_ignorar}"
+        }])
+        return 1
+    return propagar_para_lojas(prefixo_ignorar, pipeline)
+
+def atualizar_casa_global_em_lote(lista_atualizacoes, prefixo_origem):
+    """
+    Leva a Casa (qtd_central, preços e validade) de vários produtos para as outras lojas.
+    Cada loja recebe só os campos que mudam, num único envio. Devolve o relatório por loja.
+    """
+    if not lista_atualizacoes: return {}
+    dict_updates = {item['produto']: item for item in lista_atualizacoes}
+    
+    def pipeline(loja):
+        df_outra = ler_estoque_da_loja(loja)
+        if df_outra.empty: return 0
+        # Primeira linha de cada nome (um dicionário no lugar de uma máscara por produto)
+        posicao_por_nome = {}
+        for posicao, nome in enumerate(df_outra['nome do produto'].astype(str)): posicao_por_nome.setdefault(nome, posicao)
+        campos, logs_loja_outra = [], []
+        
+        for produto, dados in dict_updates.items():
+            posicao = posicao_por_nome.get(str(produto))
+            if posicao is None: continue
+            valores = {'qtd_central': dados['qtd_central'], 'preco_custo': dados.get('custo'), 'preco_venda': dados.get('venda'), 'validade': dados.get('validade')}
+            campos += campos_do_produto(df_outra, str(produto), {col: valor for col, valor in valores.items() if valor is not None})
+            logs_loja_outra.append({
+                'data_hora': str(obter_hora_manaus()), 'produto': produto,
+                'qtd_antes': df_outra['qtd_central'].iat[posicao], 'qtd_nova': dados['qtd_central'],
+                'acao': "Sincronização em Lote", 'motivo': f"Origem: {prefixo_origem}"
+            })
+        
+        if logs_loja_outra: gravar_campos_da_loja(loja, campos, logs_loja_outra)
+        return len(logs_loja_outra)
+    return propagar_para_lojas(prefixo_origem, pipeline)
+
+# --- ARQUIVOS ---
+def carregar_dados(prefixo_arquivo):
+    try:
+        df = carregar_do_google(f"{prefixo_arquivo}_estoque")
+        if df.empty: return pd.DataFrame()
+        df.columns = df.columns.str.strip().str.lower()
+        # A migração cria essas colunas, mas uma aba reescrita a partir de backup/snapshot antigo pode não tê-las
+        if 'preco_sem_desconto' not in df.columns: df['preco_sem_desconto'] = 0.0
+        if 'status' not in df.columns: df['status'] = 'Ativo'
+        
+        cols_num = ['qtd.estoque', 'qtd_central', 'qtd_minima', 'qtd_comprada', 'preco_custo', 'preco_venda', 'preco_sem_desconto']
+        for col in cols_num:
+            if col in df.columns: 
+                df[col] = df[col].astype(str).str.replace(',', '.', regex=False)
+                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        df['ultimo_fornecedor'] = df['ultimo_fornecedor'].fillna('')
+        df['código de barras'] = df['código de barras'].apply(lambda x: str(x).replace('.0', '').strip() if pd.notnull(x) else "")
+        df['nome do produto'] = df['nome do produto'].apply(lambda x: normalizar_texto(str(x)))
+        df['validade'] = pd.to_datetime(df['validade'], dayfirst=True, errors='coerce')
+        return df
+    except: return pd.DataFrame()
+
+def carregar_historico(prefixo_arquivo, incluir_arquivo=False):
+    try:
+        df_h = carregar_do_google(f"{prefixo_arquivo}_historico_compras")
+        if incluir_arquivo: df_h = juntar_com_arquivo(df_h, prefixo_arquivo, "_historico_compras")
+        if df_h.empty: return pd.DataFrame()
+        
+        # Filtra colunas indesejadas (display_combo, etc) já na leitura para limpar visual
+        cols_ok = [c for c in df_h.columns if c not in ['display_combo', 'produto_str', 'Selecionar', 'status_temp']]
+        df_h = df_h[cols_ok]
+
+        df_h['data'] = pd.to_datetime(df_h['data'], errors='coerce')
+        cols_num = ['qtd', 'preco_pago', 'total_gasto', 'desconto_total_money', 'preco_sem_desconto']
+        for c in cols_num:
+             if c in df_h.columns: 
+                 df_h[c] = df_h[c].astype(str).str.replace(',', '.', regex=False)
+                 df_h[c] = pd.to_numeric(df_h[c], errors='coerce').fillna(0)
+        # A migração cria essas colunas, mas uma restauração (SUBSTITUIÇÃO TOTAL) de backup antigo pode tirá-las da aba
+        if 'desconto_total_money' not in df_h.columns:
+            if 'desconto_obtido' in df_h.columns: df_h['desconto_total_money'] = pd.to_numeric(df_h['desconto_obtido'].astype(str).str.replace(',', '.', regex=False), errors='coerce').fillna(0) * df_h['qtd']
+            else: df_h['desconto_total_money'] = 0.0
+        if 'preco_sem_desconto' not in df_h.columns: df_h['preco_sem_desconto'] = 0.0
+        mask_zerado = (df_h['preco_sem_desconto'] == 0) & (df_h['preco_pago'] > 0)
+        df_h.loc[mask_zerado, 'preco_sem_desconto'] = df_h.loc[mask_zerado, 'preco_pago']
+        return df_h
+    except: return pd.DataFrame()
+
+def carregar_movimentacoes(prefixo_arquivo, incluir_arquivo=False):
+    try:
+        df_m = carregar_do_google(f"{prefixo_arquivo}_movimentacoes")
+        if incluir_arquivo: df_m = juntar_com_arquivo(df_m, prefixo_arquivo, "_movimentacoes")
+        if df_m.empty: return pd.DataFrame()
+        df_m['data_hora'] = pd.to_datetime(df_m['data_hora'], errors='coerce')
+        return df_m
+    except: return pd.DataFrame()
+
+def carregar_vendas(prefixo_arquivo, incluir_arquivo=False):
+    try:
+        df_v = carregar_do_google(f"{prefixo_arquivo}_vendas")
+        if incluir_arquivo: df_v = juntar_com_arquivo(df_v, prefixo_arquivo, "_vendas")
+        if df_v.empty: return pd.DataFrame()
+        df_v['data_hora'] = pd.to_datetime(df_v['data_hora'], errors='coerce')
+        return df_v
+    except: return pd.DataFrame()
+
+def carregar_lista_compras(prefixo_arquivo):
+    try:
+        df = carregar_do_google(f"{prefixo_arquivo}_lista_compras")
+        if df.empty: return pd.DataFrame()
+        if 'qtd_sugerida' in df.columns: df['qtd_sugerida'] = pd.to_numeric(df['qtd_sugerida'], errors='coerce')
+        return df
+    except: return pd.DataFrame()
+
+def carregar_base_oficial():
+    return carregar_do_google("meus_produtos_oficiais")
+
+# --- 🔔 QUEM ACOMPANHA AS GRAVAÇÕES DO ESTOQUE ---
+# O núcleo não guarda estado de sessão: o app inscreve aqui o que ele deriva do estoque (a lista de reposição,
+# nucleo/reposicao.py) e cada gravação avisa as linhas que mexeu (None = a tabela inteira).
+AO_GRAVAR_ESTOQUE = []
+
+def inscrever_ao_gravar_estoque(funcao):
+    """funcao(df, prefixo, alterados) passa a ser chamada depois de cada gravação do estoque (inscrever de novo não repete)."""
+    if funcao not in AO_GRAVAR_ESTOQUE: AO_GRAVAR_ESTOQUE.append(funcao)
+
+def avisar_gravacao_estoque(df, prefixo, alterados=None):
+    for funcao in AO_GRAVAR_ESTOQUE: funcao(df, prefixo, alterados)
+
+# --- SALVAMENTO ---
+def salvar_estoque(df, prefixo, alterados=None):
+    """alterados = rótulos das linhas mexidas, repassados a quem acompanha as gravações (None = tabela inteira)."""
+    salvar_no_google(df, f"{prefixo}_estoque")
+    avisar_gravacao_estoque(df, prefixo, alterados)
+# Linhas carregadas com incluir_arquivo=True nunca voltam para a aba quente
+def salvar_historico(df, prefixo): salvar_no_google(somente_linhas_quentes(df), f"{prefixo}_historico_compras")
+def salvar_movimentacoes(df, prefixo): salvar_no_google(somente_linhas_quentes(df), f"{prefixo}_movimentacoes")
+def salvar_vendas(df, prefixo): salvar_no_google(somente_linhas_quentes(df), f"{prefixo}_vendas")
+def salvar_lista_compras(df, prefixo): salvar_no_google(df, f"{prefixo}_lista_compras", permitir_vazio=True)
+
+# --- 🔗 UNIFICAÇÃO DE DUPLICADOS (MESMO CÓDIGO DE BARRAS) ---
+def unificar_produtos_por_codigo(df, retornar_relatorio=False):
+    """
+    Junta linhas com o mesmo código de barras (groupby + agg, sem laço em Python):
+    nome mais longo, soma de loja e casa, maiores preços, Ativo se qualquer linha for ativa.
+    Com retornar_relatorio=True devolve também (código, linhas unidas, nome final, nomes originais).
+    """
+    relatorio = pd.DataFrame(columns=['código de barras', 'linhas_unidas', 'nome_final', 'nomes_originais'])
+    if df.empty: return (df, relatorio) if retornar_relatorio else df
+    cols_num = ['qtd.estoque', 'qtd_central', 'qtd_minima', 'qtd_comprada', 'preco_custo', 'preco_venda', 'preco_sem_desconto']
+    for col in cols_num:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.replace(',', '.', regex=False)
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    sem_codigo = df[df['código de barras'] == ""]
+    com_codigo = df[df['código de barras'] != ""]
+
+    # Linha base de cada código: a primeira com o nome mais longo (mesmo critério do max(key=len))
+    ordem = com_codigo.assign(_tam=-com_codigo['nome do produto'].astype(str).str.len(), _pos=range(len(com_codigo)))
+    ordem = ordem.sort_values(by=['código de barras', '_tam', '_pos'], kind='stable')
+    df_novo = ordem.drop_duplicates('código de barras', keep='first').drop(columns=['_tam', '_pos']).set_index('código de barras', drop=False)
+
+    grupos = com_codigo.groupby('código de barras')
+    qtd_linhas = grupos.size()
+    duplicados = qtd_linhas[qtd_linhas > 1].index
+    if len(duplicados):
+        agregados = grupos.agg(**{
+            'qtd.estoque': ('qtd.estoque', 'sum'), 'qtd_central': ('qtd_central', 'sum'),
+            'preco_custo': ('preco_custo', 'max'), 'preco_venda': ('preco_venda', 'max'),
+        }).loc[duplicados]
+        agregados['preco_sem_desconto'] = grupos['preco_sem_desconto'].max().loc[duplicados] if 'preco_sem_desconto' in com_codigo.columns else 0.0
+        agregados['status'] = (com_codigo['status'] == 'Ativo').groupby(com_codigo['código de barras']).any().loc[duplicados].map({True: 'Ativo', False: 'Inativo'})
+        for col in agregados.columns:
+            df_novo.loc[duplicados, col] = agregados[col]
+
+        nomes = com_codigo[com_codigo['código de barras'].isin(duplicados)].groupby('código de barras')['nome do produto'].agg(lambda x: " | ".join(dict.fromkeys(x.astype(str))))
+        relatorio = pd.DataFrame({
+            'código de barras': duplicados, 'linhas_unidas': qtd_linhas.loc[duplicados].values,
+            'nome_final': df_novo.loc[duplicados, 'nome do produto'].values, 'nomes_originais': nomes.loc[duplicados].values
+        })
+
+    df_novo = df_novo.reset_index(drop=True)
+    if not sem_codigo.empty:
+        df_novo = pd.concat([df_novo, sem_codigo], ignore_index=True)
+    return (df_novo, relatorio) if retornar_relatorio else df_novo
+
+def unificar_todas_as_lojas(lojas=None):
+    """Limpeza de duplicados por código em todas as lojas. Salva só as lojas que tinham duplicados."""
+    resultado = {}
+    for loja in (lojas or prefixos_das_lojas()):
+        df_loja = carregar_dados(loja)
+        if df_loja.empty: continue
+        df_unificado, relatorio = unificar_produtos_por_codigo(df_loja, retornar_relatorio=True)
+        if not relatorio.empty:
+            salvar_estoque(df_unificado, loja)
+            qtd_final = df_unificado.drop_duplicates('código de barras').set_index('código de barras')['qtd.estoque']
+            agora = str(obter_hora_manaus())
+            salvar_logs_em_lote(loja, [{'data_hora': agora, 'produto': nome, 'qtd_antes': 0, 'qtd_nova': qtd_final.get(cod, 0), 'acao': "Unificação por Código", 'motivo': f"{n} linhas unidas (Cód. {cod})"} for cod, n, nome in zip(relatorio['código de barras'], relatorio['linhas_unidas'], relatorio['nome_final'])])
+        resultado[loja] = relatorio
+    return resultado
+
+# --- 🆕 CADASTRO (ÍNDICE DE CÓDIGOS + LOTE) ---
+# Nomes aceitos no arquivo/colagem do cadastro em lote -> coluna do estoque
+APELIDOS_CADASTRO = {
+    'código de barras': ['código de barras', 'codigo de barras', 'código', 'codigo', 'ean', 'gtin'],
+    'nome do produto': ['nome do produto', 'nome', 'produto', 'descrição', 'descricao'],
+    'categoria': ['categoria'],
+    'preco_custo': ['preco_custo', 'preço custo', 'preco custo', 'custo'],
+    'preco_venda': ['preco_venda', 'preço venda', 'preco venda', 'venda'],
+    'qtd_minima': ['qtd_minima', 'estoque mínimo', 'estoque minimo', 'minimo'],
+    'qtd.estoque': ['qtd.estoque', 'qtd loja', 'qtd_loja', 'loja'],
+    'qtd_central': ['qtd_central', 'qtd casa', 'qtd_casa', 'casa'],
+    'validade': ['validade'],
+}
+
+def indice_codigos(df):
+    """Conjunto com os códigos de barras já cadastrados (verificação exata, O(1) por código)."""
+    if df.empty: return set()
+    return set(df['código de barras'].astype(str).str.strip()) - {""}
+
+def validar_cadastro_em_lote(df_lote, codigos_existentes):
+    """
+    Valida o lote inteiro de forma vetorizada. Retorna (válidos no formato do estoque, inválidos com o motivo).
+    """
+    lote = df_lote.copy()
+    lote.columns = [str(c).strip().lower() for c in lote.columns]
+    dados = {}
+    for destino, apelidos in APELIDOS_CADASTRO.items():
+        origem = next((a for a in apelidos if a in lote.columns), None)
+        dados[destino] = lote[origem] if origem else pd.Series([None] * len(lote), index=lote.index)
+    novos = pd.DataFrame(dados, index=lote.index)
+
+    novos['código de barras'] = normalizar_codigo_serie(novos['código de barras'].fillna(""))
+    novos['nome do produto'] = novos['nome do produto'].fillna("").astype(str).str.upper().str.strip()
+    novos['categoria'] = novos['categoria'].fillna("").astype(str).str.strip()
+    motivo = pd.Series("", index=novos.index)
+    for col, padrao in [('preco_custo', 0.0), ('preco_venda', 0.0), ('qtd_minima', 5), ('qtd.estoque', 0), ('qtd_central', 0)]:
+        bruto = novos[col].fillna("").astype(str).str.strip()
+        valores = pd.to_numeric(bruto.str.replace(',', '.', regex=False), errors='coerce')
+        motivo[(bruto != "") & valores.isna()] = f"Valor inválido em {col}"
+        novos[col] = valores.fillna(padrao)
+    novos['validade'] = pd.to_datetime(novos['validade'], dayfirst=True, errors='coerce')
+
+    motivo[novos['código de barras'].duplicated(keep='first')] = "Código repetido no lote"
+    motivo[novos['código de barras'].isin(codigos_existentes)] = "Código já existe!"
+    motivo[(novos['código de barras'].isin(["", "nan", "None"])) | (novos['nome do produto'] == "")] = "Código e Nome obrigatórios!"
+
+    validos = novos[motivo == ""].copy()
+    validos = validos.assign(status_compra='OK', qtd_comprada=0, ultimo_fornecedor='', preco_sem_desconto=0.0, status='Ativo')[COLUNAS_ESTOQUE]
+    invalidos = novos[motivo != ""].assign(motivo=motivo[motivo != ""])
+    return validos.reset_index(drop=True), invalidos
+
+def cadastrar_produtos(df, df_novos, prefixo, acao="Novo Cadastro"):
+    """Acrescenta os produtos em um único append na aba de estoque e registra a auditoria. Retorna o df atualizado."""
+    if df_novos.empty: return df
+    anexar_no_google(df_novos, f"{prefixo}_estoque")
+    agora = str(obter_hora_manaus())
+    salvar_logs_em_lote(prefixo, [{'data_hora': agora, 'produto': nome, 'qtd_antes': 0, 'qtd_nova': qtd, 'acao': acao, 'motivo': "Manual"} for nome, qtd in zip(df_novos['nome do produto'], df_novos['qtd.estoque'])])
+    df_final = pd.concat([df, df_novos], ignore_index=True)
+    # Rótulos antigos só se mantêm se o df já era 0..n-1 (senão o concat renumera tudo e a tabela inteira é avisada)
+    mantidos = df.index.equals(pd.RangeIndex(len(df)))
+    avisar_gravacao_estoque(df_final, prefixo, df_final.index[len(df):].tolist() if mantidos else None)
+    return df_final
+
+# --- ✏️ EDIÇÃO EM TABELA (SÓ O QUE MUDOU) ---
+def celulas_alteradas(df_antes, df_depois):
+    """
+    Células que mudaram entre a tabela mostrada e a editada (linhas e colunas em comum), coluna a coluna, sem laço por linha.
+    Vazio dos dois lados (NaN/NaT) não conta como mudança. Devolve DataFrame (rotulo, coluna, antes, depois).
+    """
+    linhas = df_antes.index.intersection(df_depois.index)
+    partes = []
+    for col in df_antes.columns.intersection(df_depois.columns):
+        antes, depois = df_antes.loc[linhas, col], df_depois.loc[linhas, col]
+        iguais = antes.eq(depois).fillna(False).astype(bool) | (antes.isna() & depois.isna())
+        if not iguais.all():
+            partes.append(pd.DataFrame({'rotulo': linhas[~iguais.to_numpy()], 'coluna': col, 'antes': antes[~iguais].to_numpy(), 'depois': depois[~iguais].to_numpy()}))
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=['rotulo', 'coluna', 'antes', 'depois'])
+
+# --- 📦 PROCESSAMENTOS EM LOTE (PICKLIST / PLANOGRAMA / RELATÓRIO DE VENDAS) ---
+def aplicar_picklist(df, df_pick, col_barras, col_qtd, ao_progredir=None):
+    """
+    Transfere da Casa para a Loja cada linha da picklist (altera o df no lugar).
+    Retorna (movidos, erros, log_movs, log_auditoria, atualizacoes_casa).
+    """
+    movidos = 0
+    erros = 0
+    total_linhas = len(df_pick)
+    log_movs = []
+    log_auditoria_buffer = []
+    atualizacoes_casa_global = [] 
+
+    for i, row in df_pick.iterrows():
+        cod_pick = str(row[col_barras]).replace('.0', '').strip()
+        qtd_pick = pd.to_numeric(row[col_qtd], errors='coerce')
+        if qtd_pick > 0:
+            mask = df['código de barras'] == cod_pick
+            if mask.any():
+                idx = df[mask].index[0]
+                nome_prod = df.at[idx, 'nome do produto']
+                qtd_antiga_loja = df.at[idx, 'qtd.estoque']
+                df.at[idx, 'qtd_central'] -= qtd_pick
+                df.at[idx, 'qtd.estoque'] += qtd_pick
+                log_movs.append({'data_hora': str(obter_hora_manaus()), 'produto': nome_prod, 'qtd_movida': qtd_pick})
+                
+                atualizacoes_casa_global.append({'produto': nome_prod, 'qtd_central': df.at[idx, 'qtd_central']})
+                log_auditoria_buffer.append({'data_hora': str(obter_hora_manaus()), 'produto': nome_prod, 'qtd_antes': qtd_antiga_loja, 'qtd_nova': df.at[idx, 'qtd.estoque'], 'acao': "Transferência Picklist", 'motivo': "Lote"})
+                movidos += 1
+            else: erros += 1
+        if ao_progredir: ao_progredir((i+1)/total_linhas)
+    return movidos, erros, log_movs, log_auditoria_buffer, atualizacoes_casa_global
+
+def sincronizar_planograma(df, df_raw, idx_barras, idx_nome, idx_qtd, idx_preco, ao_progredir=None):
+    """Aplica as quantidades (e preços, se escolhidos) do planograma; produtos que faltam viram cadastro novo. Retorna (df, logs)."""
+    novos_prods = []
+    logs_plano = [] 
+    total_linhas = len(df_raw)
+    
+    for i in range(1, total_linhas):
+        try:
+            cod = str(df_raw.iloc[i, idx_barras]).replace('.0', '').strip()
+            nome = normalizar_texto(str(df_raw.iloc[i, idx_nome]))
+            qtd = pd.to_numeric(df_raw.iloc[i, idx_qtd], errors='coerce')
+            if cod and nome and pd.notnull(qtd):
+                mask = df['código de barras'] == cod
+                if mask.any():
+                    idx = df[mask].index[0]
+                    antigo = df.at[idx, 'qtd.estoque']
+                    df.loc[mask, 'qtd.estoque'] = qtd
+                    if antigo != qtd: logs_plano.append({'data_hora': str(obter_hora_manaus()), 'produto': nome, 'qtd_antes': antigo, 'qtd_nova': qtd, 'acao': "Sincronização", 'motivo': "Planograma"})
+                    if idx_preco != "(Ignorar)":
+                        val = pd.to_numeric(df_raw.iloc[i, idx_preco], errors='coerce')
+                        if pd.notnull(val): df.loc[mask, 'preco_venda'] = val
+                else:
+                    val_p = 0.0
+                    if idx_preco != "(Ignorar)": val_p = pd.to_numeric(df_raw.iloc[i, idx_preco], errors='coerce') or 0.0
+                    novos_prods.append({'código de barras': cod, 'nome do produto': nome, 'qtd.estoque': qtd, 'qtd_central': 0, 'qtd_minima': 5, 'validade': None, 'status_compra': 'OK', 'qtd_comprada': 0, 'preco_custo': 0.0, 'preco_venda': val_p, 'categoria': 'GERAL', 'ultimo_fornecedor': '', 'preco_sem_desconto': 0.0, 'status': 'Ativo'})
+        except: pass
+        if ao_progredir: ao_progredir((i+1)/total_linhas)
+    
+    if novos_prods: df = pd.concat([df, pd.DataFrame(novos_prods)], ignore_index=True)
+    return df, logs_plano
+
+def baixar_vendas_relatorio(df, df_vendas_rel, col_nome, col_qtd, ao_progredir=None, linhas_baixadas=None):
+    """
+    Baixa do estoque (no lugar) cada venda do relatório, achando o produto pelo nome. Retorna os registros de venda.
+    Se receber a lista linhas_baixadas, acrescenta nela o rótulo de cada linha do relatório que virou registro
+    (as de quantidade zerada ou produto não achado ficam de fora).
+    """
+    novos_reg = []
+    total = len(df_vendas_rel)
+    for i, row in df_vendas_rel.iterrows():
+        nome = str(row[col_nome]).strip()
+        qtd = pd.to_numeric(row[col_qtd], errors='coerce')
+        if pd.notnull(qtd) and qtd > 0:
+            mask = df['nome do produto'].astype(str).str.contains(nome, case=False, na=False)
+            if mask.any():
+                idx = df[mask].index[0]
+                df.at[idx, 'qtd.estoque'] -= qtd
+                novos_reg.append({"data_hora": str(obter_hora_manaus()), "produto": df.at[idx, 'nome do produto'], "qtd_vendida": qtd, "estoque_restante": df.at[idx, 'qtd.estoque']})
+                if linhas_baixadas is not None: linhas_baixadas.append(i)
+        if ao_progredir: ao_progredir((i+1)/total)
+    return novos_reg
@@ -0,0 +1,117 @@
+"""IDs de vendas já baixadas: aba só de append em blocos ordenados e índice compacto (vetores ordenados + filtro de Bloom em bits)."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import threading
+from nucleo.util import obter_hora_manaus
+from nucleo.planilha import anexar_no_google, carregar_do_google
+
+# ==============================================================================
+# 🔐 MEMÓRIA DE VENDAS PROCESSADAS ({prefixo}_ids_vendas)
+# ==============================================================================
+# Cada importação acrescenta UM bloco com os IDs novos já ordenados; a aba nunca é reescrita
+# (e é lida pelo cache colunar, que só baixa as linhas novas).
+COLUNAS_IDS_VENDAS = ['id_transacao', 'bloco']
+BITS_POR_ID = 10  # Filtro de Bloom com ~1% de falso positivo (os positivos são conferidos nos vetores ordenados)
+HASHES_BLOOM = 7
+FOLGA_BLOOM = 1.25  # Capacidade do filtro além dos IDs atuais (crescer até ela não piora o 1%; passou disso, refaz)
+PADRAO_ID_INTEIRO = r'(?:0|[1-9][0-9]{0,17})'  # Guardado como int64: sem zero à esquerda, volta igual para texto
+
+def normalizar_ids(valores):
+    """IDs como texto, sem espaços nem o '.0' que o Excel põe em números."""
+    return pd.Series(valores, dtype=object).fillna("").astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+
+def separar_ids(ids):
+    """(inteiros, textos, máscara): IDs numéricos viram int64 (8 bytes cada); o resto fica como texto (object)."""
+    ids = pd.Series(ids, dtype=object).astype(str)
+    inteiro = ids.str.fullmatch(PADRAO_ID_INTEIRO).to_numpy(dtype=bool)
+    return ids[inteiro].astype(np.int64).to_numpy(), ids[~inteiro].to_numpy(dtype=object), inteiro
+
+def hashes_bloom(ids, tamanho):
+    """Posições dos k bits de cada ID (hash duplo, vetorizado): matriz n x k. ids = vetor int64 ou de texto."""
+    if ids.dtype == np.int64:
+        valores = ids.view(np.uint64)
+        h1 = pd.util.hash_array(valores)
+        h2 = pd.util.hash_array(valores ^ np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+    else:
+        h1 = pd.util.hash_array(ids, hash_key="idsvendasbloom01").astype(np.uint64)
+        h2 = pd.util.hash_array(ids, hash_key="idsvendasbloom02").astype(np.uint64) | np.uint64(1)
+    passos = np.arange(HASHES_BLOOM, dtype=np.uint64)
+    return ((h1[:, None] + passos[None, :] * h2[:, None]) % np.uint64(tamanho)).astype(np.int64)
+
+def ligar_bits(bits, posicoes):
+    posicoes = posicoes.ravel()
+    np.bitwise_or.at(bits, posicoes >> 3, (1 << (posicoes & 7)).astype(np.uint8))
+
+def bits_ligados(bits, posicoes):
+    return ((bits[posicoes >> 3] >> (posicoes & 7)) & 1).astype(bool)
+
+def buscar_ordenado(ids, alvo, bloom, tamanho):
+    """Vetor booleano: alvo (mesmo tipo de ids) está em ids. O filtro descarta antes da busca binária."""
+    resultado = np.zeros(len(alvo), dtype=bool)
+    if not len(alvo) or not len(ids): return resultado
+    talvez = bits_ligados(bloom, hashes_bloom(alvo, tamanho)).all(axis=1)
+    if talvez.any():
+        candidatos = alvo[talvez]
+        pos = np.searchsorted(ids, candidatos).clip(max=len(ids) - 1)
+        resultado[talvez] = ids[pos] == candidatos
+    return resultado
+
+class IndiceIds:
+    """
+    IDs ordenados (np.searchsorted) + filtro de Bloom em bits (np.uint8) para descartar rápido o que nunca foi visto.
+    IDs numéricos ficam num vetor int64; os demais, num vetor de texto à parte.
+    """
+    def __init__(self, ids=()):
+        self.trava = threading.Lock()
+        inteiros, textos, _ = separar_ids(list(ids))
+        self.inteiros, self.textos = np.unique(inteiros), np.unique(textos)
+        self.refazer_bloom()
+
+    def refazer_bloom(self):
+        self.capacidade = max(1024, int(len(self) * FOLGA_BLOOM))
+        self.tamanho_bloom = self.capacidade * BITS_POR_ID
+        self.bloom = np.zeros((self.tamanho_bloom + 7) // 8, dtype=np.uint8)
+        for parte in (self.inteiros, self.textos):
+            if len(parte): ligar_bits(self.bloom, hashes_bloom(parte, self.tamanho_bloom))
+
+    def __len__(self):
+        return len(self.inteiros) + len(self.textos)
+
+    def contem(self, valores):
+        """Vetor booleano: True onde o ID já foi processado."""
+        inteiros, textos, inteiro = separar_ids(normalizar_ids(valores))
+        with self.trava: ids_inteiros, ids_textos, bloom, tamanho = self.inteiros, self.textos, self.bloom, self.tamanho_bloom
+        resultado = np.zeros(len(inteiro), dtype=bool)
+        resultado[inteiro] = buscar_ordenado(ids_inteiros, inteiros, bloom, tamanho)
+        resultado[~inteiro] = buscar_ordenado(ids_textos, textos, bloom, tamanho)
+        return resultado
+
+    def acrescentar(self, novos):
+        inteiros, textos, _ = separar_ids(list(novos))
+        with self.trava:
+            self.inteiros, self.textos = np.union1d(self.inteiros, inteiros), np.union1d(self.textos, textos)
+            if len(self) > self.capacidade: self.refazer_bloom()
+            else:
+                # Bits só são ligados: uma consulta no meio disso, no pior caso, confere um candidato a mais no vetor
+                for parte in (inteiros, textos):
+                    if len(parte): ligar_bits(self.bloom, hashes_bloom(parte, self.tamanho_bloom))
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def carregar_ids_processados(prefixo):
+    """Índice dos IDs já baixados da loja. Só a página de vendas usa; relido de 5 em 5 minutos (outras sessões)."""
+    df_ids = carregar_do_google(f"{prefixo}_ids_vendas")
+    if df_ids.empty or 'id_transacao' not in df_ids.columns: return IndiceIds()
+    ids = normalizar_ids(df_ids['id_transacao'])
+    return IndiceIds(ids[ids != ""])
+
+def salvar_ids_processados(prefixo, novos_ids):
+    """Acrescenta à aba, num bloco ordenado, só os IDs que ainda não estavam lá, e atualiza o índice em memória. Devolve quantos."""
+    indice = carregar_ids_processados(prefixo)
+    novos = normalizar_ids(list(novos_ids))
+    novos = np.unique(novos[(novos != "") & ~indice.contem(novos)].to_numpy(dtype=object))
+    if not len(novos): return 0
+    bloco = obter_hora_manaus().strftime("%Y%m%d%H%M%S")
+    anexar_no_google(pd.DataFrame({'id_transacao': novos, 'bloco': bloco}), f"{prefixo}_ids_vendas")
+    indice.acrescentar(novos)  # Mesmo se a nuvem falhar: o bloco ficou no diário e será reenviado
+    return len(novos)
@@ -0,0 +1,73 @@
+"""Cadastro de lojas: quais lojas existem, o nome no menu e em qual planilha ficam as abas de cada uma."""
+import pandas as pd
+import re
+from nucleo.planilha import carregar_do_google, definir_planilhas_das_lojas, salvar_no_google
+from nucleo.lotes import DONO_CASA
+
+# ==============================================================================
+# 🏬 CADASTRO DE LOJAS (ABA config_lojas NA PLANILHA PRINCIPAL)
+# ==============================================================================
+# prefixo: começo das abas da loja ({prefixo}_estoque, ...) · planilha: vazia = planilha principal
+# ativa: "Não" tira a loja do menu e das propagações · ordem: posição no menu
+ABA_LOJAS = "config_lojas"
+COLUNAS_LOJAS = ['prefixo', 'nome', 'planilha', 'ativa', 'ordem']
+LOJAS_PADRAO = [
+    {'prefixo': "loja1", 'nome': "Loja 1 (Principal)", 'planilha': "", 'ativa': "Sim", 'ordem': 1},
+    {'prefixo': "loja2", 'nome': "Loja 2 (Filial)", 'planilha': "", 'ativa': "Sim", 'ordem': 2},
+    {'prefixo': "loja3", 'nome': "Loja 3 (Extra)", 'planilha': "", 'ativa': "Sim", 'ordem': 3},
+]
+VALORES_INATIVA = {"não", "nao", "n", "false", "0", "inativa"}
+# Começo das abas gerais (config_lojas, config_esquema, casa_lotes, meus_produtos_oficiais): uma loja com esse
+# prefixo tomaria essas abas como dela (roteamento para a planilha própria, backup, arquivamento)
+PREFIXOS_RESERVADOS = {"config", DONO_CASA, "meus"}
+FORMATO_PREFIXO = re.compile(r"[a-z0-9]+")
+
+def preparar_cadastro_lojas(df_l):
+    """Tipos e limpeza: prefixo em minúsculas sem repetição, ordem numérica, nome padrão = prefixo."""
+    df_l = df_l.reindex(columns=COLUNAS_LOJAS).fillna("").astype(str)
+    for col in COLUNAS_LOJAS: df_l[col] = df_l[col].str.strip()
+    df_l['prefixo'] = df_l['prefixo'].str.lower()
+    df_l = df_l[df_l['prefixo'] != ""].drop_duplicates('prefixo')
+    df_l['nome'] = df_l['nome'].where(df_l['nome'] != "", df_l['prefixo'])
+    df_l['ordem'] = pd.to_numeric(df_l['ordem'], errors='coerce')
+    return df_l.sort_values('ordem', kind='stable', na_position='last').reset_index(drop=True)
+
+def carregar_cadastro_lojas():
+    """Todas as lojas do cadastro (ativas e inativas). Sem cadastro ainda: as três lojas de sempre."""
+    df_l = carregar_do_google(ABA_LOJAS)
+    if df_l.empty or 'prefixo' not in df_l.columns: df_l = pd.DataFrame(LOJAS_PADRAO)
+    df_l = preparar_cadastro_lojas(df_l)
+    # Abas {prefixo}_* de lojas com planilha própria passam a ser lidas/gravadas nela (as abas gerais nunca)
+    definir_planilhas_das_lojas({p: nome for p, nome in zip(df_l['prefixo'], df_l['planilha']) if nome and p not in PREFIXOS_RESERVADOS})
+    return df_l
+
+def carregar_lojas():
+    """Lojas ativas, na ordem do menu."""
+    df_l = carregar_cadastro_lojas()
+    return df_l[~df_l['ativa'].str.lower().isin(VALORES_INATIVA)].reset_index(drop=True)
+
+def prefixos_das_lojas():
+    return carregar_lojas()['prefixo'].tolist()
+
+def conferir_prefixos(prefixos, ja_cadastrados=()):
+    """
+    Levanta ValueError (com todos os problemas) se algum prefixo for reservado, repetido, começo das abas de
+    outra loja ou, se for novo, tiver algo além de letras minúsculas e números. Prefixos já cadastrados
+    não são cobrados pelo formato (renomear mudaria as abas da loja).
+    """
+    prefixos = pd.Series(list(prefixos), dtype=object).fillna("").astype(str).str.strip().str.lower()
+    prefixos = prefixos[prefixos != ""]
+    ja_cadastrados = set(ja_cadastrados)
+    erros = [f"'{p}' é reservado (abas gerais {p}_...)" for p in prefixos if p in PREFIXOS_RESERVADOS]
+    erros += [f"'{p}' deve ter só letras minúsculas e números" for p in prefixos if p not in ja_cadastrados and not FORMATO_PREFIXO.fullmatch(p)]
+    erros += [f"'{p}' está repetido" for p in prefixos[prefixos.duplicated()].unique()]
+    unicos = prefixos.unique()
+    erros += [f"'{p}' é o começo das abas de '{q}'" for p in unicos for q in unicos if q.startswith(f"{p}_")]
+    if erros: raise ValueError("Prefixo inválido: " + "; ".join(erros) + ".")
+
+def salvar_cadastro_lojas(df_l, ja_cadastrados=()):
+    """Grava o cadastro; prefixo inválido levanta ValueError antes de gravar (ver conferir_prefixos)."""
+    conferir_prefixos(df_l['prefixo'], ja_cadastrados)
+    df_l = preparar_cadastro_lojas(df_l)
+    df_l['ordem'] = df_l['ordem'].fillna(pd.Series(range(1, len(df_l) + 1), index=df_l.index)).astype(int)
+    return salvar_no_google(df_l, ABA_LOJAS)
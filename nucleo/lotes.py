@@ -0,0 +1,171 @@
+"""Validade por lote: saldo e data de cada lote, índice ordenado por vencimento e baixa FEFO (vence primeiro, sai primeiro)."""
+import streamlit as st
+import pandas as pd
+import numpy as np
+from nucleo.util import obter_hora_manaus
+from nucleo.planilha import carregar_do_google, salvar_no_google
+
+# ==============================================================================
+# 📦 LOTES (LOJA: {prefixo}_lotes · CASA: casa_lotes, COMPARTILHADA COMO O qtd_central)
+# ==============================================================================
+COLUNAS_LOTES = ['código de barras', 'produto', 'qtd', 'validade', 'lote', 'origem', 'data_entrada']
+DONO_CASA = "casa"
+
+def aba_lotes(dono):
+    """dono = prefixo da loja (prateleira) ou 'casa' (estoque central de todas as lojas)."""
+    return f"{dono}_lotes"
+
+def ler_validades(serie):
+    """Datas ISO (como os lotes são gravados) e, no que sobrar, dd/mm/aaaa (cadastro antigo)."""
+    texto = serie.fillna("").astype(str).str.strip()
+    datas = pd.to_datetime(texto, errors='coerce', format='ISO8601')
+    resto = datas.isna() & (texto != "")
+    if resto.any(): datas[resto] = pd.to_datetime(texto[resto], errors='coerce', format='mixed', dayfirst=True)
+    return datas
+
+def preparar_lotes(df_l):
+    """Tipos de trabalho: código em texto, qtd numérica e validade em data (NaT = sem data)."""
+    df_l = df_l.reindex(columns=COLUNAS_LOTES + [c for c in df_l.columns if c not in COLUNAS_LOTES])
+    df_l['código de barras'] = df_l['código de barras'].fillna("").astype(str).str.replace(r'\.0$', '', regex=True).str.strip()
+    df_l['qtd'] = pd.to_numeric(df_l['qtd'].astype(str).str.replace(',', '.', regex=False), errors='coerce').fillna(0)
+    df_l['validade'] = ler_validades(df_l['validade'])
+    for col in ['produto', 'lote', 'origem', 'data_entrada']: df_l[col] = df_l[col].fillna("").astype(str)
+    return df_l
+
+def carregar_lotes(dono):
+    df_l = carregar_do_google(aba_lotes(dono))
+    if df_l.empty: return pd.DataFrame(columns=COLUNAS_LOTES)
+    return preparar_lotes(df_l)
+
+def compactar_lotes(df_l):
+    """Tira lotes zerados e junta linhas do mesmo produto, validade e lote (entradas repetidas, transferências)."""
+    df_l = df_l[df_l['qtd'] > 0]
+    if df_l.empty: return df_l[COLUNAS_LOTES]
+    chave = ['código de barras', 'validade', 'lote']
+    return (df_l.groupby(chave, dropna=False, sort=False)
+            .agg(produto=('produto', 'last'), qtd=('qtd', 'sum'), origem=('origem', 'first'), data_entrada=('data_entrada', 'min'))
+            .reset_index()[COLUNAS_LOTES])
+
+def salvar_lotes(df_l, dono):
+    df_salvar = compactar_lotes(df_l).copy()
+    df_salvar['validade'] = df_salvar['validade'].dt.strftime('%Y-%m-%d').fillna("")
+    salvar_no_google(df_salvar, aba_lotes(dono), permitir_vazio=True)
+    indice_validades.clear()  # Montado a partir das abas de lotes (a gravação só limpa o cache das leituras)
+
+# --- 🗂️ ÍNDICE POR VENCIMENTO ---
+def indexar_validades(df_l):
+    """Lotes com saldo e data, ordenados por validade: 'o que vence até X' vira uma fatia (searchsorted)."""
+    return df_l[(df_l['qtd'] > 0) & df_l['validade'].notna()].sort_values('validade', kind='stable')
+
+@st.cache_data(ttl=60, show_spinner=False)
+def indice_validades(prefixo):
+    """
+    Índice da prateleira da loja + Casa, com 'local' (de qual aba de lotes veio).
+    Refeito só quando o cache de leitura expira ou é limpo por uma gravação: para editar, corrigir_lotes
+    acha cada lote pela chave, não pela posição (a aba pode ter mudado nesse meio tempo).
+    """
+    partes = [carregar_lotes(dono).assign(local=local) for dono, local in ((prefixo, 'loja'), (DONO_CASA, 'casa'))]
+    return indexar_validades(pd.concat(partes, ignore_index=True))
+
+def lotes_vencendo(indice, ate, desde=None):
+    """Lotes com validade <= ate (e > desde, se informado). Vencidos entram quando desde=None."""
+    datas = indice['validade'].to_numpy()
+    fim = np.searchsorted(datas, np.datetime64(pd.Timestamp(ate)), side='right')
+    inicio = 0 if desde is None else np.searchsorted(datas, np.datetime64(pd.Timestamp(desde)), side='right')
+    return indice.iloc[inicio:fim]
+
+def corrigir_lotes(df_l, originais, editados):
+    """
+    Grava em df_l (no lugar) a validade/qtd editadas, achando cada lote pela chave (código, validade, lote) que
+    tinha quando foi listado. Lote que não existe mais na aba fica de fora. Devolve quantos foram corrigidos.
+    """
+    chave = ['código de barras', 'validade', 'lote']
+    posicao = pd.Series(df_l.index, index=pd.MultiIndex.from_frame(df_l[chave]))
+    posicao = posicao[~posicao.index.duplicated()]
+    alvo = pd.MultiIndex.from_frame(originais[chave])
+    achados = alvo.isin(posicao.index)
+    df_l.loc[posicao.reindex(alvo[achados]).values, ['validade', 'qtd']] = editados[achados][['validade', 'qtd']].values
+    return int(achados.sum())
+
+# --- ⏬ BAIXA FEFO ---
+def demanda_por_codigo(df, nomes, qtds):
+    """
+    Soma por código de barras as quantidades informadas por nome de produto. Nomes fora do catálogo e
+    produtos sem código ficam de fora (código vazio juntaria produtos diferentes numa demanda só).
+    """
+    codigo_por_nome = df.drop_duplicates('nome do produto').set_index('nome do produto')['código de barras'].astype(str)
+    demanda = pd.Series(pd.to_numeric(pd.Series(list(qtds)), errors='coerce').fillna(0).values, index=pd.Series(list(nomes)).map(codigo_por_nome).values)
+    demanda = demanda[demanda.index.notna() & (demanda.index != "") & (demanda > 0)]
+    return demanda.groupby(level=0).sum()
+
+def consumir_fefo(df_l, demanda):
+    """
+    Baixa a demanda ({código: qtd}) dos lotes, o que vence primeiro sai primeiro (lotes sem data por último).
+    Altera df_l no lugar e devolve as baixas por lote. Demanda além do saldo dos lotes é ignorada
+    (unidades antigas sem lote). Lotes sem código nunca são baixados: não dá para saber de que produto são.
+    """
+    if df_l.empty or demanda.empty: return df_l.iloc[0:0].assign(baixa=0.0)
+    cand = df_l[(df_l['qtd'] > 0) & (df_l['código de barras'] != "") & df_l['código de barras'].isin(demanda.index)]
+    cand = cand.sort_values(['código de barras', 'validade', 'data_entrada'], na_position='last', kind='stable')
+    antes = cand.groupby('código de barras')['qtd'].cumsum() - cand['qtd']
+    baixa = (cand['código de barras'].map(demanda) - antes).clip(lower=0, upper=cand['qtd'])
+    df_l.loc[cand.index, 'qtd'] = cand['qtd'] - baixa
+    return cand.assign(baixa=baixa)[baixa > 0]
+
+def baixar_lotes(dono, df, nomes, qtds):
+    """Venda/saída: FEFO nos lotes do dono. Devolve as baixas por lote."""
+    df_l = carregar_lotes(dono)
+    baixas = consumir_fefo(df_l, demanda_por_codigo(df, nomes, qtds))
+    if not baixas.empty: salvar_lotes(df_l, dono)
+    return baixas
+
+def transferir_lotes(prefixo, df, nomes, qtds):
+    """Casa -> Loja: FEFO nos lotes da Casa; o que sai entra na prateleira com a mesma validade e lote."""
+    df_casa = carregar_lotes(DONO_CASA)
+    baixas = consumir_fefo(df_casa, demanda_por_codigo(df, nomes, qtds))
+    if baixas.empty: return baixas
+    salvar_lotes(df_casa, DONO_CASA)
+    entrada = baixas.assign(qtd=baixas['baixa'], origem="Transferência Casa", data_entrada=str(obter_hora_manaus()))[COLUNAS_LOTES]
+    salvar_lotes(pd.concat([carregar_lotes(prefixo), entrada], ignore_index=True), prefixo)
+    return baixas
+
+def registrar_lotes(dono, novos):
+    """Entrada de lotes (lista de dicionários com código, produto, qtd, validade, lote e origem)."""
+    if not novos: return
+    df_novos = preparar_lotes(pd.DataFrame(novos).assign(data_entrada=str(obter_hora_manaus())))
+    salvar_lotes(pd.concat([carregar_lotes(dono), df_novos], ignore_index=True), dono)
+
+# --- 📥 ORIGENS DOS LOTES ---
+def lotes_da_nota(dados, produtos_finais, escolhas, df):
+    """
+    Lotes informados na NF-e (grupo rastro: nLote, qLote, dVal) dos itens já associados.
+    Como no estoque: produto novo entra na prateleira da loja, existente entra na Casa.
+    Devolve (lotes_loja, lotes_casa).
+    """
+    codigo_por_nome = df.drop_duplicates('nome do produto').set_index('nome do produto')['código de barras'].astype(str)
+    lotes_loja, lotes_casa = [], []
+    for i, item in enumerate(dados['itens']):
+        nome = produtos_finais[i]
+        codigo = codigo_por_nome.get(nome, item['ean'])
+        for rastro in item.get('lotes', []):
+            novo = {'código de barras': codigo, 'produto': nome, 'qtd': rastro['qtd'], 'validade': rastro['validade'],
+                    'lote': rastro['lote'], 'origem': f"XML NF {dados['numero']}"}
+            (lotes_loja if escolhas[i] == "(CRIAR NOVO)" else lotes_casa).append(novo)
+    return lotes_loja, lotes_casa
+
+def lotes_iniciais_do_estoque(df_estoque, coluna_qtd):
+    """Migração: um lote por produto que já tinha validade, com o saldo da coluna informada."""
+    df_e = df_estoque.copy()
+    qtd = pd.to_numeric(df_e[coluna_qtd].astype(str).str.replace(',', '.', regex=False), errors='coerce').fillna(0)
+    validade = ler_validades(df_e['validade'])
+    sel = (qtd > 0) & validade.notna()
+    return pd.DataFrame({'código de barras': df_e.loc[sel, 'código de barras'].astype(str), 'produto': df_e.loc[sel, 'nome do produto'],
+                         'qtd': qtd[sel], 'validade': validade[sel], 'lote': "", 'origem': "Validade do cadastro",
+                         'data_entrada': str(obter_hora_manaus())})
+
+def criar_lotes_iniciais(prefixo):
+    """Migração: aba de lotes da loja (e da Casa, se ainda não existir) a partir da validade do cadastro."""
+    df_estoque = carregar_do_google(f"{prefixo}_estoque")
+    if df_estoque.empty or 'validade' not in df_estoque.columns: df_estoque = pd.DataFrame(columns=['código de barras', 'nome do produto', 'qtd.estoque', 'qtd_central', 'validade'])
+    if carregar_do_google(aba_lotes(prefixo)).empty: salvar_lotes(lotes_iniciais_do_estoque(df_estoque, 'qtd.estoque'), prefixo)
+    if carregar_do_google(aba_lotes(DONO_CASA)).empty: salvar_lotes(lotes_iniciais_do_estoque(df_estoque, 'qtd_central'), DONO_CASA)
@@ -0,0 +1,131 @@
+"""Medição de desempenho: tempo, linhas, bytes, chamadas à API e erros de cada operação."""
+import pandas as pd
+from datetime import timedelta
+import os
+import sqlite3
+import threading
+import atexit
+from collections import deque
+from contextlib import contextmanager
+import time
+from nucleo.util import obter_hora_manaus
+
+# ==============================================================================
+# ⏱️ MEDIÇÃO DE DESEMPENHO (TEMPO, LINHAS, BYTES E CHAMADAS À API)
+# ==============================================================================
+ARQUIVO_METRICAS = os.environ.get("ARQUIVO_METRICAS", ".metricas.sqlite")
+DIAS_RETENCAO_METRICAS = 30
+TRAVA_METRICAS = threading.Lock()
+CONTEXTO_METRICAS = threading.local()  # Contador de chamadas à API e marcação de cache por thread
+# Medir não pode custar disco no caminho medido: as medições vão para a memória e um gravador em segundo plano
+# as grava em lote a cada INTERVALO_GRAVACAO_METRICAS segundos (ou antes, quando juntar LOTE_METRICAS)
+BUFFER_METRICAS = deque(maxlen=20000)  # Se o disco travar, as medições mais antigas são descartadas
+LOTE_METRICAS = 200
+INTERVALO_GRAVACAO_METRICAS = 5.0
+SINAL_METRICAS = threading.Event()
+ESTADO_METRICAS = {'tabela_criada': False, 'gravador': None}
+
+def contar_chamada_api(n=1):
+    """Soma chamadas feitas à API do Google na thread atual (lidas pelo medir_operacao)."""
+    CONTEXTO_METRICAS.chamadas_api = getattr(CONTEXTO_METRICAS, 'chamadas_api', 0) + n
+
+def tamanho_aproximado(dados):
+    """Bytes aproximados de uma lista de linhas (soma do tamanho de cada célula em texto)."""
+    return sum(len(str(c)) for linha in dados for c in linha)
+
+def conectar_metricas():
+    """Conexão com o arquivo de métricas (chamar com TRAVA_METRICAS). A tabela é conferida uma vez por processo."""
+    con = sqlite3.connect(ARQUIVO_METRICAS, timeout=5)
+    if not ESTADO_METRICAS['tabela_criada']:
+        con.execute("""CREATE TABLE IF NOT EXISTS metricas (
+            momento TEXT, operacao TEXT, detalhe TEXT, duracao_ms REAL, linhas INTEGER,
+            bytes INTEGER, chamadas_api INTEGER, cache TEXT, erro TEXT)""")
+        ESTADO_METRICAS['tabela_criada'] = True
+    return con
+
+def gravar_metricas_pendentes():
+    """Grava de uma vez (uma transação) as medições do buffer. Se o arquivo estiver ocupado, o lote é descartado."""
+    lote = []
+    while True:
+        try: lote.append(BUFFER_METRICAS.popleft())
+        except IndexError: break
+    if not lote: return 0
+    try:
+        with TRAVA_METRICAS:
+            con = conectar_metricas()
+            with con: con.executemany("INSERT INTO metricas VALUES (?,?,?,?,?,?,?,?,?)", lote)
+            con.close()
+    except sqlite3.Error:
+        pass
+    return len(lote)
+
+def gravador_de_metricas():
+    while True:
+        SINAL_METRICAS.wait(INTERVALO_GRAVACAO_METRICAS)
+        SINAL_METRICAS.clear()
+        gravar_metricas_pendentes()
+
+def iniciar_gravador_de_metricas():
+    """Uma thread por processo (e o que sobrar no buffer é gravado na saída)."""
+    with TRAVA_METRICAS:
+        if ESTADO_METRICAS['gravador'] is not None: return
+        ESTADO_METRICAS['gravador'] = threading.Thread(target=gravador_de_metricas, name="gravador_metricas", daemon=True)
+        ESTADO_METRICAS['gravador'].start()
+    atexit.register(gravar_metricas_pendentes)
+
+def registrar_metrica(operacao, detalhe, duracao_ms, linhas=0, bytes_=0, chamadas_api=0, cache="", erro=""):
+    """Guarda uma medição na memória (sem disco); o gravador em segundo plano a leva para o arquivo."""
+    BUFFER_METRICAS.append((str(obter_hora_manaus()), operacao, detalhe, round(duracao_ms, 2), int(linhas), int(bytes_), int(chamadas_api), cache, erro))
+    if ESTADO_METRICAS['gravador'] is None: iniciar_gravador_de_metricas()
+    if len(BUFFER_METRICAS) >= LOTE_METRICAS: SINAL_METRICAS.set()
+
+@contextmanager
+def medir_operacao(operacao, detalhe=""):
+    """
+    Mede o bloco: tempo de parede, chamadas à API feitas na thread e erros.
+    O bloco pode preencher 'linhas', 'bytes', 'cache' e 'erro' no dicionário recebido.
+    """
+    medicao = {'linhas': 0, 'bytes': 0, 'cache': "", 'erro': ""}
+    chamadas_antes = getattr(CONTEXTO_METRICAS, 'chamadas_api', 0)
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    except Exception as e:
+        # st.rerun()/st.stop() interrompem o script por exceção: não é erro
+        if type(e).__name__ not in ("RerunException", "StopException"): medicao['erro'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        registrar_metrica(operacao, detalhe, (time.perf_counter() - inicio) * 1000, medicao['linhas'], medicao['bytes'],
+                          getattr(CONTEXTO_METRICAS, 'chamadas_api', 0) - chamadas_antes, medicao['cache'], medicao['erro'])
+
+def carregar_metricas(dias=7):
+    """Medições dos últimos dias (apaga as mais antigas que a retenção). Grava antes o que estava no buffer."""
+    gravar_metricas_pendentes()
+    try:
+        with TRAVA_METRICAS:
+            con = conectar_metricas()
+            with con:
+                con.execute("DELETE FROM metricas WHERE momento < ?", (str(obter_hora_manaus() - timedelta(days=DIAS_RETENCAO_METRICAS)),))
+            df_m = pd.read_sql_query("SELECT * FROM metricas WHERE momento >= ?", con, params=(str(obter_hora_manaus() - timedelta(days=dias)),))
+            con.close()
+        return df_m
+    except sqlite3.Error:
+        return pd.DataFrame()
+
+def resumir_metricas(df_m):
+    """p50/p95 por operação e aba, com volume, chamadas à API, taxa de acerto do cache e erros."""
+    if df_m.empty: return pd.DataFrame()
+    grupos = df_m.groupby(['operacao', 'detalhe'])
+    resumo = grupos['duracao_ms'].agg(
+        execucoes='count',
+        p50_ms=lambda s: s.quantile(0.5),
+        p95_ms=lambda s: s.quantile(0.95),
+        max_ms='max',
+    )
+    resumo['linhas_media'] = grupos['linhas'].mean()
+    resumo['kb_total'] = grupos['bytes'].sum() / 1024
+    resumo['chamadas_api'] = grupos['chamadas_api'].sum()
+    com_cache = df_m[df_m['cache'] != ""]
+    resumo['acerto_cache_%'] = (com_cache['cache'] == 'hit').groupby([com_cache['operacao'], com_cache['detalhe']]).mean() * 100
+    resumo['erros'] = (df_m['erro'] != "").groupby([df_m['operacao'], df_m['detalhe']]).sum()
+    return resumo.reset_index().sort_values('p95_ms', ascending=False).round(1)
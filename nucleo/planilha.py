@@ -0,0 +1,529 @@
+"""Acesso ao Google Sheets: leitura com cache (Streamlit + cache colunar local), gravação e append com diário local."""
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+import os
+import json
+import random
+import threading
+from collections import deque
+import gspread
+import time
+from nucleo.util import obter_hora_manaus
+from nucleo.metricas import CONTEXTO_METRICAS, contar_chamada_api, medir_operacao, tamanho_aproximado
+from nucleo.diario import anotar_gravacao, confirmar_gravacao, gravacoes_pendentes, registrar_falha_gravacao
+
+# ==============================================================================
+# ☁️ CONEXÃO COM GOOGLE SHEETS (COM CACHE E PROTEÇÃO)
+# ==============================================================================
+PLANILHA_PRINCIPAL = "Sistema_Estoque_Database"  # Cadastro de lojas, base oficial, Casa e lojas sem planilha própria
+
+@st.cache_resource
+def conectar_planilha(nome_planilha):
+    """Conecta a uma planilha do Google Sheets (pelo nome) usando as credenciais dos Secrets do Streamlit."""
+    if os.environ.get("PLANILHA_LOCAL"):
+        # Modo offline (benchmarks/testes): as abas vêm de CSVs numa pasta local (planilhas extras em subpastas)
+        import planilha_local
+        pasta = os.environ["PLANILHA_LOCAL"]
+        return planilha_local.abrir(pasta if nome_planilha == PLANILHA_PRINCIPAL else os.path.join(pasta, nome_planilha))
+    from oauth2client.service_account import ServiceAccountCredentials  # Só na 1ª conexão do processo
+    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(st.secrets["gcp_service_account"], scope)
+    client = gspread.authorize(creds)
+    return client.open(nome_planilha)
+
+# --- 🏬 PLANILHA DE CADA LOJA (PREENCHIDO PELO CADASTRO DE LOJAS, nucleo/lojas.py) ---
+PLANILHAS_DAS_LOJAS = {}  # prefixo -> planilha própria da loja; lojas fora daqui ficam na principal
+
+def definir_planilhas_das_lojas(mapa):
+    """Troca o roteamento das abas {prefixo}_* (e esquece os worksheets já abertos se ele mudou)."""
+    if mapa == PLANILHAS_DAS_LOJAS: return
+    PLANILHAS_DAS_LOJAS.clear()
+    PLANILHAS_DAS_LOJAS.update(mapa)
+    with TRAVA_ABAS: ABAS_ABERTAS.clear()
+
+def planilha_da_aba(nome_aba):
+    for prefixo, nome_planilha in PLANILHAS_DAS_LOJAS.items():
+        if nome_aba.startswith(f"{prefixo}_"): return nome_planilha
+    return PLANILHA_PRINCIPAL
+
+# --- 🚦 COTA DA API (TOKEN BUCKET + RETENTATIVA COM BACKOFF) ---
+# Limites do Sheets por usuário (conta de serviço): 60 leituras e 60 escritas por minuto
+COTA_LEITURAS_POR_MINUTO = int(os.environ.get("COTA_LEITURAS_POR_MINUTO", "60"))
+COTA_ESCRITAS_POR_MINUTO = int(os.environ.get("COTA_ESCRITAS_POR_MINUTO", "60"))
+TENTATIVAS_API = 6
+ESPERA_BASE_API = 1.0  # Segundos; dobra a cada tentativa, com jitter de ±50%
+ESPERA_MAXIMA_API = 64.0
+CODIGOS_RETENTAVEIS = {429, 500, 502, 503, 504}
+
+class BaldeDeFichas:
+    """Token bucket: até `por_minuto` fichas, repostas continuamente. Compartilhado por todas as sessões do processo."""
+    def __init__(self, por_minuto):
+        self.capacidade = por_minuto
+        self.taxa = por_minuto / 60.0
+        self.fichas = float(por_minuto)
+        self.momento = time.monotonic()
+        self.usos = deque()  # Momento de cada chamada (para o uso do último minuto)
+        self.espera_total = 0.0
+        self.trava = threading.Lock()
+
+    def retirar(self):
+        """Reserva uma ficha; se o balde está vazio, dorme até a ficha ser reposta."""
+        with self.trava:
+            agora = time.monotonic()
+            self.fichas = min(self.capacidade, self.fichas + (agora - self.momento) * self.taxa)
+            self.momento = agora
+            self.fichas -= 1
+            espera = -self.fichas / self.taxa if self.fichas < 0 else 0.0
+            self.usos.append(agora + espera)
+            self.espera_total += espera
+        if espera: time.sleep(espera)
+
+    def uso_ultimo_minuto(self):
+        with self.trava:
+            limite = time.monotonic() - 60
+            while self.usos and self.usos[0] < limite: self.usos.popleft()
+            return len(self.usos)
+
+BALDES_API = {'leitura': BaldeDeFichas(COTA_LEITURAS_POR_MINUTO), 'escrita': BaldeDeFichas(COTA_ESCRITAS_POR_MINUTO)}
+RETENTATIVAS_API = {'retentativas': 0, 'desistencias': 0}
+
+def codigo_erro_api(erro):
+    return getattr(getattr(erro, 'response', None), 'status_code', None)
+
+def chamar_api(tipo, funcao, *args, **kwargs):
+    """
+    Toda chamada ao Sheets passa por aqui: espera ficha no balde do tipo ('leitura' ou 'escrita')
+    e, se o Google responder 429 ou 5xx, tenta de novo com backoff exponencial e jitter.
+    """
+    for tentativa in range(TENTATIVAS_API):
+        BALDES_API[tipo].retirar()
+        contar_chamada_api()
+        try:
+            return funcao(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if codigo_erro_api(e) not in CODIGOS_RETENTAVEIS: raise
+            if tentativa == TENTATIVAS_API - 1:
+                RETENTATIVAS_API['desistencias'] += 1
+                raise
+        RETENTATIVAS_API['retentativas'] += 1
+        time.sleep(min(ESPERA_MAXIMA_API, ESPERA_BASE_API * 2 ** tentativa) * random.uniform(0.5, 1.5))
+
+def uso_cota():
+    """Chamadas no último minuto x limite, tempo total esperando ficha e retentativas (para o Diagnóstico)."""
+    uso = {tipo: {'ultimo_minuto': balde.uso_ultimo_minuto(), 'limite': balde.capacidade, 'espera_total_s': round(balde.espera_total, 1)}
+           for tipo, balde in BALDES_API.items()}
+    uso.update(RETENTATIVAS_API)
+    return uso
+
+# --- 📑 ABAS ABERTAS (UM sh.worksheet() POR ABA E PROCESSO) ---
+ABAS_ABERTAS = {}
+TRAVA_ABAS = threading.Lock()
+
+def tamanho_dos_dados(dados_lista):
+    """(linhas, colunas) de uma lista de linhas, para criar a aba já do tamanho certo (mínimo 1x1)."""
+    return max(len(dados_lista), 1), max((len(linha) for linha in dados_lista), default=1) or 1
+
+def abrir_aba(nome_aba, criar=False, linhas=1, colunas=1):
+    """
+    Worksheet da aba, reaproveitado entre chamadas. Se não existir: cria (criar=True) ou levanta WorksheetNotFound.
+    A aba nova nasce com linhas x colunas (o que vai ser gravado nela), não com a grade padrão de 1000x20:
+    toda célula da grade conta no limite de células da planilha.
+    """
+    worksheet = ABAS_ABERTAS.get(nome_aba)
+    if worksheet is not None: return worksheet
+    sh = conectar_planilha(planilha_da_aba(nome_aba))
+    try:
+        worksheet = chamar_api('leitura', sh.worksheet, nome_aba)
+    except gspread.WorksheetNotFound:
+        if not criar: raise
+        worksheet = chamar_api('escrita', sh.add_worksheet, title=nome_aba, rows=linhas, cols=colunas)
+    with TRAVA_ABAS: ABAS_ABERTAS[nome_aba] = worksheet
+    return worksheet
+
+def esquecer_aba(nome_aba):
+    """Descarta o worksheet guardado (aba apagada/renomeada na planilha): a próxima chamada abre de novo."""
+    with TRAVA_ABAS: ABAS_ABERTAS.pop(nome_aba, None)
+
+# Cache de 60 segundos para evitar ler a mesma coisa toda hora (Economiza Cota)
+# --- VERSÃO BLINDADA CONTRA ERRO DE COLUNAS DUPLICADAS/VAZIAS ---
+def carregar_do_google(nome_aba):
+    """Lê uma aba específica da planilha e transforma em DataFrame (Com Cache e medição)."""
+    with medir_operacao("carregar", nome_aba) as medicao:
+        CONTEXTO_METRICAS.leitura = None
+        df = carregar_do_google_cache(nome_aba)
+        leitura = CONTEXTO_METRICAS.leitura
+        medicao['cache'] = "hit" if leitura is None else "miss"
+        medicao['linhas'] = len(df)
+        if leitura:
+            medicao['bytes'] = leitura['bytes']
+            medicao['erro'] = leitura['erro']
+        return df
+
+@st.cache_data(ttl=60) 
+def carregar_do_google_cache(nome_aba):
+    """Lê uma aba específica da planilha e transforma em DataFrame (Com Cache)."""
+    # Só roda quando o cache do Streamlit não tem a aba: marca a leitura como "miss" para a medição
+    leitura = {'bytes': 0, 'erro': ""}
+    CONTEXTO_METRICAS.leitura = leitura
+    try:
+        try:
+            worksheet = abrir_aba(nome_aba)
+        except gspread.WorksheetNotFound:
+            return pd.DataFrame() 
+        
+        if usa_cache_colunar(nome_aba):
+            return ler_aba_com_cache_colunar(worksheet, nome_aba, leitura)
+
+        dados = chamar_api('leitura', worksheet.get_all_values)
+        if not dados:
+            return pd.DataFrame()
+        leitura['bytes'] = tamanho_aproximado(dados)
+            
+        headers = dados.pop(0)
+        df = pd.DataFrame(dados, columns=limpar_cabecalhos(headers))
+        return df
+    except Exception as e:
+        esquecer_aba(nome_aba)
+        leitura['erro'] = f"{type(e).__name__}: {e}"
+        return pd.DataFrame()
+
+def limpar_cache_leituras():
+    """Depois de gravar: esquece as abas lidas (só este cache; os uploads lidos e os demais caches continuam)."""
+    carregar_do_google_cache.clear()
+
+def limpar_cabecalhos(headers):
+    """Blindagem cirúrgica: resolve o erro DuplicateError (colunas duplicadas/vazias)."""
+    headers_unicos = []
+    vistos = set()
+    for i, col in enumerate(headers):
+        nome_limpo = str(col).strip()
+        if not nome_limpo: nome_limpo = f"coluna_extra_{i}"
+        nome_final = nome_limpo
+        contador = 1
+        while nome_final in vistos:
+            nome_final = f"{nome_limpo}_{contador}"
+            contador += 1
+        vistos.add(nome_final)
+        headers_unicos.append(nome_final)
+    return headers_unicos
+
+# --- 🗄️ CACHE COLUNAR LOCAL (PARQUET) PARA ABAS GRANDES ---
+PASTA_CACHE_COLUNAR = os.environ.get("PASTA_CACHE_COLUNAR", ".cache_colunar")
+SUFIXOS_CACHE_COLUNAR = ("_historico_compras", "_log_auditoria", "_vendas", "_ids_vendas")
+TRECHOS_CACHE_COLUNAR = ("_log_auditoria_", "_arquivo_")  # Abas mensais/índice do log de auditoria e abas anuais do arquivo
+ABAS_CACHE_COLUNAR = ("meus_produtos_oficiais",)
+HORAS_RECARGA_COMPLETA = 6  # De tempos em tempos relê a aba inteira (pega edições feitas no meio da planilha)
+
+def usa_cache_colunar(nome_aba):
+    return nome_aba in ABAS_CACHE_COLUNAR or nome_aba.endswith(SUFIXOS_CACHE_COLUNAR) or any(t in nome_aba for t in TRECHOS_CACHE_COLUNAR)
+
+def caminhos_cache_colunar(nome_aba):
+    os.makedirs(PASTA_CACHE_COLUNAR, exist_ok=True)
+    base = os.path.join(PASTA_CACHE_COLUNAR, nome_aba)
+    return f"{base}.parquet", f"{base}.json"
+
+def gravar_cache_colunar(nome_aba, dados):
+    """Grava as linhas cruas (cabeçalho + dados) no cache colunar. `dados` é uma lista de listas."""
+    caminho, caminho_meta = caminhos_cache_colunar(nome_aba)
+    cabecalho = [str(c) for c in dados[0]]
+    largura = len(cabecalho)
+    linhas = [[str(v) for v in linha] + [''] * (largura - len(linha)) for linha in dados[1:]]
+    df = pd.DataFrame(linhas, columns=limpar_cabecalhos(cabecalho), dtype=str)
+    df.to_parquet(caminho + ".tmp", index=False)
+    os.replace(caminho + ".tmp", caminho)
+    meta = {'cabecalho': cabecalho, 'linhas': len(linhas), 'ultima_linha': linhas[-1] if linhas else cabecalho, 'recarga_completa': str(obter_hora_manaus())}
+    with open(caminho_meta, "w", encoding="utf-8") as f: json.dump(meta, f, ensure_ascii=False)
+    return df
+
+def descartar_cache_colunar(nome_aba):
+    for caminho in caminhos_cache_colunar(nome_aba):
+        if os.path.exists(caminho): os.remove(caminho)
+
+def ler_aba_com_cache_colunar(worksheet, nome_aba, leitura=None):
+    """
+    Lê a aba a partir do Parquet local (memory-mapped) e baixa só as linhas acrescentadas desde a última leitura.
+    Se o cabeçalho ou a última linha conhecida mudou, relê a aba inteira.
+    """
+    caminho, caminho_meta = caminhos_cache_colunar(nome_aba)
+    meta = None
+    if os.path.exists(caminho) and os.path.exists(caminho_meta):
+        with open(caminho_meta, encoding="utf-8") as f: meta = json.load(f)
+        if datetime.strptime(meta['recarga_completa'][:19], "%Y-%m-%d %H:%M:%S") < obter_hora_manaus() - timedelta(hours=HORAS_RECARGA_COMPLETA):
+            meta = None
+
+    if meta:
+        n = meta['linhas']
+        largura = len(meta['cabecalho'])
+        ultima_col = gspread.utils.rowcol_to_a1(1, largura).rstrip('0123456789')
+        cabecalho_remoto, cauda = chamar_api('leitura', worksheet.batch_get, ["1:1", f"A{n + 1}:{ultima_col}"])
+        if leitura is not None: leitura['bytes'] = tamanho_aproximado(cauda)
+        cabecalho_remoto = list(cabecalho_remoto[0]) if cabecalho_remoto else []
+        cabecalho_remoto += [''] * (largura - len(cabecalho_remoto))
+        cauda = [list(linha) + [''] * (largura - len(linha)) for linha in cauda]
+        if cabecalho_remoto == meta['cabecalho'] and cauda and cauda[0] == meta['ultima_linha']:
+            df = pd.read_parquet(caminho, memory_map=True)
+            novas = cauda[1:]
+            if not novas: return df
+            df = pd.concat([df, pd.DataFrame(novas, columns=df.columns, dtype=str)], ignore_index=True)
+            df.to_parquet(caminho + ".tmp", index=False)
+            os.replace(caminho + ".tmp", caminho)
+            meta.update({'linhas': len(df), 'ultima_linha': novas[-1]})
+            with open(caminho_meta, "w", encoding="utf-8") as f: json.dump(meta, f, ensure_ascii=False)
+            return df
+
+    dados = chamar_api('leitura', worksheet.get_all_values)
+    if not dados: return pd.DataFrame()
+    if leitura is not None: leitura['bytes'] = tamanho_aproximado(dados)
+    return gravar_cache_colunar(nome_aba, dados)
+
+def listar_abas():
+    """Títulos de todas as abas da planilha principal e das planilhas próprias das lojas (uma chamada de metadados por planilha)."""
+    titulos = []
+    for nome_planilha in dict.fromkeys([PLANILHA_PRINCIPAL] + list(PLANILHAS_DAS_LOJAS.values())):
+        titulos += [aba.title for aba in chamar_api('leitura', conectar_planilha(nome_planilha).worksheets)]
+    return titulos
+
+def ler_valores_aba(nome_aba):
+    """Lê os valores crus de uma aba, sem passar pelo cache do Streamlit (seguro para threads)."""
+    try:
+        return chamar_api('leitura', abrir_aba(nome_aba).get_all_values)
+    except gspread.WorksheetNotFound:
+        return []
+
+def ler_aba_sem_cache(nome_aba):
+    """
+    A aba como DataFrame, lida agora da nuvem. Ao contrário de carregar_do_google, erro de leitura levanta
+    (aba inexistente = vazia): para quem vai regravar/apagar com base no que leu.
+    """
+    dados = ler_valores_aba(nome_aba)
+    if not dados: return pd.DataFrame()
+    return pd.DataFrame(dados[1:], columns=limpar_cabecalhos(dados[0]))
+
+def salvar_no_google(df, nome_aba, permitir_vazio=False):
+    """
+    Salva o DataFrame na nuvem e limpa o cache das leituras.
+    Inclui FILTRO DE LIMPEZA para não salvar colunas de rascunho (display_combo, etc).
+    A gravação é anotada no diário local antes de sair; se falhar, é reenviada depois.
+    Devolve True se chegou à nuvem (False = erro; tabela vazia sem permitir_vazio não grava e devolve True).
+    """
+    if df.empty and not permitir_vazio: 
+        return True
+
+    with medir_operacao("salvar", nome_aba) as medicao:
+        id_diario = None
+        try:
+            limpar_cache_leituras()
+            
+            # --- FILTRO DE SEGURANÇA (LIMPEZA AUTOMÁTICA) ---
+            # Antes de salvar, removemos colunas que o sistema cria apenas para visualização
+            colunas_proibidas = ['display_combo', 'produto_str', 'Selecionar', 'status_temp']
+            # Mantém apenas colunas que NÃO estão na lista de proibidas
+            cols_para_salvar = [c for c in df.columns if c not in colunas_proibidas]
+            df_limpo = df[cols_para_salvar].copy()
+            
+            df_limpo = df_limpo.fillna("")
+            if not df_limpo.empty:
+                dados_lista = [df_limpo.columns.tolist()] + df_limpo.astype(str).values.tolist()
+            else:
+                dados_lista = [df.columns.tolist()] if not df.columns.empty else []
+
+            id_diario = anotar_gravacao('salvar', nome_aba, dados_lista)
+            linhas, colunas = tamanho_dos_dados(dados_lista)
+            enviar_aba_inteira(abrir_aba(nome_aba, criar=True, linhas=linhas, colunas=colunas), dados_lista)
+            confirmar_gravacao(id_diario)
+            if dados_lista:
+                medicao['linhas'] = len(dados_lista) - 1
+                medicao['bytes'] = tamanho_aproximado(dados_lista)
+                if usa_cache_colunar(nome_aba): gravar_cache_colunar(nome_aba, dados_lista)
+            
+        except Exception as e:
+            esquecer_aba(nome_aba)
+            registrar_falha_gravacao(id_diario, e)
+            medicao['erro'] = f"{type(e).__name__}: {e}"
+            if id_diario is not None:
+                st.error(f"ERRO DE CONEXÃO AO SALVAR ({nome_aba}): {e}. A gravação ficou guardada neste servidor e será reenviada automaticamente.")
+            else:
+                st.error(f"ERRO DE CONEXÃO AO SALVAR ({nome_aba}): {e}. Tente novamente em alguns segundos.")
+            return False
+    reenviar_pendentes()
+    return True
+
+def anexar_no_google(df, nome_aba):
+    """
+    Acrescenta linhas ao FINAL da aba (sem reescrever o que já existe) e limpa o cache das leituras.
+    As colunas são alinhadas ao cabeçalho da aba; colunas novas são acrescentadas ao cabeçalho.
+    Devolve True se chegou à nuvem.
+    """
+    if df.empty: return True
+    with medir_operacao("anexar", nome_aba) as medicao:
+        id_diario = None
+        try:
+            limpar_cache_leituras()
+
+            colunas_proibidas = ['display_combo', 'produto_str', 'Selecionar', 'status_temp']
+            cols_para_salvar = [c for c in df.columns if c not in colunas_proibidas]
+            dados_lista = [cols_para_salvar] + df[cols_para_salvar].fillna("").astype(str).values.tolist()
+
+            id_diario = anotar_gravacao('anexar', nome_aba, dados_lista)
+            medicao['linhas'] = enviar_anexo(abrir_aba(nome_aba, criar=True, colunas=len(cols_para_salvar) or 1), dados_lista)
+            confirmar_gravacao(id_diario)
+            medicao['bytes'] = tamanho_aproximado(dados_lista)
+        except Exception as e:
+            esquecer_aba(nome_aba)
+            registrar_falha_gravacao(id_diario, e)
+            medicao['erro'] = f"{type(e).__name__}: {e}"
+            if id_diario is not None:
+                st.error(f"ERRO DE CONEXÃO AO SALVAR ({nome_aba}): {e}. A gravação ficou guardada neste servidor e será reenviada automaticamente.")
+            else:
+                st.error(f"ERRO DE CONEXÃO AO SALVAR ({nome_aba}): {e}. Tente novamente em alguns segundos.")
+            return False
+    reenviar_pendentes()
+    return True
+
+def atualizar_campos_no_google(nome_aba, coluna_chave, campos):
+    """
+    Grava só os campos informados, [(chave, coluna, valor)], na linha da aba cuja `coluna_chave` vale `chave`.
+    Para mexer em poucas linhas de uma aba grande sem reescrevê-la. A linha é achada na hora do envio (e de novo
+    no reenvio), nunca por uma posição lida antes: se a aba foi reescrita nesse meio-tempo, o valor não cai
+    na linha de outro produto. Passa pelo diário (com a chave) como as outras gravações. Devolve True se chegou à nuvem.
+    """
+    if not campos: return True
+    with medir_operacao("celulas", nome_aba) as medicao:
+        id_diario = None
+        try:
+            limpar_cache_leituras()
+            dados_lista = [[coluna_chave, 'coluna', 'valor']] + [[str(chave), coluna, "" if pd.isna(valor) else str(valor)] for chave, coluna, valor in campos]
+            id_diario = anotar_gravacao('celulas', nome_aba, dados_lista)
+            medicao['linhas'] = enviar_celulas(abrir_aba(nome_aba), dados_lista)
+            confirmar_gravacao(id_diario)
+            if usa_cache_colunar(nome_aba): descartar_cache_colunar(nome_aba)  # Edição no meio da aba: a próxima leitura é completa
+            medicao['bytes'] = tamanho_aproximado(dados_lista)
+        except Exception as e:
+            esquecer_aba(nome_aba)
+            registrar_falha_gravacao(id_diario, e)
+            medicao['erro'] = f"{type(e).__name__}: {e}"
+            if id_diario is not None:
+                st.error(f"ERRO DE CONEXÃO AO SALVAR ({nome_aba}): {e}. A gravação ficou guardada neste servidor e será reenviada automaticamente.")
+            else:
+                st.error(f"ERRO DE CONEXÃO AO SALVAR ({nome_aba}): {e}. Tente novamente em alguns segundos.")
+            return False
+    reenviar_pendentes()
+    return True
+
+# --- ✍️ ENVIO IDEMPOTENTE (REPETIR O MESMO ENVIO NÃO DUPLICA NEM APAGA NADA) ---
+def enviar_aba_inteira(worksheet, dados_lista):
+    """
+    Sobrescreve a aba SEM apagá-la antes: grava por cima a partir de A1 e depois corta as linhas e
+    colunas que sobraram. Se cair no meio, a aba fica com os dados antigos ou os novos, nunca vazia.
+    """
+    if not dados_lista:
+        chamar_api('escrita', worksheet.clear)
+        return
+    chamar_api('escrita', worksheet.update, dados_lista)
+    chamar_api('escrita', worksheet.resize, rows=len(dados_lista), cols=max(len(linha) for linha in dados_lista))
+
+def enviar_celulas(worksheet, dados_lista):
+    """
+    dados_lista = [coluna_chave, 'coluna', 'valor'] + [chave, coluna, valor]. Lê a aba, acha a primeira linha de cada
+    chave e grava tudo num batch_update (repetir grava os mesmos valores). Chave ou coluna que não existe mais
+    na aba fica de fora. Devolve quantas células foram gravadas.
+    """
+    valores = chamar_api('leitura', worksheet.get_all_values)
+    if not valores: return 0
+    cabecalho = [str(c).strip().lower() for c in valores[0]]
+    coluna_chave = str(dados_lista[0][0]).strip().lower()
+    if coluna_chave not in cabecalho: return 0
+    pos_chave = cabecalho.index(coluna_chave)
+    linha_da_chave = {}
+    for numero, linha in enumerate(valores[1:], start=2):
+        if pos_chave < len(linha): linha_da_chave.setdefault(str(linha[pos_chave]), numero)
+    celulas = [{'range': gspread.utils.rowcol_to_a1(linha_da_chave[chave], cabecalho.index(coluna.strip().lower()) + 1), 'values': [[valor]]}
+               for chave, coluna, valor in dados_lista[1:] if chave in linha_da_chave and coluna.strip().lower() in cabecalho]
+    if celulas: chamar_api('escrita', worksheet.batch_update, celulas)
+    return len(celulas)
+
+def aparar_linha(linha):
+    """A API devolve as linhas sem as células vazias do fim."""
+    linha = [str(c) for c in linha]
+    while linha and linha[-1] == "": linha.pop()
+    return tuple(linha)
+
+def lote_ja_anexado(valores, linhas):
+    """O lote inteiro já está na aba, em sequência (o envio anterior chegou ao Google antes do erro)."""
+    if not linhas or len(valores) < len(linhas): return False
+    alvo = [aparar_linha(l) for l in linhas]
+    existentes = [aparar_linha(l) for l in valores]
+    for inicio in range(len(existentes) - len(alvo), -1, -1):  # Do fim para o começo: o lote costuma estar no final
+        if existentes[inicio] == alvo[0] and existentes[inicio:inicio + len(alvo)] == alvo: return True
+    return False
+
+def enviar_anexo(worksheet, dados_lista, reenvio=False):
+    """
+    Acrescenta as linhas de dados_lista (cabeçalho + linhas) alinhadas ao cabeçalho da aba.
+    No reenvio, lê a aba e não anexa de novo um lote que já chegou. Devolve quantas linhas foram anexadas.
+    """
+    colunas, registros = dados_lista[0], dados_lista[1:]
+    if reenvio:
+        valores = chamar_api('leitura', worksheet.get_all_values)
+        cabecalho = [str(c).strip() for c in valores[0]] if valores else []
+    else:
+        cabecalho = [str(c).strip() for c in chamar_api('leitura', worksheet.row_values, 1)]
+    novo_cabecalho = cabecalho + [c for c in colunas if c not in cabecalho]
+    if novo_cabecalho != cabecalho:
+        cabecalho = novo_cabecalho
+        # A aba nasce só com as colunas do primeiro envio: coluna nova alarga a grade antes de gravar o cabeçalho
+        if len(cabecalho) > worksheet.col_count: chamar_api('escrita', worksheet.resize, cols=len(cabecalho))
+        chamar_api('escrita', worksheet.update, [cabecalho])
+
+    posicao = {c: i for i, c in enumerate(colunas)}
+    linhas = [[registro[posicao[c]] if c in posicao else "" for c in cabecalho] for registro in registros]
+    if reenvio and lote_ja_anexado(valores[1:], linhas): return 0
+    chamar_api('escrita', worksheet.append_rows, linhas)
+    return len(linhas)
+
+# --- 🔁 REENVIO DO DIÁRIO ---
+TRAVA_REENVIO = threading.Lock()
+
+def reenviar_pendentes():
+    """
+    Reenvia as gravações que ficaram pendentes no diário (erro de rede, app derrubado no meio).
+    Por aba vale só o 'salvar' mais recente; os 'anexar' vão depois dele, na ordem original, e os 'celulas'
+    também, menos os anteriores a ele (a aba reescrita já manda nesses campos).
+    Devolve quantas gravações foram confirmadas.
+    """
+    pendentes = gravacoes_pendentes()
+    if not pendentes or not TRAVA_REENVIO.acquire(blocking=False): return 0
+    try:
+        ultimo_salvar = {g['aba']: g['id'] for g in pendentes if g['tipo'] == 'salvar'}
+        confirmadas = 0
+        for g in sorted(pendentes, key=lambda g: (g['tipo'] != 'salvar', g['id'])):
+            if g['tipo'] == 'salvar' and ultimo_salvar[g['aba']] != g['id']: continue  # Substituído pelo mais recente
+            if g['tipo'] == 'celulas' and g['id'] < ultimo_salvar.get(g['aba'], 0): continue  # Idem (confirmar o 'salvar' os descarta)
+            with medir_operacao("reenviar", g['aba']) as medicao:
+                try:
+                    linhas, colunas = tamanho_dos_dados(g['dados'] if g['tipo'] == 'salvar' else g['dados'][:1])
+                    worksheet = abrir_aba(g['aba'], criar=True, linhas=linhas, colunas=colunas)
+                    if g['tipo'] == 'salvar':
+                        enviar_aba_inteira(worksheet, g['dados'])
+                        if g['dados'] and usa_cache_colunar(g['aba']): gravar_cache_colunar(g['aba'], g['dados'])
+                    elif g['tipo'] == 'celulas':
+                        medicao['linhas'] = enviar_celulas(worksheet, g['dados'])
+                        if usa_cache_colunar(g['aba']): descartar_cache_colunar(g['aba'])
+                    else:
+                        medicao['linhas'] = enviar_anexo(worksheet, g['dados'], reenvio=True)
+                    confirmar_gravacao(g['id'])
+                    confirmadas += 1
+                except Exception as e:
+                    esquecer_aba(g['aba'])
+                    registrar_falha_gravacao(g['id'], e)
+                    medicao['erro'] = f"{type(e).__name__}: {e}"
+        if confirmadas: limpar_cache_leituras()
+        return confirmadas
+    finally:
+        TRAVA_REENVIO.release()
+
+@st.cache_resource(show_spinner="Reenviando gravações pendentes...")
+def reenviar_pendentes_na_partida():
+    """Uma vez por processo: o que ficou no diário da execução anterior vai para a nuvem antes de tudo."""
+    return reenviar_pendentes()
@@ -0,0 +1,86 @@
+"""Lista de reposição (estoque baixo): montada ao carregar a loja e mantida produto a produto a cada mudança de estoque."""
+import streamlit as st
+import pandas as pd
+from nucleo.util import obter_hora_manaus
+
+# ==============================================================================
+# 🔔 LISTA DE REPOSIÇÃO (ATIVO E LOJA + CASA <= MÍNIMO)
+# ==============================================================================
+# Fica no session_state junto do df_ativo, uma por loja: {prefixo: {rótulo da linha no df: entrada}}.
+# Quem altera o estoque informa as linhas mexidas (salvar_estoque/cadastrar_produtos avisam acompanhar_gravacao_estoque,
+# inscrita pelo app) e só elas são reavaliadas (entra/sai da lista em O(1));
+# gravações da tabela inteira (sincronização, edições em massa) remontam a lista com uma máscara vetorizada.
+COLUNAS_REPOSICAO = ['código de barras', 'produto', 'qtd.estoque', 'qtd_central', 'qtd_minima', 'falta', 'fornecedor', 'preco_custo', 'desde']
+CHAVE_REPOSICAO = 'lista_reposicao'
+CHAVE_NOVOS_REPOSICAO = 'reposicao_novos'  # Produtos que entraram na lista e ainda não foram avisados
+COLUNAS_NECESSARIAS = ['status', 'qtd.estoque', 'qtd_central', 'qtd_minima']
+
+def mascara_reposicao(df):
+    return (df['status'] == 'Ativo') & ((df['qtd.estoque'] + df['qtd_central']) <= df['qtd_minima'])
+
+def precisa_repor(linha):
+    return linha['status'] == 'Ativo' and linha['qtd.estoque'] + linha['qtd_central'] <= linha['qtd_minima']
+
+def entrada_reposicao(linha, desde):
+    return {'código de barras': linha['código de barras'], 'produto': linha['nome do produto'],
+            'qtd.estoque': linha['qtd.estoque'], 'qtd_central': linha['qtd_central'], 'qtd_minima': linha['qtd_minima'],
+            'falta': linha['qtd_minima'] - linha['qtd.estoque'] - linha['qtd_central'],
+            'fornecedor': linha.get('ultimo_fornecedor', ''), 'preco_custo': linha.get('preco_custo', 0.0), 'desde': desde}
+
+def listas_da_sessao():
+    if CHAVE_REPOSICAO not in st.session_state: st.session_state[CHAVE_REPOSICAO] = {}
+    return st.session_state[CHAVE_REPOSICAO]
+
+def anotar_novos(prefixo, nomes):
+    if CHAVE_NOVOS_REPOSICAO not in st.session_state: st.session_state[CHAVE_NOVOS_REPOSICAO] = {}
+    st.session_state[CHAVE_NOVOS_REPOSICAO].setdefault(prefixo, []).extend(nomes)
+
+def montar_reposicao(df, prefixo):
+    """Remonta a lista da loja a partir do df inteiro. Quem já estava na lista mantém o 'desde'."""
+    listas = listas_da_sessao()
+    anterior = listas.get(prefixo)
+    lista = {}
+    if not df.empty and all(c in df.columns for c in COLUNAS_NECESSARIAS):
+        desde_por_codigo = {e['código de barras']: e['desde'] for e in (anterior or {}).values()}
+        agora = obter_hora_manaus().strftime("%d/%m/%Y %H:%M")
+        sel = df[mascara_reposicao(df)]
+        lista = {r: entrada_reposicao(linha, desde_por_codigo.get(linha['código de barras'], agora)) for r, linha in zip(sel.index, sel.to_dict('records'))}
+        # Na primeira montagem não há aviso: só o que entra depois é novidade
+        if anterior is not None: anotar_novos(prefixo, [e['produto'] for e in lista.values() if e['código de barras'] not in desde_por_codigo])
+    listas[prefixo] = lista
+    return lista
+
+def atualizar_reposicao(df, prefixo, rotulos):
+    """Reavalia só as linhas informadas (rótulos do df): cada uma entra, é atualizada ou sai da lista."""
+    listas = listas_da_sessao()
+    if prefixo not in listas: return montar_reposicao(df, prefixo)
+    lista = listas[prefixo]
+    agora = obter_hora_manaus().strftime("%d/%m/%Y %H:%M")
+    novos = []
+    for r in rotulos:
+        if r in df.index and precisa_repor(df.loc[r]):
+            if r not in lista: novos.append(df.at[r, 'nome do produto'])
+            lista[r] = entrada_reposicao(df.loc[r], lista.get(r, {}).get('desde', agora))
+        else: lista.pop(r, None)
+    anotar_novos(prefixo, novos)
+    return lista
+
+def rotulos_dos_produtos(df, nomes):
+    """Rótulos das linhas do df com esses nomes (para quem só guarda o nome do produto alterado)."""
+    return df.index[df['nome do produto'].isin(set(nomes))].tolist()
+
+def lista_reposicao(df, prefixo):
+    """Lista pronta da loja (monta na primeira leitura), quem mais falta primeiro."""
+    lista = listas_da_sessao().get(prefixo)
+    if lista is None: lista = montar_reposicao(df, prefixo)
+    if not lista: return pd.DataFrame(columns=COLUNAS_REPOSICAO)
+    return pd.DataFrame(list(lista.values()), columns=COLUNAS_REPOSICAO).sort_values('falta', ascending=False, kind='stable').reset_index(drop=True)
+
+def acompanhar_gravacao_estoque(df, prefixo, alterados):
+    """Inscrita pelo app em nucleo.estoque (inscrever_ao_gravar_estoque): cada gravação do estoque mantém a lista."""
+    if alterados is None: montar_reposicao(df, prefixo)
+    else: atualizar_reposicao(df, prefixo, alterados)
+
+def novos_na_reposicao(prefixo):
+    """Nomes que entraram na lista desde o último aviso (e zera os avisos)."""
+    return st.session_state.get(CHAVE_NOVOS_REPOSICAO, {}).pop(prefixo, [])
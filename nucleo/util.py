@@ -0,0 +1,52 @@
+"""Utilitários: fuso horário de Manaus, normalização de texto e formatação."""
+import pandas as pd
+from datetime import datetime, timedelta
+import unicodedata
+
+# ==============================================================================
+# 🕒 AJUSTE DE FUSO HORÁRIO E FUNÇÕES
+# ==============================================================================
+def obter_hora_manaus():
+    return datetime.utcnow() - timedelta(hours=4)
+
+def normalizar_texto(texto):
+    if not isinstance(texto, str):
+        return str(texto) if pd.notnull(texto) else ""
+    texto = unicodedata.normalize('NFKD', texto).encode('ASCII', 'ignore').decode('ASCII')
+    return texto.upper().strip()
+
+def normalizar_para_busca(texto):
+    if not isinstance(texto, str): return ""
+    return normalizar_texto(texto)
+
+def normalizar_serie_texto(serie):
+    """normalizar_texto aplicado só uma vez por valor distinto."""
+    serie = serie.fillna("").astype(str)
+    unicos = serie.unique()
+    return serie.map(dict(zip(unicos, (normalizar_texto(u) for u in unicos))))
+
+# --- FUNÇÕES AUXILIARES ---
+def formatar_moeda_br(valor):
+    try: return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    except: return f"{valor:.2f}"
+
+def filtrar_dados_inteligente(df, coluna_busca, texto_busca):
+    if not texto_busca: return df
+    mask = df[coluna_busca].astype(str).apply(lambda x: normalizar_para_busca(texto_busca) in normalizar_para_busca(x))
+    return df[mask]
+
+def normalizar_codigo_serie(serie):
+    return serie.astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+
+def linhas_ainda_ausentes(df_novo, df_existente):
+    """
+    Linhas de df_novo que ainda não estão em df_existente, contando as repetições: duas linhas iguais legítimas
+    só somem se o destino já tiver as duas. Repetir uma cópia interrompida no meio não duplica nem perde nada.
+    """
+    if df_novo.empty or df_existente.empty: return df_novo
+    colunas = list(df_novo.columns)
+    def com_ocorrencia(df):
+        df = df.reindex(columns=colunas).fillna("").astype(str)
+        return df.assign(_ocorrencia=df.groupby(colunas, sort=False).cumcount())
+    cruzado = com_ocorrencia(df_novo).merge(com_ocorrencia(df_existente), on=colunas + ['_ocorrencia'], how='left', indicator=True)
+    return df_novo[(cruzado['_merge'] == 'left_only').to_numpy()]
@@ -0,0 +1 @@
+"""Páginas do menu: cada módulo expõe mostrar(df, prefixo, loja_atual, usar_modo_mobile)."""
@@ -0,0 +1,86 @@
+"""🛠️ Ajuste & Limpeza"""
+import streamlit as st
+from nucleo.estoque import salvar_estoque, unificar_todas_as_lojas
+from nucleo.arquivamento import MESES_JANELA_QUENTE, arquivar_linhas_antigas
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("🛠️ Ajuste & Limpeza de Estoque")
+    st.info("Ferramentas para corrigir erros e limpar o cadastro.")
+    
+    c_z1, c_z2 = st.columns(2)
+    with c_z1:
+        st.markdown("### 📉 Zerar Negativos")
+        st.write("Transforma todo estoque negativo em ZERO.")
+        if st.button("ZERAR ESTOQUE NEGATIVO AGORA"):
+            mask_neg = df['qtd.estoque'] < 0
+            count_neg = mask_neg.sum()
+            if count_neg > 0:
+                df.loc[mask_neg, 'qtd.estoque'] = 0
+                salvar_estoque(df, prefixo)
+                st.success(f"✅ {count_neg} produtos negativos foram zerados!")
+                st.rerun()
+            else:
+                st.info("Nenhum produto negativo encontrado.")
+    
+    with c_z2:
+        st.markdown("### 🔗 Unificar Duplicados (Todas as Lojas)")
+        st.write("Junta produtos com o mesmo código de barras no estoque de TODAS as lojas.")
+        if st.button("UNIFICAR DUPLICADOS EM TODAS AS LOJAS"):
+            with st.spinner("Procurando códigos duplicados..."):
+                resultado_unif = unificar_todas_as_lojas()
+            total_unif = sum(len(r) for r in resultado_unif.values())
+            if total_unif:
+                st.success(f"✅ {total_unif} códigos duplicados unificados!")
+                for loja, relatorio_unif in resultado_unif.items():
+                    if not relatorio_unif.empty:
+                        st.markdown(f"**{loja}**")
+                        st.dataframe(relatorio_unif, use_container_width=True, hide_index=True)
+                st.session_state.pop('df_ativo', None)
+            else:
+                st.info("Nenhum código duplicado encontrado.")
+
+    st.divider()
+    st.markdown("### 🧹 Inativar em Massa (Fantasmas)")
+    st.write("Liste produtos com estoque ZERO (ou 1) para inativar rapidamente.")
+    
+    limite_f = st.number_input("Mostrar produtos com estoque MENOR ou IGUAL a:", value=0, min_value=0)
+    
+    df_fantasmas = df[(df['status'] == 'Ativo') & (df['qtd.estoque'] <= limite_f)].copy()
+    
+    if not df_fantasmas.empty:
+        df_fantasmas['Selecionar'] = False
+        df_fantasmas_edit = st.data_editor(
+            df_fantasmas[['Selecionar', 'nome do produto', 'qtd.estoque', 'ultimo_fornecedor']], 
+            hide_index=True, 
+            use_container_width=True
+        )
+        
+        if st.button("🔴 INATIVAR SELECIONADOS"):
+            selecionados = df_fantasmas_edit[df_fantasmas_edit['Selecionar']]
+            if not selecionados.empty:
+                count_inativados = 0
+                for _, row in selecionados.iterrows():
+                    mask = df['nome do produto'] == row['nome do produto']
+                    if mask.any():
+                        df.loc[mask, 'status'] = 'Inativo'
+                        count_inativados += 1
+                
+                salvar_estoque(df, prefixo)
+                st.success(f"✅ {count_inativados} produtos inativados! Eles não aparecerão mais na Lista de Compras.")
+                st.rerun()
+            else:
+                st.warning("Selecione algum produto na tabela acima.")
+    else:
+        st.success("Tudo limpo! Nenhum produto ativo com estoque baixo encontrado.")
+
+    st.divider()
+    st.markdown("### 🗄️ Arquivar Registros Antigos")
+    st.write("Vendas, movimentações e histórico de compras mais antigos que a janela vão para abas anuais (..._arquivo_AAAA). Isso roda sozinho ao abrir a loja; aqui dá para escolher outra janela.")
+    meses_janela = st.number_input("Manter nas abas do dia a dia os últimos (meses):", value=MESES_JANELA_QUENTE, min_value=1, step=1)
+    if st.button("🗄️ ARQUIVAR AGORA"):
+        with st.spinner("Movendo registros antigos..."):
+            movidas = arquivar_linhas_antigas(prefixo, int(meses_janela))
+        if movidas:
+            st.success("✅ " + " · ".join(f"{aba}: {n} linhas arquivadas" for aba, n in movidas.items()))
+        else:
+            st.info("Nada mais antigo que a janela.")
@@ -0,0 +1,40 @@
+"""🔎 Log de Auditoria"""
+import streamlit as st
+from datetime import timedelta
+from nucleo.util import obter_hora_manaus
+from nucleo.auditoria import carregar_indice_auditoria, consultar_auditoria, filtrar_indice_auditoria
+
+LINHAS_POR_PAGINA = 50
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"🔎 Log de Auditoria - {loja_atual}")
+    st.info("Quem mexeu em quê e quando. Os registros ficam numa aba por mês; a consulta só lê os meses do período e do filtro.")
+    df_indice = carregar_indice_auditoria(prefixo)
+    if df_indice.empty:
+        st.warning("Nenhum registro de auditoria ainda.")
+        return
+
+    hoje = obter_hora_manaus().date()
+    c_f1, c_f2 = st.columns(2)
+    periodo = c_f1.date_input("Período:", value=(hoje - timedelta(days=30), hoje), format="DD/MM/YYYY")
+    busca_produto = c_f2.text_input("🔍 Produto:", placeholder="Parte do nome...")
+    acoes = st.multiselect("Ações:", sorted(df_indice['acao'].astype(str).unique()))
+    if not isinstance(periodo, (tuple, list)) or len(periodo) != 2:
+        st.caption("Escolha a data final do período.")
+        return
+    inicio, fim = periodo
+
+    sel = filtrar_indice_auditoria(df_indice, inicio, fim, busca_produto, acoes)
+    st.caption(f"📂 Meses lidos: {', '.join(sorted(sel['mes'].unique(), reverse=True)) or 'nenhum'}")
+    df_r = consultar_auditoria(prefixo, inicio, fim, busca_produto, acoes, df_indice=df_indice)
+    if df_r.empty:
+        st.warning("Nenhum registro com esses filtros.")
+        return
+
+    total_paginas = (len(df_r) - 1) // LINHAS_POR_PAGINA + 1
+    c_p1, c_p2 = st.columns([1, 3])
+    pagina = c_p1.number_input("Página:", min_value=1, max_value=total_paginas, value=1, step=1)
+    c_p2.write(f"**{len(df_r)}** registros · página {pagina} de {total_paginas}")
+    inicio_pag = (pagina - 1) * LINHAS_POR_PAGINA
+    st.dataframe(df_r.iloc[inicio_pag:inicio_pag + LINHAS_POR_PAGINA], use_container_width=True, hide_index=True)
+    st.download_button(label="📥 BAIXAR RESULTADO (CSV)", data=df_r.to_csv(index=False).encode('utf-8'), file_name=f"auditoria_{prefixo}_{inicio}_{fim}.csv", mime="text/csv")
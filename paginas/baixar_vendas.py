@@ -0,0 +1,51 @@
+"""📉 Baixar Vendas (Do Relatório)"""
+import streamlit as st
+import pandas as pd
+from nucleo.arquivos import ler_planilha_upload
+from nucleo.estoque import baixar_vendas_relatorio, carregar_vendas, salvar_estoque, salvar_vendas
+from nucleo.lotes import baixar_lotes
+from nucleo.reposicao import rotulos_dos_produtos
+from nucleo.ids_vendas import carregar_ids_processados, salvar_ids_processados
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"📉 Baixar Vendas")
+    df_vendas = carregar_vendas(prefixo)
+    
+    tab_imp, tab_hist = st.tabs(["📂 Importar", "📜 Histórico"])
+    with tab_imp:
+        arquivo_vendas = st.file_uploader("Relatório", type=['xlsx', 'xls'])
+        if arquivo_vendas:
+            try:
+                df_bruto = ler_planilha_upload(arquivo_vendas, header=None, nrows=3)
+                st.dataframe(df_bruto)
+                linha_titulo = st.number_input("Linha Títulos:", 0)
+                df_temp = ler_planilha_upload(arquivo_vendas, header=linha_titulo)
+                cols = df_temp.columns.tolist()
+                c1, c2, c3, c4 = st.columns(4)
+                col_nome = c1.selectbox("NOME", cols)
+                col_qtd = c2.selectbox("QUANTIDADE", cols)
+                col_data = c3.selectbox("DATA", cols)
+                col_id = c4.selectbox("ID DA VENDA (opcional)", ["(Nenhuma)"] + cols, help="Com o ID, vendas já baixadas em importações anteriores são ignoradas.")
+                if st.button("PROCESSAR"):
+                    if col_id != "(Nenhuma)":
+                        # IDs como estavam no arquivo (sem a tipagem numérica, que perde dígitos acima de 2**53)
+                        ids = ler_planilha_upload(arquivo_vendas, header=linha_titulo, tipar=False)[col_id]
+                        # Checagem de uma vez para o arquivo todo (filtro de Bloom + vetor ordenado)
+                        ja_baixadas = carregar_ids_processados(prefixo).contem(ids)
+                        if ja_baixadas.any(): st.info(f"🔁 {int(ja_baixadas.sum())} linhas já tinham sido baixadas antes e foram ignoradas.")
+                        df_temp = df_temp[~ja_baixadas].reset_index(drop=True)
+                        ids = ids[~ja_baixadas].reset_index(drop=True)
+                    bar = st.progress(0)
+                    linhas_baixadas = []
+                    novos_reg = baixar_vendas_relatorio(df, df_temp, col_nome, col_qtd, bar.progress, linhas_baixadas)
+                    salvar_estoque(df, prefixo, alterados=rotulos_dos_produtos(df, [r['produto'] for r in novos_reg]))
+                    if novos_reg:
+                        salvar_vendas(pd.concat([df_vendas, pd.DataFrame(novos_reg)], ignore_index=True), prefixo)
+                        baixar_lotes(prefixo, df, [r['produto'] for r in novos_reg], [r['qtd_vendida'] for r in novos_reg])  # FEFO na prateleira
+                    # Só as linhas que viraram venda: as puladas (qtd zero, produto não achado) podem voltar num próximo envio
+                    if col_id != "(Nenhuma)": salvar_ids_processados(prefixo, ids.loc[linhas_baixadas])
+                    st.success("Vendas baixadas!")
+            except Exception as e: st.error(f"Erro: {e}")
+    with tab_hist:
+        if not df_vendas.empty: st.dataframe(df_vendas)
+        else: st.info("Vazio.")
@@ -0,0 +1,30 @@
+"""⚙️ Configurar Base Oficial"""
+import streamlit as st
+from nucleo.util import normalizar_texto
+from nucleo.planilha import salvar_no_google
+from nucleo.arquivos import ler_planilha_upload
+
+def processar_excel_oficial(arquivo_subido):
+    try:
+        df_temp = ler_planilha_upload(arquivo_subido)
+        if 'obrigatório' in str(df_temp.iloc[0].values):
+            df_temp = df_temp.iloc[1:].reset_index(drop=True)
+        df_temp.columns = df_temp.columns.str.strip()
+        col_nome = next((c for c in df_temp.columns if 'nome' in c.lower()), 'Nome')
+        col_cod = next((c for c in df_temp.columns if 'código' in c.lower() or 'barras' in c.lower()), 'Código de Barras Primário')
+        df_limpo = df_temp[[col_nome, col_cod]].copy()
+        df_limpo.columns = ['nome do produto', 'código de barras']
+        df_limpo['nome do produto'] = df_limpo['nome do produto'].apply(normalizar_texto)
+        df_limpo['código de barras'] = df_limpo['código de barras'].astype(str).str.replace('.0', '', regex=False).str.strip()
+        
+        salvar_no_google(df_limpo, "meus_produtos_oficiais")
+        return True
+    except Exception as e:
+        st.error(f"Erro ao organizar o arquivo: {e}")
+        return False
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("⚙️ Configurar Base")
+    arq = st.file_uploader("Arquivo", type=['xlsx', 'csv'])
+    if arq and st.button("Processar"):
+        if processar_excel_oficial(arq): st.success("Base atualizada!"); st.rerun()
@@ -0,0 +1,59 @@
+"""🆕 Cadastrar Produto"""
+import streamlit as st
+import pandas as pd
+from nucleo.arquivos import ler_planilha_upload
+from nucleo.estoque import cadastrar_produtos, indice_codigos, validar_cadastro_em_lote
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"🆕 Cadastro - {loja_atual}")
+    tab_individual, tab_lote = st.tabs(["✍️ Individual", "📋 Em Lote (Colar / Upload)"])
+    with tab_individual:
+        with st.form("form_cadastro"):
+            c1, c2 = st.columns(2)
+            with c1:
+                novo_cod = st.text_input("Código de Barras:")
+                novo_nome = st.text_input("Nome do Produto:")
+                nova_cat = st.text_input("Categoria:")
+            with c2:
+                novo_custo = st.number_input("Preço Custo:", min_value=0.0, format="%.2f")
+                novo_venda = st.number_input("Preço Venda:", min_value=0.0, format="%.2f")
+                novo_min = st.number_input("Estoque Mínimo:", min_value=0, value=5)
+            st.divider()
+            c3, c4, c5 = st.columns(3)
+            with c3: ini_loja = st.number_input("Qtd Loja:", min_value=0)
+            with c4: ini_casa = st.number_input("Qtd Casa:", min_value=0)
+            with c5: ini_val = st.date_input("Validade:", value=None)
+            if st.form_submit_button("💾 CADASTRAR"):
+                if not novo_cod or not novo_nome: st.error("Código e Nome obrigatórios!")
+                elif str(novo_cod).strip() in indice_codigos(df): st.error("Código já existe!")
+                else:
+                    novo = {'código de barras': str(novo_cod).strip(), 'nome do produto': novo_nome.upper().strip(), 'qtd.estoque': ini_loja, 'qtd_central': ini_casa, 'qtd_minima': novo_min, 'validade': pd.to_datetime(ini_val) if ini_val else None, 'status_compra': 'OK', 'qtd_comprada': 0, 'preco_custo': novo_custo, 'preco_venda': novo_venda, 'categoria': nova_cat, 'ultimo_fornecedor': '', 'preco_sem_desconto': 0.0, 'status': 'Ativo'}
+                    df = cadastrar_produtos(df, pd.DataFrame([novo]), prefixo)
+                    st.session_state['df_ativo'] = df
+                    st.success("Cadastrado!")
+                    st.rerun()
+
+    with tab_lote:
+        st.info("Suba uma planilha (xlsx/csv) ou cole as linhas na tabela. Colunas: código de barras, nome, categoria, custo, venda, mínimo, qtd loja, qtd casa, validade.")
+        arq_lote = st.file_uploader("📂 Planilha de produtos", type=['xlsx', 'xls', 'csv'], key="upload_cadastro_lote")
+        if arq_lote:
+            df_lote = ler_planilha_upload(arq_lote)
+        else:
+            modelo = pd.DataFrame(columns=['código de barras', 'nome do produto', 'categoria', 'preco_custo', 'preco_venda', 'qtd_minima', 'qtd.estoque', 'qtd_central', 'validade'], dtype=str)
+            df_lote = st.data_editor(modelo, num_rows="dynamic", use_container_width=True, key="editor_cadastro_lote")
+
+        if not df_lote.empty:
+            df_validos, df_invalidos = validar_cadastro_em_lote(df_lote, indice_codigos(df))
+            c_ok, c_err = st.columns(2)
+            c_ok.metric("✅ Prontos para cadastrar", len(df_validos))
+            c_err.metric("❌ Com problema", len(df_invalidos))
+            if not df_invalidos.empty:
+                st.dataframe(df_invalidos[['motivo', 'código de barras', 'nome do produto']], use_container_width=True, hide_index=True)
+            if not df_validos.empty:
+                with st.expander(f"👀 Ver {len(df_validos)} produtos válidos"):
+                    st.dataframe(df_validos, use_container_width=True, hide_index=True)
+                if st.button(f"💾 CADASTRAR {len(df_validos)} PRODUTOS"):
+                    df = cadastrar_produtos(df, df_validos, prefixo, acao="Novo Cadastro (Lote)")
+                    st.session_state['df_ativo'] = df
+                    st.success(f"✅ {len(df_validos)} produtos cadastrados!")
+                    st.rerun()
@@ -0,0 +1,80 @@
+"""⚖️ Conciliação (Shoppbud vs App)"""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from io import BytesIO
+from nucleo.arquivos import ler_planilha_upload
+from nucleo.estoque import carregar_dados, salvar_estoque, salvar_logs_em_lote
+from nucleo.lojas import prefixos_das_lojas
+from nucleo.conciliacao import COL_ACEITAR_CONCILIACAO, aplicar_correcoes_conciliacao, arquivo_ajuste_shoppbud, conciliar_estoque, detectar_colunas_planograma
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("⚖️ Conciliação de Estoque")
+    st.markdown("**Ferramenta de Auditoria:** Compare o estoque do seu App com o Planograma do Shoppbud.")
+    conciliar_todas = st.checkbox("🏬 Conciliar todas as lojas de uma vez", value=False)
+    lojas_conc = prefixos_das_lojas() if conciliar_todas else [prefixo]
+    planogramas = {}
+    for loja in lojas_conc:
+        rotulo = f"📂 Carregar Planograma Shoppbud (.xlsx) - {loja}" if conciliar_todas else "📂 Carregar Planograma Shoppbud (.xlsx)"
+        arq_planograma = st.file_uploader(rotulo, type=['xlsx'], key=f"planograma_{loja}")
+        if arq_planograma: planogramas[loja] = arq_planograma
+
+    resultados = {}
+    for loja, arq_planograma in planogramas.items():
+        try:
+            df_plan = ler_planilha_upload(arq_planograma)
+            col_cod_plan, col_qtd_plan = detectar_colunas_planograma(df_plan)
+            if col_cod_plan and col_qtd_plan:
+                df_loja = df if loja == prefixo else carregar_dados(loja)
+                resultados[loja] = (df_loja, conciliar_estoque(df_loja, df_plan, col_cod_plan, col_qtd_plan))
+            else: st.error(f"Não encontrei colunas corretas ({arq_planograma.name}).")
+        except Exception as e: st.error(f"Erro ao ler arquivo: {e}")
+
+    if resultados:
+        resumo = pd.DataFrame([{'loja': loja, **df_conc['classificação'].value_counts().to_dict()} for loja, (_, df_conc) in resultados.items()]).fillna(0)
+        st.dataframe(resumo, use_container_width=True, hide_index=True)
+        incluir_so_app = st.checkbox("Incluir itens 'Só no App' no arquivo de ajuste do Shoppbud", value=False)
+        st.caption("💡 Itens 'Só no Shoppbud' não existem no App: a marcação de aceitar não tem efeito neles.")
+
+        editados = {}
+        for loja, (df_loja, df_conc) in resultados.items():
+            df_divergente = df_conc[df_conc['classificação'] != 'OK'].copy()
+            with st.expander(f"🏪 {loja}: {len(df_divergente)} linhas fora do OK", expanded=len(resultados) == 1):
+                if df_divergente.empty:
+                    st.success("✅ Parabéns! Seu estoque está 100% batendo!")
+                    continue
+                filtro_classes = st.multiselect("Mostrar:", ['Divergente', 'Só no App', 'Só no Shoppbud'], default=['Divergente', 'Só no App', 'Só no Shoppbud'], key=f"filtro_conc_{loja}")
+                df_divergente = df_divergente[df_divergente['classificação'].isin(filtro_classes)]
+                df_divergente[COL_ACEITAR_CONCILIACAO] = False
+                editados[loja] = st.data_editor(
+                    df_divergente[['código normalizado', 'nome do produto', 'qtd_app', 'qtd_shoppbud', 'Diferença', 'classificação', COL_ACEITAR_CONCILIACAO]],
+                    column_config={"qtd_app": st.column_config.NumberColumn("Seu App", disabled=True), "qtd_shoppbud": st.column_config.NumberColumn("Shoppbud", disabled=True), "Diferença": st.column_config.NumberColumn("Diferença", disabled=True)},
+                    disabled=['código normalizado', 'nome do produto', 'classificação'], use_container_width=True, hide_index=True, key=f"editor_conc_{loja}"
+                )
+
+        c_esq, c_dir = st.columns(2)
+        with c_esq:
+            if editados and st.button("💾 ATUALIZAR MEU APP (Esquerda)", type="primary"):
+                itens_corrigidos = 0
+                for loja, df_edit in editados.items():
+                    df_loja, df_conc = resultados[loja]
+                    aceitos = df_conc.loc[df_edit.index[df_edit[COL_ACEITAR_CONCILIACAO]]]
+                    qtd_corrigida, logs_concilia = aplicar_correcoes_conciliacao(df_loja, aceitos)
+                    if qtd_corrigida:
+                        salvar_estoque(df_loja, loja)
+                        salvar_logs_em_lote(loja, logs_concilia)
+                        itens_corrigidos += qtd_corrigida
+                st.success(f"✅ {itens_corrigidos} itens corrigidos!")
+                st.rerun()
+        with c_dir:
+            buffer = BytesIO()
+            total_ajuste = 0
+            with pd.ExcelWriter(buffer) as writer:
+                for loja, (_, df_conc) in resultados.items():
+                    df_base = df_conc.assign(**{COL_ACEITAR_CONCILIACAO: False})
+                    if loja in editados: df_base.loc[editados[loja].index, COL_ACEITAR_CONCILIACAO] = editados[loja][COL_ACEITAR_CONCILIACAO].values
+                    df_export_final = arquivo_ajuste_shoppbud(df_base, incluir_so_app)
+                    total_ajuste += len(df_export_final)
+                    df_export_final.to_excel(writer, sheet_name=loja if len(resultados) > 1 else "Sheet1", index=False)
+            if total_ajuste:
+                st.download_button(label="📥 BAIXAR EXCEL PARA SHOPPBUD", data=buffer.getvalue(), file_name=f"ajuste_shoppbud_{datetime.now().strftime('%Y%m%d')}.xlsx", mime="application/vnd.ms-excel")
@@ -0,0 +1,72 @@
+"""📊 Dashboard (Visão Geral)"""
+import streamlit as st
+import pandas as pd
+from datetime import timedelta
+from nucleo.util import filtrar_dados_inteligente, formatar_moeda_br, obter_hora_manaus
+from nucleo.estoque import salvar_estoque
+from nucleo.reposicao import lista_reposicao
+from nucleo.lotes import DONO_CASA, carregar_lotes, corrigir_lotes, indice_validades, lotes_vencendo, salvar_lotes
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"📊 Painel de Controle (Nuvem) - {loja_atual}")
+
+    if df.empty:
+        st.info("Comece cadastrando produtos.")
+    else:
+        hoje = obter_hora_manaus()
+        df_ativos = df[df['status'] == 'Ativo']
+        # Vencimentos por lote: o índice já vem ordenado por validade, cada janela é uma fatia
+        # Código vazio não identifica produto: não liga lote a produto nem produto a lote
+        codigos = df['código de barras'].fillna("").astype(str).str.strip()
+        indice = indice_validades(prefixo)
+        indice = indice[(indice['código de barras'] != "") & indice['código de barras'].isin(codigos[df['status'] == 'Ativo'])]
+        lotes_criticos = lotes_vencendo(indice, hoje + timedelta(days=5))
+        lotes_atencao = lotes_vencendo(indice, hoje + timedelta(days=10), desde=hoje + timedelta(days=5))
+        # Produtos ainda sem lote: validade única do cadastro
+        sem_lote = ~codigos.isin(indice['código de barras'])
+        df_valido = df[sem_lote & (pd.notnull(df['validade'])) & (df['status'] == 'Ativo')].copy()
+        
+        df_critico = df_valido[(df_valido['validade'] <= hoje + timedelta(days=5)) & ((df_valido['qtd.estoque'] > 0) | (df_valido['qtd_central'] > 0))]
+        df_atencao = df_valido[(df_valido['validade'] > hoje + timedelta(days=5)) & (df_valido['validade'] <= hoje + timedelta(days=10))]
+        valor_estoque = (df_ativos['qtd.estoque'] * df_ativos['preco_custo']).sum() + (df_ativos['qtd_central'] * df_ativos['preco_custo']).sum()
+        
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("📦 Itens (Ativos)", int(df_ativos['qtd.estoque'].sum()))
+        c2.metric("💰 Valor Investido", f"R$ {formatar_moeda_br(valor_estoque)}")
+        c3.metric("🚨 Vencendo (5 dias)", len(df_critico) + lotes_criticos['código de barras'].nunique())
+        c4.metric("⚠️ Atenção (10 dias)", len(df_atencao) + lotes_atencao['código de barras'].nunique())
+        st.divider()
+        
+        bajo_estoque = lista_reposicao(df, prefixo)
+        if not bajo_estoque.empty:
+            st.warning(f"🚨 Existem {len(bajo_estoque)} produtos ATIVOS com estoque baixo! Vá em 'Lista de Compras'.")
+        
+        st.markdown("### 🚨 Gestão de Vencimentos")
+        filtro_venc = st.text_input("🔍 Buscar produtos vencendo:", placeholder="Nome...") if not (df_critico.empty and lotes_criticos.empty) else ""
+        if not lotes_criticos.empty:
+            st.markdown("#### 📦 Lotes vencendo (5 dias)")
+            st.info("💡 Corrija a validade do lote ou zere a quantidade para dar baixa (descarte/perda).")
+            df_lotes_show = filtrar_dados_inteligente(lotes_criticos, 'produto', filtro_venc)
+            df_lotes_edit = st.data_editor(df_lotes_show[['local', 'produto', 'lote', 'validade', 'qtd']], use_container_width=True, disabled=['local', 'produto', 'lote'], key="editor_lotes_vencendo")
+            if st.button("💾 SALVAR LOTES"):
+                origem = lotes_criticos.loc[df_lotes_edit.index]
+                for local, dono in (('loja', prefixo), ('casa', DONO_CASA)):
+                    sel = (origem['local'] == local).to_numpy()
+                    if not sel.any(): continue
+                    df_l = carregar_lotes(dono)
+                    if corrigir_lotes(df_l, origem[sel], df_lotes_edit[sel]): salvar_lotes(df_l, dono)
+                st.success("Lotes atualizados na Nuvem!")
+                st.rerun()
+        if not df_critico.empty:
+            if not lotes_criticos.empty: st.markdown("#### 🏷️ Produtos sem lote (validade do cadastro)")
+            df_venc_show = filtrar_dados_inteligente(df_critico, 'nome do produto', filtro_venc)
+            st.info("💡 Dica: Para remover o alerta, apague a data de validade (Delete) ou atualize-a.")
+            df_venc_edit = st.data_editor(df_venc_show[['nome do produto', 'validade', 'qtd.estoque']], use_container_width=True, disabled=['nome do produto'], key="editor_vencimento_avancado")
+            if st.button("💾 SALVAR CORREÇÕES DE VENCIMENTO"):
+                # O editor mantém o índice do df: grava direto nas linhas, sem procurar pelo nome
+                df.loc[df_venc_edit.index, 'validade'] = df_venc_edit['validade']
+                df.loc[df_venc_edit.index, 'qtd.estoque'] = df_venc_edit['qtd.estoque']
+                salvar_estoque(df, prefixo)
+                st.success("Vencimentos atualizados na Nuvem!")
+                st.rerun()
+        if df_critico.empty and lotes_criticos.empty: st.success("Nenhum produto vencendo nos próximos 5 dias.")
@@ -0,0 +1,46 @@
+"""🩺 Diagnóstico"""
+import streamlit as st
+from nucleo.metricas import DIAS_RETENCAO_METRICAS, carregar_metricas, resumir_metricas
+from nucleo.planilha import reenviar_pendentes, uso_cota
+from nucleo.diario import resumo_diario
+
+# ==============================================================================
+# 🩺 DIAGNÓSTICO DE DESEMPENHO (PÁGINA ESCONDIDA)
+# ==============================================================================
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("🩺 Diagnóstico de Desempenho")
+    st.info("Tempo de cada leitura/gravação na nuvem e de cada página, com chamadas à API e acerto do cache. As medições ficam só neste servidor.")
+    st.subheader("🚦 Cota da API (último minuto)")
+    cota = uso_cota()
+    c_q1, c_q2, c_q3 = st.columns(3)
+    c_q1.metric("Leituras", f"{cota['leitura']['ultimo_minuto']} / {cota['leitura']['limite']}", help=f"Espera total por ficha: {cota['leitura']['espera_total_s']}s")
+    c_q2.metric("Escritas", f"{cota['escrita']['ultimo_minuto']} / {cota['escrita']['limite']}", help=f"Espera total por ficha: {cota['escrita']['espera_total_s']}s")
+    c_q3.metric("Retentativas (429/5xx)", cota['retentativas'], help=f"Desistências após todas as tentativas: {cota['desistencias']}")
+    st.subheader("📓 Diário de gravações")
+    df_diario = resumo_diario()
+    pendentes_diario = df_diario[df_diario['status'] == 'pendente'] if not df_diario.empty else df_diario
+    if pendentes_diario.empty:
+        st.caption("Nenhuma gravação pendente: tudo o que foi salvo chegou à nuvem.")
+    else:
+        st.warning(f"{len(pendentes_diario)} gravação(ões) guardadas neste servidor aguardando reenvio.")
+        st.dataframe(pendentes_diario, use_container_width=True, hide_index=True)
+        if st.button("🔁 Reenviar agora"):
+            st.success(f"{reenviar_pendentes()} gravação(ões) confirmadas na nuvem.")
+    dias_diag = st.slider("Período (dias):", 1, DIAS_RETENCAO_METRICAS, 7)
+    df_metricas = carregar_metricas(dias_diag)
+    if df_metricas.empty:
+        st.warning("Nenhuma medição no período.")
+    else:
+        c_d1, c_d2, c_d3 = st.columns(3)
+        c_d1.metric("Medições", len(df_metricas))
+        c_d2.metric("Chamadas à API", int(df_metricas['chamadas_api'].sum()))
+        c_d3.metric("Erros", int((df_metricas['erro'] != "").sum()))
+        tipos_diag = st.multiselect("Operações:", sorted(df_metricas['operacao'].unique()), default=sorted(df_metricas['operacao'].unique()))
+        df_metricas = df_metricas[df_metricas['operacao'].isin(tipos_diag)]
+        st.subheader("⏱️ p50 / p95 por operação")
+        st.dataframe(resumir_metricas(df_metricas), use_container_width=True, hide_index=True)
+        erros_diag = df_metricas[df_metricas['erro'] != ""]
+        if not erros_diag.empty:
+            st.subheader("❌ Últimos erros")
+            st.dataframe(erros_diag.sort_values('momento', ascending=False).head(50)[['momento', 'operacao', 'detalhe', 'erro']], use_container_width=True, hide_index=True)
+        st.download_button(label="📥 BAIXAR MEDIÇÕES (CSV)", data=df_metricas.to_csv(index=False).encode('utf-8'), file_name="metricas.csv", mime="text/csv")
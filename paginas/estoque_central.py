@@ -0,0 +1,140 @@
+"""🏡 Estoque Central (Casa)"""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from nucleo.util import filtrar_dados_inteligente, obter_hora_manaus
+from nucleo.estoque import atualizar_casa_global, atualizar_casa_global_em_lote, carregar_historico, celulas_alteradas, falhas_da_propagacao, registrar_auditoria, salvar_estoque, salvar_historico, salvar_logs_em_lote
+from nucleo.lotes import DONO_CASA, registrar_lotes
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"🏡 Estoque Central (Casa) - {loja_atual}")
+    tab_ver, tab_gerenciar = st.tabs(["📋 Visualizar & Editar", "✍️ Gerenciar Entrada Manual"])
+    with tab_ver:
+        if not df.empty:
+            if usar_modo_mobile:
+                st.info("📱 Modo Celular (Edição Rápida com FILA)")
+                
+                if st.session_state['alteracoes_pendentes'] > 0:
+                    st.warning(f"⚠️ {st.session_state['alteracoes_pendentes']} alterações pendentes na memória.")
+                    if st.button("☁️ SINCRONIZAR AGORA (Gravar no Google)"):
+                        salvar_estoque(df, prefixo) 
+                        st.session_state['alteracoes_pendentes'] = 0
+                        st.success("Sincronizado com sucesso!")
+                        st.rerun()
+                else:
+                    st.success("✅ Tudo sincronizado.")
+                
+                st.markdown("---")
+                
+                busca_central = st.text_input("🔍 Buscar na Casa:", placeholder="Ex: arroz...")
+                df_show = filtrar_dados_inteligente(df, 'nome do produto', busca_central)
+                for idx, row in df_show.iterrows():
+                    with st.container(border=True):
+                        # --- CORREÇÃO DO ERRO AQUI: Mudado de 'código_barras' para 'código de barras' ---
+                        st.write(f"📝 {row['código de barras']} | **{row['nome do produto']}**")
+                        col1, col2 = st.columns(2)
+                        nova_qtd = col1.number_input(f"Qtd Casa:", value=int(row['qtd_central']), key=f"q_{idx}")
+                        novo_custo = col2.number_input(f"Custo:", value=float(row['preco_custo']), key=f"c_{idx}")
+                        
+                        if st.button(f"💾 Confirmar {row['nome do produto']} (Local)", key=f"btn_{idx}"):
+                            df.at[idx, 'qtd_central'] = nova_qtd
+                            df.at[idx, 'preco_custo'] = novo_custo
+                            
+                            st.session_state['alteracoes_pendentes'] += 1
+                            st.toast(f"Salvo localmente! ({st.session_state['alteracoes_pendentes']} pendentes)")
+                            st.rerun() 
+            else:
+                st.info("✏️ Edição direta.")
+                busca_central = st.text_input("🔍 Buscar Produto na Casa:", placeholder="Ex: oleo concordia...", key="busca_central")
+                colunas_visiveis = ['código de barras', 'nome do produto', 'qtd_central', 'validade', 'preco_custo', 'ultimo_fornecedor']
+                df_visual = filtrar_dados_inteligente(df, 'nome do produto', busca_central)[colunas_visiveis]
+                df_editado = st.data_editor(df_visual, use_container_width=True, num_rows="dynamic", key="edit_casa")
+                if st.button("💾 SALVAR CORREÇÕES DA TABELA"):
+                    # Só as células que realmente mudaram são aplicadas, auditadas e levadas às outras lojas
+                    mudancas = celulas_alteradas(df_visual, df_editado)
+                    indices_removidos = df_visual.index.difference(df_editado.index)
+                    if mudancas.empty and indices_removidos.empty:
+                        st.info("Nenhuma alteração na tabela.")
+                    else:
+                        agora = str(obter_hora_manaus())
+                        logs = [{'data_hora': agora, 'produto': df_visual.at[r, 'nome do produto'], 'qtd_antes': antes, 'qtd_nova': depois, 'acao': "Edição Tabela Casa", 'motivo': f"Coluna: {col}"}
+                                for r, col, antes, depois in mudancas.itertuples(index=False)]
+                        logs += [{'data_hora': agora, 'produto': df_visual.at[r, 'nome do produto'], 'qtd_antes': df_visual.at[r, 'qtd_central'], 'qtd_nova': 0, 'acao': "Exclusão Tabela Casa", 'motivo': "Linha removida"}
+                                 for r in indices_removidos]
+                        for col, grupo in mudancas.groupby('coluna'):
+                            rotulos = grupo['rotulo'].tolist()
+                            df.loc[rotulos, col] = df_editado.loc[rotulos, col]
+                        # Outras lojas acham o produto pelo nome de antes da edição
+                        propagar = mudancas.loc[mudancas['coluna'].isin(['qtd_central', 'preco_custo', 'validade']), 'rotulo'].unique()
+                        atualizacoes = [{'produto': df_visual.at[r, 'nome do produto'], 'qtd_central': df.at[r, 'qtd_central'], 'custo': df.at[r, 'preco_custo'], 'validade': df.at[r, 'validade']}
+                                        for r in propagar if r not in indices_removidos]
+                        if not indices_removidos.empty:
+                            df = df.drop(indices_removidos)
+                            st.session_state['df_ativo'] = df
+                        salvar_estoque(df, prefixo, alterados=None if not indices_removidos.empty else mudancas['rotulo'].unique().tolist())
+                        salvar_logs_em_lote(prefixo, logs)
+                        falhas = falhas_da_propagacao(atualizar_casa_global_em_lote(atualizacoes, prefixo))
+                        if falhas: st.toast(f"⚠️ Casa não atualizada em: {falhas}")
+                        st.success(f"Estoque atualizado! {len(mudancas)} células alteradas, {len(indices_removidos)} itens removidos.")
+                        st.rerun()
+    with tab_gerenciar:
+        st.info("Adicione mercadoria manualmente.")
+        df_hist = carregar_historico(prefixo)
+        
+        if not df.empty:
+            lista_visuais = (df['código de barras'].astype(str) + " - " + df['nome do produto'].astype(str)).unique().tolist()
+            lista_visuais = sorted(lista_visuais)
+            prod_opcao = st.selectbox("Selecione o Produto:", lista_visuais)
+            
+            if prod_opcao:
+                mask = (df['código de barras'].astype(str) + " - " + df['nome do produto'].astype(str)) == prod_opcao
+                if mask.any():
+                    idx_prod = df[mask].index[0]
+                    nome_atual = df.at[idx_prod, 'nome do produto']
+                    val_atual = df.at[idx_prod, 'validade']
+                    custo_atual = float(df.at[idx_prod, 'preco_custo'])
+                    venda_atual = float(df.at[idx_prod, 'preco_venda'])
+                    forn_atual = str(df.at[idx_prod, 'ultimo_fornecedor'])
+                    with st.form("edit_estoque_casa_full"):
+                        st.markdown(f"### Detalhes do Registro")
+                        c_dt, c_hr = st.columns(2)
+                        dt_reg = c_dt.date_input("Data da Entrada/Edição:", obter_hora_manaus().date())
+                        hr_reg = c_hr.time_input("Hora:", value=obter_hora_manaus().time().replace(second=0, microsecond=0), step=60)
+                        
+                        c_forn = st.text_input("Fornecedor desta entrada:", value=forn_atual)
+                        st.markdown("---")
+                        c_nome = st.text_input("Nome do Produto (Editável):", value=nome_atual)
+                        c_val, c_custo, c_venda = st.columns(3)
+                        nova_val = c_val.date_input("Validade:", value=val_atual if pd.notnull(val_atual) else None)
+                        novo_custo = c_custo.number_input("Preço Custo (UN):", value=custo_atual, format="%.2f")
+                        novo_venda = c_venda.number_input("Preço Venda (UN):", value=venda_atual, format="%.2f")
+                        st.markdown("---")
+                        c_qtd, c_acao = st.columns([1, 2])
+                        qtd_input = c_qtd.number_input("Quantidade:", min_value=0, value=0)
+                        acao = c_acao.radio("Ação sobre o estoque:", ["Somar (+) Entrada de Mercadoria", "Substituir (=) Correção de Estoque", "Apenas Salvar Dados (Sem mudar qtd)"], index=2)
+                        if st.form_submit_button("💾 SALVAR REGISTRO COMPLETO"):
+                            df.at[idx_prod, 'nome do produto'] = c_nome.upper().strip()
+                            df.at[idx_prod, 'validade'] = pd.to_datetime(nova_val) if nova_val else None
+                            df.at[idx_prod, 'preco_custo'] = novo_custo
+                            df.at[idx_prod, 'preco_venda'] = novo_venda
+                            if c_forn: df.at[idx_prod, 'ultimo_fornecedor'] = c_forn
+                            msg_acao = "Dados atualizados"
+                            
+                            qtd_antes_audit = df.at[idx_prod, 'qtd_central']
+                            if acao.startswith("Somar") and qtd_input > 0:
+                                df.at[idx_prod, 'qtd_central'] += qtd_input
+                                msg_acao = f"Adicionado +{qtd_input}"
+                                dt_full = datetime.combine(dt_reg, hr_reg)
+                                hist = {'data': str(dt_full), 'produto': c_nome.upper().strip(), 'fornecedor': c_forn, 'qtd': qtd_input, 'preco_pago': novo_custo, 'total_gasto': qtd_input * novo_custo}
+                                salvar_historico(pd.concat([df_hist, pd.DataFrame([hist])], ignore_index=True), prefixo)
+                                registrar_auditoria(prefixo, c_nome, qtd_antes_audit, df.at[idx_prod, 'qtd_central'], "Entrada Manual Casa")
+                                if nova_val: registrar_lotes(DONO_CASA, [{'código de barras': df.at[idx_prod, 'código de barras'], 'produto': c_nome.upper().strip(), 'qtd': qtd_input, 'validade': str(nova_val), 'lote': "", 'origem': "Entrada Manual Casa"}])
+                            elif acao.startswith("Substituir"):
+                                df.at[idx_prod, 'qtd_central'] = qtd_input
+                                msg_acao = f"Estoque corrigido para {qtd_input}"
+                                registrar_auditoria(prefixo, c_nome, qtd_antes_audit, qtd_input, "Correção Manual Casa")
+                            
+                            salvar_estoque(df, prefixo, alterados=[idx_prod])
+                            atualizar_casa_global(c_nome.upper().strip(), df.at[idx_prod, 'qtd_central'], novo_custo, novo_venda, pd.to_datetime(nova_val) if nova_val else None, prefixo)
+                            st.success(f"✅ {msg_acao}!")
+                            st.rerun()
@@ -0,0 +1,121 @@
+"""🏠 Gôndola (Loja)"""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from nucleo.util import filtrar_dados_inteligente, obter_hora_manaus
+from nucleo.estoque import atualizar_casa_global, carregar_movimentacoes, registrar_auditoria, salvar_estoque, salvar_movimentacoes
+from nucleo.lotes import transferir_lotes
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"🏠 Gôndola - {loja_atual}")
+    reativar_auto = st.checkbox("☑️ Reativar automaticamente produtos contados? (Inventário Inteligente)", value=True)
+    df_mov = carregar_movimentacoes(prefixo)
+    
+    if df.empty:
+        st.warning("Cadastre produtos.")
+    else:
+        if usar_modo_mobile:
+            st.info("📱 Modo Celular Ativado")
+            termo_busca = st.text_input("🔍 Buscar Produto (Nome ou Código):", placeholder="Digite aqui...")
+            df_show = filtrar_dados_inteligente(df, 'nome do produto', termo_busca)
+            if df_show.empty:
+                st.warning("Nenhum produto encontrado.")
+            else:
+                for idx, row in df_show.iterrows():
+                    icon_status = "🟢" if row['status'] == 'Ativo' else "🔴"
+                    with st.container(border=True):
+                        st.subheader(f"{icon_status} 🆔 {row['código de barras']} | {row['nome do produto']}")
+                        c1, c2 = st.columns(2)
+                        c1.metric("🏪 Loja", int(row['qtd.estoque']))
+                        c2.metric("🏡 Casa", int(row['qtd_central']))
+                        if row['qtd_central'] > 0:
+                            with st.form(key=f"form_mob_{idx}"):
+                                col_in, col_btn = st.columns([2, 1])
+                                q_tr = col_in.number_input("Qtd para Baixar:", min_value=1, max_value=int(row['qtd_central']), key=f"n_{idx}", label_visibility="collapsed")
+                                if col_btn.form_submit_button("⬇️ Baixar"):
+                                    df.at[idx, 'qtd.estoque'] += q_tr
+                                    df.at[idx, 'qtd_central'] -= q_tr
+                                    if reativar_auto and df.at[idx, 'status'] == 'Inativo':
+                                        df.at[idx, 'status'] = 'Ativo'
+                                        st.toast(f"{row['nome do produto']} REATIVADO!")
+                                    
+                                    salvar_estoque(df, prefixo, alterados=[idx])
+                                    atualizar_casa_global(row['nome do produto'], df.at[idx, 'qtd_central'], None, None, None, prefixo)
+                                    registrar_auditoria(prefixo, row['nome do produto'], 0, q_tr, "Baixa Gôndola Mobile")
+                                    transferir_lotes(prefixo, df, [row['nome do produto']], [q_tr])
+                                    st.success(f"Baixado {q_tr} un!")
+                                    st.rerun()
+                        else: st.warning("🚫 Casa Zerada")
+        else:
+            tab_acao, tab_hist = st.tabs(["🚚 Repor / Consultar", "📜 Histórico"])
+            with tab_acao:
+                df['display_busca'] = df['código de barras'].astype(str) + " - " + df['nome do produto'].astype(str)
+                opcao_busca = st.selectbox("🔍 Buscar Produto:", [""] + df['display_busca'].tolist())
+                if opcao_busca != "":
+                    idx = df[df['display_busca'] == opcao_busca].index[0]
+                    nome_prod = df.at[idx, 'nome do produto']
+                    st.markdown(f"## 📦 {nome_prod}")
+                    c1, c2, c3 = st.columns(3)
+                    c1.info(f"Loja: {int(df.at[idx, 'qtd.estoque'])}")
+                    c2.success(f"Casa: {int(df.at[idx, 'qtd_central'])}")
+                    val = df.at[idx, 'validade']
+                    c3.write(f"Validade: {val.strftime('%d/%m/%Y') if pd.notnull(val) else 'Sem data'}")
+                    st.caption(f"Status Atual: {'🟢 Ativo' if df.at[idx, 'status']=='Ativo' else '🔴 Inativo'}")
+                    st.divider()
+                    st.subheader("🚚 Transferência (Casa -> Loja)")
+                    with st.form("form_transf_gondola"):
+                        c_dt, c_hr, c_qtd = st.columns(3)
+                        dt_transf = c_dt.date_input("Data da Transferência:", obter_hora_manaus().date())
+                        hora_atual = obter_hora_manaus().time().replace(second=0, microsecond=0)
+                        hr_transf = c_hr.time_input("Hora:", value=hora_atual, step=60)
+                        
+                        qtd_disponivel = int(df.at[idx, 'qtd_central'])
+                        qtd_transf = c_qtd.number_input(f"Quantidade (Disp: {qtd_disponivel}):", min_value=0, max_value=qtd_disponivel, value=0)
+                        
+                        if st.form_submit_button("⬇️ CONFIRMAR TRANSFERÊNCIA"):
+                            if qtd_transf > 0:
+                                df.at[idx, 'qtd.estoque'] += qtd_transf
+                                df.at[idx, 'qtd_central'] -= qtd_transf
+                                if reativar_auto and df.at[idx, 'status'] == 'Inativo':
+                                    df.at[idx, 'status'] = 'Ativo'
+                                
+                                salvar_estoque(df, prefixo, alterados=[idx])
+                                atualizar_casa_global(nome_prod, df.at[idx, 'qtd_central'], None, None, None, prefixo)
+                                data_final = datetime.combine(dt_transf, hr_transf)
+                                novo_mov = {'data_hora': str(data_final), 'produto': nome_prod, 'qtd_movida': qtd_transf}
+                                df_mov = pd.concat([df_mov, pd.DataFrame([novo_mov])], ignore_index=True)
+                                salvar_movimentacoes(df_mov, prefixo)
+                                registrar_auditoria(prefixo, nome_prod, 0, qtd_transf, "Transferência Gôndola Desktop")
+                                transferir_lotes(prefixo, df, [nome_prod], [qtd_transf])
+                                st.success(f"Sucesso! {qtd_transf} unid. transferidas.")
+                                st.rerun()
+                            else: st.warning("Quantidade inválida.")
+                    
+                    st.divider()
+                    with st.expander("🛠️ Ajustes Manuais (Completo)"):
+                        st.warning("⚠️ Edições aqui atualizam o cadastro geral!")
+                        c_nome = st.text_input("Corrigir Nome:", value=nome_prod)
+                        c_forn = st.text_input("Fornecedor Principal:", value=df.at[idx, 'ultimo_fornecedor'])
+                        c_custo, c_venda = st.columns(2)
+                        n_custo = c_custo.number_input("Preço Custo:", value=float(df.at[idx, 'preco_custo']), format="%.2f")
+                        n_venda = c_venda.number_input("Preço Venda:", value=float(df.at[idx, 'preco_venda']), format="%.2f")
+                        c1, c2 = st.columns(2)
+                        n_qtd_loja = c1.number_input("Qtd Real Loja:", value=int(df.at[idx, 'qtd.estoque']))
+                        n_val = c2.date_input("Nova Validade:", value=val if pd.notnull(val) else None)
+                        if st.button("💾 SALVAR CORREÇÕES"):
+                            df.at[idx, 'nome do produto'] = c_nome.upper().strip()
+                            df.at[idx, 'ultimo_fornecedor'] = c_forn.strip()
+                            df.at[idx, 'preco_custo'] = n_custo
+                            df.at[idx, 'preco_venda'] = n_venda
+                            qtd_antes_audit = df.at[idx, 'qtd.estoque']
+                            df.at[idx, 'qtd.estoque'] = n_qtd_loja
+                            df.at[idx, 'validade'] = pd.to_datetime(n_val) if n_val else None
+                            salvar_estoque(df, prefixo, alterados=[idx])
+                            registrar_auditoria(prefixo, c_nome, qtd_antes_audit, n_qtd_loja, "Ajuste Manual Gôndola")
+                            st.success("Atualizado em todo o sistema!")
+                            st.rerun()
+            with tab_hist:
+                if not df_mov.empty:
+                    busca_gondola_hist = st.text_input("🔍 Buscar no Histórico de Gôndola:", placeholder="Ex: oleo...", key="busca_gondola_hist")
+                    df_mov_show = filtrar_dados_inteligente(df_mov, 'produto', busca_gondola_hist)
+                    st.dataframe(df_mov_show.sort_values(by='data_hora', ascending=False), use_container_width=True, hide_index=True)
@@ -0,0 +1,94 @@
+"""📥 Importar XML (Associação Inteligente)"""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from nucleo.util import normalizar_para_busca, normalizar_serie_texto, obter_hora_manaus
+from nucleo.planilha import anexar_no_google
+from nucleo.estoque import atualizar_casa_global_em_lote, carregar_base_oficial, falhas_da_propagacao, salvar_estoque, salvar_logs_em_lote
+from nucleo.compras import aplicar_importacao_xml, associar_itens_xml, ler_xml_nfe
+from nucleo.lotes import DONO_CASA, lotes_da_nota, registrar_lotes
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"📥 Importar XML")
+    
+    modo_import = st.radio("Modo:", ["📦 Atualizar Estoque (Entrada)", "📖 Apenas Referência (Histórico)"], horizontal=True)
+    arquivo_xml = st.file_uploader("Arraste o XML aqui", type=['xml'])
+    if arquivo_xml:
+        try:
+            dados = ler_xml_nfe(arquivo_xml, carregar_base_oficial())
+            st.success(f"Nota: {dados['numero']} | Fornecedor: {dados['fornecedor']}")
+            
+            st.markdown("### 🗓️ Datas da Operação")
+            c_data_xml, c_data_sis = st.columns(2)
+            
+            data_xml_str = dados.get('data_emissao', 'Não encontrada no XML')
+            c_data_xml.text_input("Data Emissão (Real da Nota - XML):", value=data_xml_str, disabled=True, key="view_data_xml")
+            
+            agora = obter_hora_manaus()
+            with c_data_sis:
+                st.markdown("**Data de Lançamento no Sistema (Controle):**")
+                c_d, c_h = st.columns(2)
+                dt_lanc = c_d.date_input("Dia:", value=agora.date(), key="dt_lanc_xml")
+                hr_lanc = c_h.time_input("Hora:", value=agora.time(), step=60, key="hr_lanc_xml")
+            
+            data_lancamento_final = datetime.combine(dt_lanc, hr_lanc)
+
+            df_assoc = associar_itens_xml(dados['itens'], df)
+            escolhas = {}
+            chave_nota = f"{dados['numero']}_{arquivo_xml.name}"
+
+            # --- Matches confiáveis (EAN exato / nome muito parecido): só uma tabela compacta ---
+            mask_auto = df_assoc['confiante'] if not df_assoc.empty else pd.Series(dtype=bool)
+            revisar = set()
+            if mask_auto.any():
+                st.markdown(f"### ✅ Associados automaticamente ({int(mask_auto.sum())})")
+                df_auto_view = pd.DataFrame({
+                    '(XML) Produto': df_assoc.loc[mask_auto, 'nome'], 'EAN': df_assoc.loc[mask_auto, 'ean'],
+                    'Vinculado a': df_assoc.loc[mask_auto, 'opcao'].str.replace("[SISTEMA] ", "", regex=False),
+                    'Origem': df_assoc.loc[mask_auto, 'origem'], 'Score': df_assoc.loc[mask_auto, 'score'].round(2),
+                    '🔁 Revisar': False
+                })
+                df_auto_edit = st.data_editor(df_auto_view, hide_index=True, use_container_width=True, disabled=['(XML) Produto', 'EAN', 'Vinculado a', 'Origem', 'Score'], key=f"auto_xml_{chave_nota}")
+                revisar = set(df_auto_edit.index[df_auto_edit['🔁 Revisar']])
+                for i in df_assoc.index[mask_auto]:
+                    if i not in revisar: escolhas[i] = df_assoc.at[i, 'opcao']
+
+            # --- Itens incertos: seletor pequeno (candidatos + busca sob demanda) ---
+            pendentes = [i for i in df_assoc.index if i not in escolhas]
+            if pendentes:
+                st.markdown(f"### 🔎 Revisar ({len(pendentes)})")
+                catalogo_visual = (df['código de barras'].astype(str) + " - " + df['nome do produto'].astype(str)) if not df.empty else pd.Series(dtype=str)
+                catalogo_busca = normalizar_serie_texto(catalogo_visual) if not df.empty else pd.Series(dtype=str)
+            for i in pendentes:
+                item = dados['itens'][i]
+                st.divider()
+                c1, c2 = st.columns([1, 1])
+                with c1: st.markdown(f"📦 **(XML) {item['nome']}**\n\n*EAN: {item['ean']}*")
+                with c2:
+                    termo = st.text_input("Buscar no catálogo:", key=f"busca_x_{chave_nota}_{i}", placeholder="Nome ou código...")
+                    opcoes = ["(CRIAR NOVO)"]
+                    if df_assoc.at[i, 'opcao'] != "(CRIAR NOVO)": opcoes.append(df_assoc.at[i, 'opcao'])
+                    opcoes += df_assoc.at[i, 'candidatos']
+                    if termo and not catalogo_busca.empty:
+                        achados = catalogo_visual[catalogo_busca.str.contains(normalizar_para_busca(termo), regex=False)].head(50)
+                        opcoes += [f"[SISTEMA] {x}" for x in achados]
+                    opcoes = list(dict.fromkeys(opcoes))
+                    match_inicial = df_assoc.at[i, 'opcao']
+                    escolhas[i] = st.selectbox("Vincular a:", opcoes, index=opcoes.index(match_inicial) if match_inicial in opcoes else 0, key=f"x_{chave_nota}_{i}")
+            
+            st.markdown("---")
+            if st.button("✅ CONFIRMAR IMPORTAÇÃO"):
+                df, df_hist_novos, df_logs_xml, atualizacoes_casa_xml = aplicar_importacao_xml(df, dados, escolhas, "Atualizar" in modo_import, data_lancamento_final, data_xml_str)
+                salvar_estoque(df, prefixo)
+                if not df_hist_novos.empty: anexar_no_google(df_hist_novos, f"{prefixo}_historico_compras")
+                salvar_logs_em_lote(prefixo, df_logs_xml.to_dict('records'))
+                falhas = falhas_da_propagacao(atualizar_casa_global_em_lote(atualizacoes_casa_xml, prefixo))
+                if falhas: st.toast(f"⚠️ Casa não atualizada em: {falhas}")
+                if "Atualizar" in modo_import and not df_hist_novos.empty:
+                    lotes_loja, lotes_casa = lotes_da_nota(dados, df_hist_novos['produto'].tolist(), escolhas, df)
+                    registrar_lotes(prefixo, lotes_loja)
+                    registrar_lotes(DONO_CASA, lotes_casa)
+                st.session_state['df_ativo'] = df
+                st.success("Processado com sucesso!")
+                st.rerun()
+        except Exception as e: st.error(f"Erro: {e}")
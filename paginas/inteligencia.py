@@ -0,0 +1,153 @@
+"""💰 Inteligência de Compras (Histórico)"""
+import streamlit as st
+import plotly.express as px
+from nucleo.util import filtrar_dados_inteligente
+from nucleo.estoque import carregar_historico, salvar_estoque, salvar_historico
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("💰 Inteligência de Compras")
+    incluir_arquivo = st.checkbox("🗄️ Incluir anos arquivados", value=False, help="Lê também as abas anuais do arquivo (mais lento). Linhas arquivadas são só para consulta: alterações nelas não são gravadas.")
+    df_hist = carregar_historico(prefixo, incluir_arquivo=incluir_arquivo)
+    
+    tab_graf, tab_dados = st.tabs(["📊 Análise & Gráficos", "📜 Histórico Completo (Editar)"])
+    
+    with tab_graf:
+        if df_hist.empty:
+            st.info("Sem histórico suficiente.")
+        else:
+            st.markdown("### 🔍 Análise Detalhada por Produto")
+            df_hist['produto_str'] = df_hist['produto'].astype(str)
+            if not df.empty:
+                mapa_codigos = dict(zip(df['nome do produto'], df['código de barras']))
+                df_hist['display_combo'] = df_hist['produto_str'].map(mapa_codigos).fillna('?') + " - " + df_hist['produto_str']
+            else:
+                df_hist['display_combo'] = df_hist['produto_str']
+
+            lista_prods_hist = sorted(df_hist['display_combo'].unique())
+            prod_sel_graf_raw = st.selectbox("Selecione um Produto para analisar:", lista_prods_hist)
+            
+            if prod_sel_graf_raw:
+                if " - " in prod_sel_graf_raw:
+                    nome_para_filtro = prod_sel_graf_raw.split(" - ", 1)[1]
+                else:
+                    nome_para_filtro = prod_sel_graf_raw
+
+                df_prod = df_hist[df_hist['produto'] == nome_para_filtro].copy()
+                
+                if not df_prod.empty:
+                    # --- MELHORIA: FILTRAR ZEROS PARA NÃO SUJAR O GRÁFICO ---
+                    df_validos = df_prod[df_prod['preco_pago'] > 0.01]
+                    if df_validos.empty: df_validos = df_prod 
+
+                    menor_preco = df_validos['preco_pago'].min()
+                    maior_preco = df_validos['preco_pago'].max()
+                    media_preco = df_validos['preco_pago'].mean()
+                    ultimo_preco = df_validos.sort_values(by='data', ascending=False).iloc[0]['preco_pago']
+                    
+                    c1, c2, c3, c4 = st.columns(4)
+                    c1.metric("💎 Menor Preço", f"R$ {menor_preco:.2f}")
+                    c2.metric("💸 Maior Preço", f"R$ {maior_preco:.2f}")
+                    c3.metric("📊 Média", f"R$ {media_preco:.2f}")
+                    c4.metric("📅 Último Pago", f"R$ {ultimo_preco:.2f}", delta=f"{ultimo_preco - media_preco:.2f}")
+                    st.divider()
+
+                    st.markdown("### 🏆 Ranking: Onde comprar mais barato?")
+                    df_ranking = df_validos.groupby('fornecedor')['preco_pago'].mean().reset_index().sort_values(by='preco_pago')
+                    fig_bar = px.bar(
+                        df_ranking, 
+                        x='preco_pago', 
+                        y='fornecedor', 
+                        orientation='h', 
+                        text_auto='.2f',
+                        title="Preço Médio por Fornecedor (Quanto menor, melhor)",
+                        color='preco_pago',
+                        color_continuous_scale='RdYlGn_r' 
+                    )
+                    st.plotly_chart(fig_bar, use_container_width=True)
+
+                    st.markdown("### 📈 Evolução do Preço no Tempo")
+                    df_evolucao = df_validos.sort_values(by='data')
+                    fig_line = px.line(
+                        df_evolucao, 
+                        x='data', 
+                        y='preco_pago', 
+                        markers=True,
+                        title="Histórico de Preço Pago",
+                        hover_data={'fornecedor': True, 'preco_pago': ':.2f'}
+                    )
+                    st.plotly_chart(fig_line, use_container_width=True)
+    
+    with tab_dados:
+        if not df_hist.empty:
+            busca_hist_precos = st.text_input("🔍 Buscar no Histórico:", placeholder="Digite o nome, fornecedor...", key="busca_hist_precos")
+            df_hist_visual = df_hist.copy()
+            if busca_hist_precos:
+                df_hist_visual = filtrar_dados_inteligente(df_hist, 'produto', busca_hist_precos)
+                if df_hist_visual.empty: 
+                    df_hist_visual = filtrar_dados_inteligente(df_hist, 'fornecedor', busca_hist_precos)
+            
+            mapa_ean = dict(zip(df['nome do produto'], df['código de barras']))
+            df_hist_visual['código_barras'] = df_hist_visual['produto'].map(mapa_ean)
+            
+            cols = ['data', 'data_emissao', 'código_barras', 'produto', 'fornecedor', 'qtd', 'preco_sem_desconto', 'desconto_total_money', 'preco_pago', 'total_gasto', 'obs_importacao']
+            cols = [c for c in cols if c in df_hist_visual.columns]
+            df_hist_visual = df_hist_visual[cols]
+            
+            st.info("✅ Edite ou exclua (Delete) linhas.")
+            
+            estornar_estoque = st.checkbox("⚠️ Ao excluir uma linha, deseja ESTORNAR (Remover) a quantidade do Estoque Físico? (Cuidado!)", value=False)
+            
+            df_editado = st.data_editor(
+                df_hist_visual.sort_values(by='data', ascending=False), 
+                use_container_width=True, 
+                key="editor_historico_geral",
+                num_rows="dynamic", 
+                column_config={
+                    "data": st.column_config.DatetimeColumn("Data Lançamento", format="DD/MM/YYYY HH:mm"),
+                    "data_emissao": st.column_config.TextColumn("Data Nota (XML)", disabled=True),
+                    "código_barras": st.column_config.TextColumn("Cód. Barras", disabled=True),
+                    "preco_sem_desconto": st.column_config.NumberColumn("Preço Tabela", format="R$ %.2f"),
+                    "desconto_total_money": st.column_config.NumberColumn("Desconto TOTAL", format="R$ %.2f"),
+                    "preco_pago": st.column_config.NumberColumn("Pago (Unit)", format="R$ %.2f", disabled=True),
+                    "total_gasto": st.column_config.NumberColumn("Total Gasto", format="R$ %.2f", disabled=True),
+                }
+            )
+            if st.button("💾 Salvar Alterações e Exclusões"):
+                indices_originais = df_hist_visual.index.tolist()
+                indices_editados = df_editado.index.tolist()
+                indices_removidos = list(set(indices_originais) - set(indices_editados))
+                
+                if indices_removidos:
+                    if estornar_estoque:
+                        for idx_rem in indices_removidos:
+                            nome_prod = df_hist.loc[idx_rem, 'produto']
+                            qtd_rem = float(df_hist.loc[idx_rem, 'qtd'])
+                            
+                            mask_est = df['nome do produto'] == nome_prod
+                            if mask_est.any():
+                                idx_est = df[mask_est].index[0]
+                                df.at[idx_est, 'qtd_central'] -= qtd_rem 
+                                st.toast(f"Estornado {qtd_rem} de {nome_prod}")
+                        salvar_estoque(df, prefixo)
+                    
+                    df_hist = df_hist.drop(indices_removidos)
+                    st.warning(f"🗑️ {len(indices_removidos)} registros excluídos.")
+                
+                if 'código_barras' in df_editado.columns:
+                    df_editado = df_editado.drop(columns=['código_barras'])
+                
+                df_hist.update(df_editado)
+                for idx, row in df_hist.iterrows():
+                    try:
+                        q = float(row.get('qtd', 0))
+                        p_tab = float(row.get('preco_sem_desconto', 0))
+                        d_tot = float(row.get('desconto_total_money', 0))
+                        if q > 0 and p_tab > 0:
+                            total_liq = (p_tab * q) - d_tot
+                            df_hist.at[idx, 'preco_pago'] = total_liq / q
+                            df_hist.at[idx, 'total_gasto'] = total_liq
+                    except: pass
+                salvar_historico(df_hist, prefixo)
+                st.success("Histórico salvo!")
+                st.rerun()
+        else: st.info("Sem histórico.")
@@ -0,0 +1,182 @@
+"""📝 Lista de Compras (Planejamento)"""
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from io import BytesIO
+from nucleo.util import filtrar_dados_inteligente, formatar_moeda_br, obter_hora_manaus
+from nucleo.estoque import carregar_historico, carregar_lista_compras, salvar_lista_compras
+from nucleo.compras import otimizar_pedido_compras
+from nucleo.reposicao import lista_reposicao
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("📝 Planejamento de Compras")
+    df_lista_compras = carregar_lista_compras(prefixo)
+    
+    tab_lista, tab_add, tab_otimizar = st.tabs(["📋 Ver Lista Atual (Editável)", "➕ Adicionar Itens", "🧮 Otimizar Pedido (Por Fornecedor)"])
+    with tab_lista:
+        if not df_lista_compras.empty:
+            df_lista_compras = df_lista_compras.reset_index(drop=True)
+            
+            busca_lista = st.text_input("🔍 Buscar na Lista:", placeholder="Ex: arroz...")
+            df_lista_show = filtrar_dados_inteligente(df_lista_compras, 'produto', busca_lista)
+
+            st.warning("⚠️ Atenção: Ao excluir ou editar itens na tabela, você DEVE clicar no botão 'SALVAR ALTERAÇÕES' abaixo para gravar.")
+            
+            df_edit_lista = st.data_editor(
+                df_lista_show,
+                use_container_width=True,
+                num_rows="dynamic",
+                key="editor_lista_compras",
+                column_config={
+                    "status": st.column_config.SelectboxColumn("Status", options=["A Comprar", "Comprado", "Cancelado", "Manual"]),
+                    "qtd_sugerida": st.column_config.NumberColumn("Qtd", min_value=0),
+                    "código_barras": st.column_config.TextColumn("Código", disabled=True),
+                }
+            )
+
+            if st.button("💾 SALVAR ALTERAÇÕES DA LISTA"):
+                if not busca_lista:
+                    df_lista_compras = df_edit_lista.copy()
+                else:
+                    indices_originais = df_lista_show.index.tolist()
+                    indices_editados = df_edit_lista.index.tolist()
+                    removidos = list(set(indices_originais) - set(indices_editados))
+                    
+                    if removidos:
+                        df_lista_compras = df_lista_compras.drop(removidos)
+                    
+                    df_lista_compras.update(df_edit_lista)
+                
+                salvar_lista_compras(df_lista_compras, prefixo)
+                st.success("Lista atualizada com sucesso!")
+                st.rerun()
+        else:
+            st.info("Sua lista de compras está vazia.")
+
+    with tab_add:
+        st.subheader("🤖 Gerador Automático (Somente Ativos)")
+        # Lista de reposição já pronta (mantida a cada mudança de estoque): nada de varrer o catálogo aqui
+        df_reposicao = lista_reposicao(df, prefixo)
+        if not df_reposicao.empty:
+            with st.expander(f"🔔 Lista de Reposição ({len(df_reposicao)} produtos)"):
+                st.dataframe(df_reposicao, use_container_width=True, hide_index=True)
+                st.download_button(label="📥 BAIXAR LISTA DE REPOSIÇÃO (CSV)", data=df_reposicao.to_csv(index=False).encode('utf-8'), file_name=f"reposicao_{prefixo}_{obter_hora_manaus().strftime('%Y%m%d_%H%M')}.csv", mime="text/csv")
+        if st.button("🚀 Gerar Lista Baseada no Estoque Baixo"):
+            if df.empty: st.warning("Sem produtos.")
+            else:
+                if df_reposicao.empty: st.success("Tudo certo! Nenhum produto ativo com estoque baixo.")
+                else:
+                    ja_na_lista = set(df_lista_compras['produto'].astype(str)) if not df_lista_compras.empty else set()
+                    agora_txt = obter_hora_manaus().strftime("%d/%m/%Y %H:%M")
+                    novos_itens = [{'produto': item['produto'], 'código_barras': item['código de barras'], 'qtd_sugerida': item['qtd_minima'] * 3, 'fornecedor': item['fornecedor'], 'custo_previsto': item['preco_custo'], 'data_inclusao': agora_txt, 'status': 'A Comprar'}
+                                   for item in df_reposicao.to_dict('records') if str(item['produto']) not in ja_na_lista]
+                    if novos_itens:
+                        df_lista_compras = pd.concat([df_lista_compras, pd.DataFrame(novos_itens)], ignore_index=True)
+                        salvar_lista_compras(df_lista_compras, prefixo)
+                        st.success(f"{len(novos_itens)} itens adicionados!")
+                        st.rerun()
+                    else: st.warning("Itens já na lista.")
+        st.divider()
+        
+        st.subheader("✋ Adicionar Manualmente")
+        lista_visuais = sorted((df['código de barras'].astype(str) + " - " + df['nome do produto'].astype(str)).unique().tolist())
+        prod_man_visual = st.selectbox("Produto:", [""] + lista_visuais, key="sel_prod_lista")
+        
+        if prod_man_visual:
+            try:
+                parts = prod_man_visual.split(' - ', 1)
+                cod_sel = parts[0]
+                mask_sel = df['código de barras'] == cod_sel
+                if mask_sel.any():
+                    q_loja = int(df.loc[mask_sel, 'qtd.estoque'].values[0])
+                    q_casa = int(df.loc[mask_sel, 'qtd_central'].values[0])
+                    st.info(f"ℹ️ Posição Atual: 📦 Loja: {q_loja} | 🏡 Casa: {q_casa}")
+            except: pass
+
+        with st.form("add_manual_lista"):
+            c_qtd, c_forn = st.columns(2)
+            qtd_man = c_qtd.number_input("Qtd a Comprar:", min_value=1, value=10)
+            obs_man = c_forn.text_input("Fornecedor (Opcional):", placeholder="Ex: Atacadão")
+            
+            c_dt, c_hr = st.columns(2)
+            if 'hora_lista_fixa' not in st.session_state:
+                st.session_state['hora_lista_fixa'] = obter_hora_manaus().time().replace(second=0, microsecond=0)
+            
+            dt_manual = c_dt.date_input("Data da Inclusão:", value=obter_hora_manaus().date())
+            hr_manual = c_hr.time_input("Hora da Inclusão:", value=st.session_state['hora_lista_fixa'], step=60)
+            
+            if st.form_submit_button("Adicionar à Lista"):
+                if prod_man_visual:
+                    try:
+                        parts = prod_man_visual.split(' - ', 1)
+                        cod = parts[0]; nome = parts[1]
+                    except: cod = ""; nome = prod_man_visual
+                    
+                    data_final = datetime.combine(dt_manual, hr_manual).strftime("%d/%m/%Y %H:%M")
+                    
+                    novo_item = {
+                        'produto': nome, 
+                        'código_barras': cod, 
+                        'qtd_sugerida': qtd_man, 
+                        'fornecedor': obs_man, 
+                        'custo_previsto': 0.0, 
+                        'data_inclusao': data_final, 
+                        'status': 'Manual'
+                    }
+                    df_lista_compras = pd.concat([df_lista_compras, pd.DataFrame([novo_item])], ignore_index=True)
+                    salvar_lista_compras(df_lista_compras, prefixo)
+                    st.success("Adicionado!")
+                    st.rerun()
+                else:
+                    st.error("Selecione um produto.")
+
+    with tab_otimizar:
+        st.subheader("🧮 Fornecedor Mais Barato por Item")
+        st.caption("Usa o último preço pago a cada fornecedor no Histórico de Compras para sugerir onde comprar cada item.")
+        dias_janela = st.number_input("Considerar preços dos últimos (dias):", min_value=7, max_value=730, value=90, step=7)
+        if df_lista_compras.empty:
+            st.info("Sua lista de compras está vazia.")
+        else:
+            df_itens_otim, df_pedidos = otimizar_pedido_compras(df_lista_compras, carregar_historico(prefixo), dias_janela)
+            if df_itens_otim.empty:
+                st.info("Nenhum item 'A Comprar' ou 'Manual' na lista.")
+            else:
+                c1, c2, c3 = st.columns(3)
+                c1.metric("💸 Total Atual", f"R$ {formatar_moeda_br(df_itens_otim['total_atual'].sum())}")
+                c2.metric("💎 Total Otimizado", f"R$ {formatar_moeda_br(df_itens_otim['total_otimizado'].sum())}")
+                c3.metric("🏆 Economia Estimada", f"R$ {formatar_moeda_br(df_itens_otim['economia'].sum())}")
+
+                st.markdown("### 📦 Pedidos por Fornecedor")
+                st.dataframe(df_pedidos, use_container_width=True, hide_index=True, column_config={
+                    "total_atual": st.column_config.NumberColumn("Total Atual", format="R$ %.2f"),
+                    "total_otimizado": st.column_config.NumberColumn("Total Otimizado", format="R$ %.2f"),
+                    "economia": st.column_config.NumberColumn("Economia", format="R$ %.2f"),
+                })
+                cols_pedido = ['produto', 'código_barras', 'qtd_sugerida', 'fornecedor', 'custo_atual_un', 'preco_sugerido', 'total_otimizado', 'economia']
+                cols_pedido = [c for c in cols_pedido if c in df_itens_otim.columns]
+                for forn, df_forn in df_itens_otim.groupby('fornecedor_sugerido'):
+                    with st.expander(f"🚚 {forn} ({len(df_forn)} itens | R$ {formatar_moeda_br(df_forn['total_otimizado'].sum())})"):
+                        st.dataframe(df_forn[cols_pedido], use_container_width=True, hide_index=True)
+
+                c_apl, c_exp = st.columns(2)
+                with c_apl:
+                    if st.button("✅ APLICAR FORNECEDORES SUGERIDOS NA LISTA"):
+                        mapa_forn = dict(zip(df_itens_otim['produto'], df_itens_otim['fornecedor_sugerido']))
+                        mapa_custo = dict(zip(df_itens_otim['produto'], df_itens_otim['preco_sugerido']))
+                        mask_apl = df_lista_compras['produto'].isin(mapa_forn.keys()) & df_lista_compras['status'].isin(['A Comprar', 'Manual'])
+                        df_lista_compras.loc[mask_apl, 'fornecedor'] = df_lista_compras.loc[mask_apl, 'produto'].map(mapa_forn)
+                        df_lista_compras.loc[mask_apl, 'custo_previsto'] = df_lista_compras.loc[mask_apl, 'produto'].map(mapa_custo)
+                        salvar_lista_compras(df_lista_compras, prefixo)
+                        st.success(f"{int(mask_apl.sum())} itens atualizados!")
+                        st.rerun()
+                with c_exp:
+                    buffer = BytesIO()
+                    with pd.ExcelWriter(buffer) as writer:
+                        df_pedidos.to_excel(writer, sheet_name="Resumo", index=False)
+                        abas_usadas = {"Resumo"}
+                        for n, (forn, df_forn) in enumerate(df_itens_otim.groupby('fornecedor_sugerido')):
+                            nome_aba = "".join(ch for ch in str(forn) if ch not in '[]:*?/\\')[:28] or "Fornecedor"
+                            if nome_aba in abas_usadas: nome_aba = f"{nome_aba}_{n}"
+                            abas_usadas.add(nome_aba)
+                            df_forn[cols_pedido].to_excel(writer, sheet_name=nome_aba, index=False)
+                    st.download_button(label="📥 BAIXAR PEDIDOS (Excel)", data=buffer.getvalue(), file_name=f"pedidos_{prefixo}_{datetime.now().strftime('%Y%m%d')}.xlsx", mime="application/vnd.ms-excel")
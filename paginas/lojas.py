@@ -0,0 +1,35 @@
+"""🏬 Cadastro de Lojas"""
+import streamlit as st
+from nucleo.lojas import carregar_cadastro_lojas, salvar_cadastro_lojas
+from nucleo.esquema import preparar_esquema
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("🏬 Cadastro de Lojas")
+    st.info("Cada linha é uma loja. O prefixo é o começo das abas dela (ex.: loja4 → loja4_estoque), só com letras minúsculas e números, e não deve mudar depois de criado. "
+            "Planilha vazia = planilha principal; preenchida = as abas da loja ficam nessa planilha (compartilhe-a com a conta de serviço).")
+    df_lojas = carregar_cadastro_lojas()
+    df_edit = st.data_editor(
+        df_lojas, use_container_width=True, num_rows="dynamic", key="editor_lojas",
+        column_config={
+            "prefixo": st.column_config.TextColumn("Prefixo", required=True),
+            "nome": st.column_config.TextColumn("Nome no Menu"),
+            "planilha": st.column_config.TextColumn("Planilha Própria (opcional)"),
+            "ativa": st.column_config.SelectboxColumn("Ativa", options=["Sim", "Não"]),
+            "ordem": st.column_config.NumberColumn("Ordem", min_value=1, step=1),
+        }
+    )
+    if st.button("💾 SALVAR CADASTRO DE LOJAS"):
+        if df_edit['prefixo'].fillna("").astype(str).str.strip().eq("").all():
+            st.error("O cadastro precisa de pelo menos uma loja.")
+            return
+        try:
+            salvar_cadastro_lojas(df_edit, ja_cadastrados=df_lojas['prefixo'])
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        # Lojas novas já ganham as abas com cabeçalho (o esquema é conferido uma vez por processo e loja)
+        df_novo = carregar_cadastro_lojas()
+        for prefixo_loja in set(df_novo['prefixo']) - set(df_lojas['prefixo']):
+            preparar_esquema(prefixo_loja)
+        st.success("Cadastro salvo! O menu de lojas já usa a nova lista.")
+        st.rerun()
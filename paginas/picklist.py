@@ -0,0 +1,47 @@
+"""🚚 Transferência em Massa (Picklist)"""
+import streamlit as st
+import pandas as pd
+from nucleo.arquivos import ler_planilha_upload
+from nucleo.estoque import aplicar_picklist, atualizar_casa_global_em_lote, carregar_movimentacoes, falhas_da_propagacao, salvar_estoque, salvar_logs_em_lote, salvar_movimentacoes
+from nucleo.lotes import transferir_lotes
+from nucleo.reposicao import rotulos_dos_produtos
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"🚚 Transferência em Massa - {loja_atual}")
+    df_mov = carregar_movimentacoes(prefixo)
+    
+    arquivos_pick = st.file_uploader("📂 Subir Picklist (.xlsx)", type=['xlsx', 'xls'], accept_multiple_files=True)
+    if arquivos_pick:
+        try:
+            lista_dfs = []
+            st.info(f"📂 {len(arquivos_pick)} arquivos carregados.")
+            primeiro_arquivo = arquivos_pick[0]
+            df_temp_raw = ler_planilha_upload(primeiro_arquivo, header=None, nrows=5)
+            st.dataframe(df_temp_raw)
+            linha_cabecalho = st.number_input("Em qual linha estão os títulos?", min_value=0, value=0)
+            for arq in arquivos_pick:
+                lista_dfs.append(ler_planilha_upload(arq, header=linha_cabecalho))
+            df_pick = pd.concat(lista_dfs, ignore_index=True)
+            cols = df_pick.columns.tolist()
+            st.markdown("---")
+            c1, c2 = st.columns(2)
+            col_barras = c1.selectbox("Selecione a coluna de CÓDIGO DE BARRAS:", cols)
+            col_qtd = c2.selectbox("Selecione a coluna de QUANTIDADE:", cols)
+            
+            if st.button("🚀 PROCESSAR TRANSFERÊNCIA EM LOTE"):
+                bar = st.progress(0)
+                movidos, erros, log_movs, log_auditoria_buffer, atualizacoes_casa_global = aplicar_picklist(df, df_pick, col_barras, col_qtd, bar.progress)
+                
+                salvar_estoque(df, prefixo, alterados=rotulos_dos_produtos(df, [m['produto'] for m in log_movs]))
+                if log_movs:
+                    df_mov = pd.concat([df_mov, pd.DataFrame(log_movs)], ignore_index=True)
+                    salvar_movimentacoes(df_mov, prefixo)
+                    transferir_lotes(prefixo, df, [m['produto'] for m in log_movs], [m['qtd_movida'] for m in log_movs])  # FEFO na Casa
+                
+                salvar_logs_em_lote(prefixo, log_auditoria_buffer)
+                falhas = falhas_da_propagacao(atualizar_casa_global_em_lote(atualizacoes_casa_global, prefixo))
+                
+                st.success(f"✅ {movidos} produtos transferidos!")
+                if falhas: st.warning(f"⚠️ Casa não atualizada em: {falhas}")
+                if erros > 0: st.warning(f"⚠️ {erros} produtos não encontrados.")
+        except Exception as e: st.error(f"Erro ao ler arquivo: {e}")
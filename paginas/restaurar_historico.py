@@ -0,0 +1,53 @@
+"""♻️ Restaurar Histórico"""
+import streamlit as st
+import time
+from nucleo.estoque import carregar_historico
+from nucleo.backup import restaurar_historico_por_hash
+
+# ==============================================================================
+# ♻️ NOVA FERRAMENTA: RESTAURAR HISTÓRICO (AGORA COM SUBSTITUIÇÃO)
+# ==============================================================================
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("♻️ Restaurador Inteligente de Histórico")
+    st.info("Use para corrigir históricos corrompidos ou limpar dados duplicados.")
+
+    df_atual = carregar_historico(prefixo)
+    st.write(f"📊 Linhas atualmente no sistema (Nuvem): **{len(df_atual)}**")
+
+    st.divider()
+    st.markdown("### 1. Upload do Backup")
+    st.markdown("Suba o arquivo Excel/CSV (ou o ZIP do Backup da Nuvem) que você tem na Área de Trabalho.")
+    arquivos_backup = st.file_uploader("📂 Arraste o arquivo aqui:", accept_multiple_files=True)
+    
+    st.markdown("### 2. Modo de Recuperação")
+    modo_recup = st.radio("O que deseja fazer?", 
+        ["🔗 UNIFICAR (Juntar Backup + Atual)", "☢️ SUBSTITUIÇÃO TOTAL (Apagar Atual e por Backup)"],
+        index=0
+    )
+    
+    if modo_recup == "☢️ SUBSTITUIÇÃO TOTAL (Apagar Atual e por Backup)":
+        st.error("⚠️ CUIDADO: Isso vai apagar tudo que está no histórico hoje e colocar o conteúdo do arquivo no lugar. Use se o histórico atual estiver 'sujo' ou corrompido.")
+
+    if arquivos_backup and st.button("🚀 EXECUTAR RECUPERAÇÃO"):
+        # Se for substituir, a aba é reescrita só com os backups. Se for unificar, só as linhas inéditas são anexadas.
+        try:
+            with st.spinner("Lendo backups em blocos e comparando por hash..."):
+                stats = restaurar_historico_por_hash(
+                    prefixo, arquivos_backup, substituir=modo_recup.startswith("☢️"),
+                    ao_ler_arquivo=lambda nome, linhas: st.caption(f"✅ Lido: {nome} ({linhas} linhas)")
+                )
+            if stats['novas'] > 0:
+                st.success("✅ Histórico Restaurado e Salvo no Google Sheets!")
+            else:
+                st.info("Nada novo: todas as linhas dos backups já estão no histórico.")
+            st.metric("Linhas Lidas (Backups)", stats['lidas'])
+            st.metric("Duplicatas Ignoradas", stats['duplicadas'], delta_color="inverse")
+            st.metric("Linhas Novas Gravadas", stats['novas'])
+            if stats['novas'] > 0:
+                st.balloons()
+                time.sleep(2)
+                st.rerun()
+        except ValueError as e:
+            st.error(f"As planilhas não têm as colunas padrão (data, produto, qtd). Verifique os arquivos. ({e})")
+        except Exception as e:
+            st.error(f"Erro na recuperação: {e}")
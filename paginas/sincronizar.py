@@ -0,0 +1,27 @@
+"""🔄 Sincronizar (Planograma)"""
+import streamlit as st
+from nucleo.arquivos import ler_planilha_upload
+from nucleo.estoque import carregar_dados, salvar_estoque, salvar_logs_em_lote, sincronizar_planograma
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title(f"🔄 Sincronizar - {loja_atual}")
+    arquivo = st.file_uploader("📂 Planograma", type=['xlsx', 'xls', 'csv'])
+    if arquivo:
+        try:
+            df_raw = ler_planilha_upload(arquivo, header=None)
+            cols = df_raw.columns.tolist()
+            c1, c2, c3, c4 = st.columns(4)
+            idx_barras = c1.selectbox("CÓDIGO BARRAS", cols, index=0)
+            idx_nome = c2.selectbox("NOME", cols, index=1)
+            idx_qtd = c3.selectbox("QUANTIDADE", cols, index=len(cols)-1)
+            idx_preco = c4.selectbox("PREÇO VENDA", ["(Ignorar)"] + cols)
+            
+            if st.button("🚀 SINCRONIZAR TUDO"):
+                df = carregar_dados(prefixo)
+                bar = st.progress(0)
+                df, logs_plano = sincronizar_planograma(df, df_raw, idx_barras, idx_nome, idx_qtd, idx_preco, bar.progress)
+                salvar_estoque(df, prefixo)
+                salvar_logs_em_lote(prefixo, logs_plano) 
+                st.success("Sincronizado!")
+                st.rerun()
+        except Exception as e: st.error(f"Erro: {e}")
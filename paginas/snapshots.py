@@ -0,0 +1,40 @@
+"""🕰️ Snapshots (Ponto no Tempo)"""
+import streamlit as st
+import pandas as pd
+import os
+from nucleo.planilha import salvar_no_google
+from nucleo.esquema import completar_colunas_do_esquema
+from nucleo.backup import PASTA_SNAPSHOTS, exportar_mudancas_snapshot_zip, ler_indice_snapshots, listar_carimbos_snapshot, restaurar_snapshot
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("🕰️ Snapshots Incrementais")
+    st.info("Cada snapshot guarda só o que mudou desde o anterior. Daqui dá para exportar as mudanças ou remontar qualquer aba em qualquer ponto no tempo.")
+
+    abas_com_snapshot = sorted(os.listdir(PASTA_SNAPSHOTS)) if os.path.isdir(PASTA_SNAPSHOTS) else []
+    if not abas_com_snapshot:
+        st.warning("Nenhum snapshot ainda. Use o botão '📸 Snapshot Incremental Agora' na barra lateral.")
+    else:
+        tab_exp, tab_rest = st.tabs(["📤 Exportar Mudanças", "⏪ Restaurar Ponto no Tempo"])
+        with tab_exp:
+            todos_carimbos = sorted({c for aba in abas_com_snapshot for c in listar_carimbos_snapshot(aba)}, reverse=True)
+            carimbo_exp = st.selectbox("Snapshot:", todos_carimbos, key="carimbo_exp")
+            if carimbo_exp:
+                resumo = [{'aba': aba, **s_} for aba in abas_com_snapshot for s_ in ler_indice_snapshots(aba) if s_['carimbo'] == carimbo_exp]
+                st.dataframe(pd.DataFrame(resumo)[['aba', 'linhas', 'novas']], use_container_width=True, hide_index=True)
+                st.download_button(label="📥 BAIXAR SÓ AS MUDANÇAS (ZIP)", data=exportar_mudancas_snapshot_zip(carimbo_exp).getvalue(), file_name=f"mudancas_{carimbo_exp}.zip", mime="application/zip")
+        with tab_rest:
+            aba_rest = st.selectbox("Aba:", abas_com_snapshot, key="aba_rest")
+            carimbos_aba = list(reversed(listar_carimbos_snapshot(aba_rest)))
+            carimbo_rest = st.selectbox("Estado em:", carimbos_aba, key="carimbo_rest")
+            if carimbo_rest:
+                df_ponto = restaurar_snapshot(aba_rest, carimbo_rest)
+                st.write(f"📊 Linhas nesse ponto no tempo: **{len(df_ponto)}**")
+                st.dataframe(df_ponto.head(200), use_container_width=True)
+                c_baixar, c_nuvem = st.columns(2)
+                c_baixar.download_button(label="📥 BAIXAR CSV", data=df_ponto.to_csv(index=False).encode('utf-8'), file_name=f"{aba_rest}_{carimbo_rest}.csv", mime="text/csv")
+                with c_nuvem:
+                    st.error("⚠️ Restaurar substitui a aba inteira na nuvem pelo estado escolhido.")
+                    if st.checkbox("Entendo, quero restaurar esta aba.", key="conf_rest_snap") and st.button("⏪ RESTAURAR NA NUVEM"):
+                        # Snapshot de antes de uma migração: a aba volta com as colunas que o app espera hoje
+                        salvar_no_google(completar_colunas_do_esquema(df_ponto, aba_rest), aba_rest, permitir_vazio=True)
+                        st.success(f"✅ {aba_rest} restaurada para {carimbo_rest}!")
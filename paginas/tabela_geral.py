@@ -0,0 +1,57 @@
+"""📋 Tabela Geral"""
+import streamlit as st
+from nucleo.util import filtrar_dados_inteligente
+from nucleo.estoque import atualizar_casa_global, registrar_auditoria, salvar_estoque, unificar_produtos_por_codigo
+
+def mostrar(df, prefixo, loja_atual, usar_modo_mobile):
+    st.title("📋 Geral")
+    if not df.empty:
+        st.info("💡 Botão 'CORRIGIR E UNIFICAR' abaixo ajuda a remover duplicados.")
+        busca_geral = st.text_input("🔍 Buscar na Tabela Geral:", placeholder="Ex: oleo concordia...", key="busca_geral")
+        df_visual_geral = filtrar_dados_inteligente(df, 'nome do produto', busca_geral)
+        
+        df_edit = st.data_editor(
+            df_visual_geral, 
+            use_container_width=True, 
+            num_rows="dynamic", 
+            key="geral_editor",
+            column_config={
+                "status": st.column_config.SelectboxColumn("Status", options=["Ativo", "Inativo"], help="Defina se o produto está ativo para compras.")
+            }
+        )
+        c1, c2 = st.columns(2)
+        with c1:
+            if st.button("💾 SALVAR ALTERAÇÕES GERAIS"):
+                indices_originais = df_visual_geral.index.tolist()
+                indices_editados = df_edit.index.tolist()
+                indices_removidos = list(set(indices_originais) - set(indices_editados))
+                if indices_removidos:
+                    df = df.drop(indices_removidos)
+                    st.warning(f"🗑️ {len(indices_removidos)} produtos excluídos.")
+                df.update(df_edit)
+                salvar_estoque(df, prefixo)
+                
+                bar = st.progress(0)
+                total = len(df_edit)
+                for i, (idx, row) in enumerate(df_edit.iterrows()):
+                    nome = df.at[idx, 'nome do produto']
+                    qtd = df.at[idx, 'qtd_central']
+                    custo = df.at[idx, 'preco_custo']
+                    venda = df.at[idx, 'preco_venda']
+                    val = df.at[idx, 'validade']
+                    atualizar_casa_global(nome, qtd, custo, venda, val, prefixo)
+                    bar.progress((i+1)/total)
+                registrar_auditoria(prefixo, "Vários", 0, 0, "Edição Tabela Geral")
+                st.success("Tabela Geral atualizada!")
+                st.rerun()
+        with c2:
+            if st.button("🔮 CORRIGIR NOMES E UNIFICAR (Pelo Código)"):
+                df.update(df_edit)
+                qtd_antes = len(df)
+                df, relatorio_unif = unificar_produtos_por_codigo(df, retornar_relatorio=True)
+                qtd_depois = len(df)
+                salvar_estoque(df, prefixo)
+                st.session_state['df_ativo'] = df
+                st.success(f"✅ Mágica feita! {qtd_antes - qtd_depois} duplicados unidos.")
+                if not relatorio_unif.empty: st.dataframe(relatorio_unif, use_container_width=True, hide_index=True)
+                st.balloons()
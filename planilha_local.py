@@ -0,0 +1,181 @@
+"""
+Planilha local compatível com o pedaço do gspread que o app usa.
+
+Cada aba é um CSV dentro de uma pasta. Serve para rodar o app e os benchmarks sem
+credenciais do Google: defina PLANILHA_LOCAL=<pasta> e, opcionalmente,
+PLANILHA_LOCAL_LATENCIA_MS=<ms> para simular o tempo de ida e volta de cada chamada.
+Se a pasta tiver um <aba>.xlsx (ex.: as exportações loja1_*.xlsx) e ainda não tiver o
+<aba>.csv, a aba é importada do Excel no primeiro acesso.
+"""
+import os
+import csv
+import re
+import time
+import threading
+
+import gspread
+
+
+def coluna_para_numero(letras):
+    numero = 0
+    for letra in letras.upper():
+        numero = numero * 26 + (ord(letra) - ord('A') + 1)
+    return numero
+
+
+def intervalo_a1(intervalo):
+    """'A5:D' -> (linha_ini, col_ini, linha_fim, col_fim), 1-based; None = sem limite."""
+    partes = intervalo.split('!')[-1].split(':')
+    limites = []
+    for parte in partes:
+        m = re.fullmatch(r'([A-Za-z]*)(\d*)', parte.strip())
+        letras, digitos = m.groups()
+        limites.append((int(digitos) if digitos else None, coluna_para_numero(letras) if letras else None))
+    (l1, c1), (l2, c2) = limites[0], limites[-1]
+    return l1 or 1, c1 or 1, l2, c2
+
+
+class AbaLocal:
+    def __init__(self, planilha, titulo):
+        self.planilha = planilha
+        self.title = titulo
+        self.caminho = os.path.join(planilha.pasta, f"{titulo}.csv")
+
+    def ler(self):
+        if not os.path.exists(self.caminho): return []
+        with open(self.caminho, newline='', encoding='utf-8') as f:
+            return [linha for linha in csv.reader(f)]
+
+    def gravar(self, linhas):
+        with open(self.caminho + ".tmp", "w", newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(linhas)
+        os.replace(self.caminho + ".tmp", self.caminho)
+
+    @property
+    def row_count(self):
+        return len(self.ler())
+
+    @property
+    def col_count(self):
+        return max((len(l) for l in self.ler()), default=0)
+
+    def get_all_values(self):
+        self.planilha.chamada()
+        linhas = self.ler()
+        largura = max((len(l) for l in linhas), default=0)
+        return [l + [''] * (largura - len(l)) for l in linhas]
+
+    def row_values(self, linha):
+        self.planilha.chamada()
+        linhas = self.ler()
+        return linhas[linha - 1] if len(linhas) >= linha else []
+
+    def batch_get(self, intervalos):
+        self.planilha.chamada()
+        linhas = self.ler()
+        saida = []
+        for intervalo in intervalos:
+            l1, c1, l2, c2 = intervalo_a1(intervalo)
+            bloco = linhas[l1 - 1:l2]
+            saida.append([l[c1 - 1:c2] for l in bloco])
+        return saida
+
+    @staticmethod
+    def escrever(linhas, l1, c1, valores):
+        for i, nova in enumerate(valores):
+            idx = l1 - 1 + i
+            while len(linhas) <= idx: linhas.append([])
+            atual = linhas[idx]
+            if len(atual) < c1 - 1 + len(nova): atual += [''] * (c1 - 1 + len(nova) - len(atual))
+            atual[c1 - 1:c1 - 1 + len(nova)] = [str(v) for v in nova]
+
+    def update(self, valores=None, range_name=None, values=None, **kwargs):
+        """Aceita update(valores), update(valores, 'A1') e update(range_name=..., values=...)."""
+        self.planilha.chamada()
+        if values is not None: valores = values
+        if isinstance(valores, str): valores, range_name = range_name, valores
+        l1, c1 = intervalo_a1(range_name)[:2] if range_name else (1, 1)
+        with self.planilha.trava:
+            linhas = self.ler()
+            self.escrever(linhas, l1, c1, valores)
+            self.gravar(linhas)
+
+    def batch_update(self, dados, **kwargs):
+        """[{'range': 'B5', 'values': [[...]]}, ...] numa chamada só."""
+        self.planilha.chamada()
+        with self.planilha.trava:
+            linhas = self.ler()
+            for bloco in dados:
+                l1, c1 = intervalo_a1(bloco['range'])[:2]
+                self.escrever(linhas, l1, c1, bloco['values'])
+            self.gravar(linhas)
+
+    def append_rows(self, linhas_novas, **kwargs):
+        self.planilha.chamada()
+        with self.planilha.trava:
+            linhas = self.ler()
+            linhas += [[str(v) for v in l] for l in linhas_novas]
+            self.gravar(linhas)
+
+    def clear(self):
+        self.planilha.chamada()
+        with self.planilha.trava:
+            self.gravar([])
+
+    def batch_clear(self, intervalos):
+        self.planilha.chamada()
+        with self.planilha.trava:
+            linhas = self.ler()
+            for intervalo in intervalos:
+                l1, c1, l2, c2 = intervalo_a1(intervalo)
+                for linha in linhas[l1 - 1:l2]:
+                    for c in range(c1 - 1, min(c2 or len(linha), len(linha))): linha[c] = ''
+            self.gravar(linhas)
+
+    def resize(self, rows=None, cols=None):
+        self.planilha.chamada()
+        with self.planilha.trava:
+            linhas = self.ler()
+            if rows is not None: linhas = linhas[:rows]
+            if cols is not None: linhas = [l[:cols] for l in linhas]
+            self.gravar(linhas)
+
+
+class PlanilhaLocal:
+    def __init__(self, pasta, latencia_ms=0.0):
+        self.pasta = pasta
+        self.latencia_ms = latencia_ms
+        self.chamadas = 0
+        self.trava = threading.Lock()
+        os.makedirs(pasta, exist_ok=True)
+
+    def chamada(self):
+        """Conta a chamada e aplica a latência simulada."""
+        self.chamadas += 1
+        if self.latencia_ms: time.sleep(self.latencia_ms / 1000)
+
+    def worksheet(self, titulo):
+        self.chamada()
+        aba = AbaLocal(self, titulo)
+        if not os.path.exists(aba.caminho):
+            caminho_xlsx = os.path.join(self.pasta, f"{titulo}.xlsx")
+            if not os.path.exists(caminho_xlsx): raise gspread.WorksheetNotFound(titulo)
+            import pandas as pd
+            df = pd.read_excel(caminho_xlsx, dtype=str).fillna("")
+            aba.gravar([df.columns.tolist()] + df.values.tolist())
+        return aba
+
+    def add_worksheet(self, title, rows=1000, cols=20, **kwargs):
+        self.chamada()
+        aba = AbaLocal(self, title)
+        if not os.path.exists(aba.caminho): aba.gravar([])
+        return aba
+
+    def worksheets(self):
+        self.chamada()
+        return [AbaLocal(self, nome[:-4]) for nome in sorted(os.listdir(self.pasta)) if nome.endswith(".csv")]
+
+
+def abrir(pasta, latencia_ms=None):
+    if latencia_ms is None: latencia_ms = float(os.environ.get("PLANILHA_LOCAL_LATENCIA_MS", "0"))
+    return PlanilhaLocal(pasta, latencia_ms)
@@ -0,0 +1,5 @@
+"""Testes das funções puras do núcleo (sem planilha: o que grava/lê a nuvem é trocado por monkeypatch)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
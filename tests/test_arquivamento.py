@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+from nucleo import arquivamento
+
+
+@pytest.fixture
+def nuvem(monkeypatch):
+    """Abas em memória; nomes em `falhar_leitura` levantam na leitura, como um erro da API."""
+    abas, falhar_leitura = {}, set()
+
+    def ler(aba):
+        if aba in falhar_leitura: raise RuntimeError("APIError 500")
+        return abas.get(aba, pd.DataFrame()).copy()
+
+    def anexar(df, aba):
+        abas[aba] = pd.concat([abas.get(aba, pd.DataFrame()), df], ignore_index=True)
+        return True
+
+    def salvar(df, aba, permitir_vazio=False):
+        abas[aba] = df.reset_index(drop=True)
+        return True
+
+    monkeypatch.setattr(arquivamento, "ler_aba_sem_cache", ler)
+    monkeypatch.setattr(arquivamento, "anexar_no_google", anexar)
+    monkeypatch.setattr(arquivamento, "salvar_no_google", salvar)
+    return abas, falhar_leitura
+
+
+VENDAS = pd.DataFrame({'data_hora': ["2020-01-01 10:00:00", "2020-01-01 10:00:00", "2021-05-01 09:00:00", "2099-01-01 00:00:00"],
+                       'produto': ["A", "A", "B", "C"], 'qtd': ["1", "1", "2", "3"]})
+
+
+def test_move_por_ano_e_repetir_nao_duplica(nuvem):
+    abas, _ = nuvem
+    abas["l1_vendas"] = VENDAS
+    assert arquivamento.arquivar_linhas_antigas("l1") == {"l1_vendas": 3}
+    assert abas["l1_vendas"]['produto'].tolist() == ["C"]
+    assert len(abas["l1_vendas_arquivo_2020"]) == 2  # Duas vendas iguais e legítimas
+    # Queda antes de regravar a aba quente: repetir não duplica o arquivo
+    abas["l1_vendas"] = VENDAS
+    arquivamento.arquivar_linhas_antigas("l1")
+    assert len(abas["l1_vendas_arquivo_2020"]) == 2
+    assert len(abas["l1_vendas_arquivo_2021"]) == 1
+
+
+def test_ano_que_nao_le_fica_na_aba_quente(nuvem):
+    abas, falhar_leitura = nuvem
+    abas["l1_vendas"] = VENDAS
+    abas["l1_vendas_arquivo_2020"] = VENDAS.iloc[[0]]
+    falhar_leitura.add("l1_vendas_arquivo_2020")
+    assert arquivamento.arquivar_linhas_antigas("l1") == {"l1_vendas": 1}
+    assert abas["l1_vendas"]['produto'].tolist() == ["A", "A", "C"]
+    assert len(abas["l1_vendas_arquivo_2020"]) == 1  # Não foi sobrescrito
+
+
+def test_aba_quente_que_nao_le_nao_e_tocada(nuvem):
+    abas, falhar_leitura = nuvem
+    abas["l1_vendas"] = VENDAS
+    falhar_leitura.add("l1_vendas")
+    assert arquivamento.arquivar_linhas_antigas("l1") == {}
+    assert len(abas["l1_vendas"]) == 4
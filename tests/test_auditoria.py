@@ -0,0 +1,50 @@
+import pandas as pd
+from nucleo import auditoria
+from nucleo.auditoria import compactar_indice, mes_do_registro, resumir_para_indice
+
+
+def test_mes_do_registro():
+    meses = mes_do_registro(pd.Series(["2024-01-31 23:59:59", "2024-02-01 00:00:00", None]))
+    assert meses.tolist()[:2] == ["2024_01", "2024_02"]
+    assert len(meses.iloc[2]) == 7  # Sem data legível: mês atual
+
+
+def test_indice_compactado_soma_registros():
+    logs = pd.DataFrame({'data_hora': ["2024-01-02 10:00:00", "2024-01-05 09:00:00", "2024-01-03 08:00:00"],
+                         'produto': ["A", "A", "B"], 'acao': ["Venda", "Venda", "Venda"]})
+    logs['mes'] = mes_do_registro(logs['data_hora'])
+    resumo = resumir_para_indice(logs)
+    juntado = compactar_indice(pd.concat([resumo, resumo.iloc[[0]].astype(str)], ignore_index=True))
+    linha_a = juntado.set_index('produto').loc["A"]
+    assert len(juntado) == 2
+    assert (linha_a['registros'], linha_a['primeiro'], linha_a['ultimo']) == (4, "2024-01-02 10:00:00", "2024-01-05 09:00:00")
+
+
+def test_particionar_log_legado_pode_ser_repetido(monkeypatch):
+    abas = {"l1_log_auditoria": pd.DataFrame({'data_hora': ["2024-01-02 10:00:00"] * 2 + ["2024-02-03 09:00:00"],
+                                              'produto': ["A", "A", "B"], 'acao': ["x", "x", "y"]})}
+    falhar = {"l1_log_auditoria_2024_02"}
+
+    def anexar(df, aba):
+        if aba in falhar: return False
+        abas[aba] = pd.concat([abas.get(aba, pd.DataFrame()), df.astype(str)], ignore_index=True)
+        return True
+
+    def salvar(df, aba, permitir_vazio=False):
+        abas[aba] = df
+        return True
+
+    monkeypatch.setattr(auditoria, "ler_aba_sem_cache", lambda aba: abas.get(aba, pd.DataFrame()).copy())
+    monkeypatch.setattr(auditoria, "anexar_no_google", anexar)
+    monkeypatch.setattr(auditoria, "salvar_no_google", salvar)
+    try:
+        auditoria.particionar_log_legado("l1")
+        assert False, "mês que não grava deve interromper a migração"
+    except RuntimeError:
+        pass
+    assert len(abas["l1_log_auditoria"]) == 3  # Log antigo intacto
+    falhar.clear()
+    auditoria.particionar_log_legado("l1")
+    assert abas["l1_log_auditoria"].empty
+    assert len(abas["l1_log_auditoria_2024_01"]) == 2  # Registros iguais e legítimos continuam os dois, sem duplicar na repetição
+    assert len(abas["l1_log_auditoria_2024_02"]) == 1
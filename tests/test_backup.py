@@ -0,0 +1,30 @@
+import io
+import pandas as pd
+from nucleo import backup
+from nucleo.backup import hash_chaves_historico
+
+
+class Upload(io.BytesIO):
+    def __init__(self, nome, texto):
+        super().__init__(texto.encode("utf-8"))
+        self.name = nome
+
+
+def test_hash_ignora_formato():
+    a = pd.DataFrame({'data': ["2024-03-01 10:15:42"], 'produto': ["Café Pilão"], 'qtd': ["2"], 'total_gasto': ["10,5"]})
+    b = pd.DataFrame({'data': ["2024-03-01 10:15"], 'produto': ["CAFE PILAO "], 'qtd': ["2.00"], 'total_gasto': ["10.50"]})
+    c = b.assign(qtd=["3"])
+    assert hash_chaves_historico(a).iloc[0] == hash_chaves_historico(b).iloc[0] != hash_chaves_historico(c).iloc[0]
+
+
+def test_restaurar_anexa_so_linhas_ineditas(monkeypatch):
+    atual = pd.DataFrame({'data': ["2024-03-01 10:15:00"], 'produto': ["Cafe"], 'qtd': ["2"], 'total_gasto': ["10"]})
+    anexadas = []
+    monkeypatch.setattr(backup, "carregar_historico", lambda prefixo, incluir_arquivo=False: atual)
+    monkeypatch.setattr(backup, "anexar_no_google", lambda df, aba: anexadas.append((aba, df)) or True)
+    arquivos = [Upload("a.csv", "data;produto;qtd;total_gasto\n2024-03-01 10:15;CAFÉ;2;10,00\n2024-03-02 08:00;Arroz;1;5\n"),
+                Upload("b.csv", "data,produto,qtd,total_gasto\n2024-03-02 08:00,arroz,1,5\n")]
+    stats = backup.restaurar_historico_por_hash("l1", arquivos)
+    assert stats == {'lidas': 3, 'duplicadas': 2, 'novas': 1}
+    assert anexadas[0][0] == "l1_historico_compras"
+    assert anexadas[0][1]['produto'].tolist() == ["Arroz"]
@@ -0,0 +1,13 @@
+import pandas as pd
+from nucleo.conciliacao import conciliar_estoque
+
+
+def test_outer_join_classifica_cada_codigo():
+    app = pd.DataFrame({'código de barras': ["789.0", "111", "222", ""], 'nome do produto': ["A", "B", "C", "Sem código"],
+                        'qtd.estoque': [5, 3, 1, 9]}, index=[10, 11, 12, 13])
+    plan = pd.DataFrame({'Código de Barras': ["789", "111", "333", None], 'Qtd Estoque': ["5", "4", "2", "1"]})
+    conc = conciliar_estoque(app, plan, 'Código de Barras', 'Qtd Estoque').set_index('código normalizado')
+    assert conc['classificação'].to_dict() == {'111': 'Divergente', '222': 'Só no App', '333': 'Só no Shoppbud', '789': 'OK'}
+    assert conc.loc['111', 'Diferença'] == -1
+    assert conc.loc['222', 'idx_app'] == 12
+    assert pd.isna(conc.loc['333', 'idx_app'])
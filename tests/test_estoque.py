@@ -0,0 +1,28 @@
+import pandas as pd
+from nucleo.estoque import baixar_vendas_relatorio, celulas_alteradas
+
+
+def test_celulas_alteradas():
+    antes = pd.DataFrame({'nome': ["A", "B", "C"], 'qtd': [1.0, None, 3.0], 'validade': pd.to_datetime(["2026-01-01", None, None])}, index=[10, 11, 12])
+    depois = antes.copy()
+    depois.loc[11, 'qtd'] = 5.0
+    depois.loc[12, 'nome'] = "C2"
+    mudou = celulas_alteradas(antes, depois)
+    assert sorted(zip(mudou['rotulo'], mudou['coluna'])) == [(11, 'qtd'), (12, 'nome')]
+    assert celulas_alteradas(antes, antes.copy()).empty  # NaN/NaT dos dois lados não é mudança
+
+
+def test_celulas_alteradas_so_linhas_e_colunas_em_comum():
+    antes = pd.DataFrame({'qtd': [1, 2]}, index=[0, 1])
+    depois = pd.DataFrame({'qtd': [1, 9, 7], 'nova': [0, 0, 0]}, index=[0, 1, 2])
+    assert celulas_alteradas(antes, depois)[['rotulo', 'coluna', 'depois']].values.tolist() == [[1, 'qtd', 9]]
+
+
+def test_baixa_de_vendas_informa_so_as_linhas_que_viraram_venda():
+    df = pd.DataFrame({'nome do produto': ["ARROZ", "FEIJAO"], 'qtd.estoque': [5.0, 5.0]})
+    relatorio = pd.DataFrame({'PRODUTO': ["Arroz", "Feijao", "Inexistente", "feijao"], 'QTD': [1, 0, 2, 2]})
+    linhas = []
+    registros = baixar_vendas_relatorio(df, relatorio, 'PRODUTO', 'QTD', linhas_baixadas=linhas)
+    assert linhas == [0, 3]
+    assert [r['produto'] for r in registros] == ["ARROZ", "FEIJAO"]
+    assert df['qtd.estoque'].tolist() == [4.0, 3.0]
@@ -0,0 +1,26 @@
+import pandas as pd
+from nucleo.ids_vendas import IndiceIds, normalizar_ids
+
+
+def test_contem_inteiros_e_textos():
+    indice = IndiceIds(["123", "9007199254740993", "A-77", "0012"])
+    achados = indice.contem(["123", "9007199254740993", "9007199254740992", "A-77", "0012", "12", "x"])
+    assert achados.tolist() == [True, True, False, True, True, False, False]
+
+
+def test_normaliza_o_ponto_zero_do_excel():
+    assert normalizar_ids([" 55.0", None, 7]).tolist() == ["55", "", "7"]
+    assert IndiceIds(["55"]).contem(["55.0"]).tolist() == [True]
+
+
+def test_acrescentar_alem_da_capacidade_refaz_o_bloom():
+    indice = IndiceIds()
+    novos = [str(i) for i in range(5000)] + [f"T{i}" for i in range(100)]
+    indice.acrescentar(novos)
+    assert len(indice) == len(novos)
+    assert indice.contem(novos).all()
+    assert not indice.contem([str(i) for i in range(5000, 6000)]).any()
+
+
+def test_indice_vazio():
+    assert IndiceIds().contem(pd.Series(["1", "a"])).tolist() == [False, False]
@@ -0,0 +1,37 @@
+import pandas as pd
+from nucleo.lotes import consumir_fefo, corrigir_lotes, demanda_por_codigo, preparar_lotes
+
+
+def lotes(*linhas):
+    return preparar_lotes(pd.DataFrame(linhas, columns=['código de barras', 'produto', 'qtd', 'validade', 'lote']).assign(origem="", data_entrada=""))
+
+
+def test_fefo_baixa_primeiro_o_que_vence_primeiro():
+    df_l = lotes(['1', 'A', 5, '2026-12-01', 'L2'], ['1', 'A', 3, '2026-11-01', 'L1'], ['1', 'A', 4, '', 'SEM'])
+    baixas = consumir_fefo(df_l, pd.Series({'1': 6.0}))
+    assert baixas.set_index('lote')['baixa'].to_dict() == {'L1': 3, 'L2': 3}
+    assert df_l.set_index('lote')['qtd'].to_dict() == {'L2': 2, 'L1': 0, 'SEM': 4}
+
+
+def test_fefo_ignora_demanda_alem_dos_lotes():
+    df_l = lotes(['1', 'A', 2, '2026-11-01', 'L1'])
+    assert consumir_fefo(df_l, pd.Series({'1': 10.0}))['baixa'].tolist() == [2]
+
+
+def test_codigo_vazio_nao_junta_produtos():
+    catalogo = pd.DataFrame({'nome do produto': ['A', 'X', 'Y'], 'código de barras': ['1', '', '']})
+    assert demanda_por_codigo(catalogo, ['A', 'X', 'Y', 'Fora'], [2, 1, 1, 9]).to_dict() == {'1': 2}
+    df_l = lotes(['', 'X', 4, '2026-11-01', ''], ['1', 'A', 4, '2026-11-01', 'L1'])
+    baixas = consumir_fefo(df_l, pd.Series({'1': 1.0, '': 3.0}))
+    assert baixas['código de barras'].tolist() == ['1']
+    assert df_l['qtd'].tolist() == [4, 3]
+
+
+def test_corrigir_lotes_acha_pela_chave_e_nao_pela_posicao():
+    listados = lotes(['2', 'B', 3, '2026-11-02', 'L2'])
+    editados = listados.assign(qtd=0)
+    # A aba mudou depois da listagem: o lote foi para outra linha e outro sumiu
+    df_l = lotes(['9', 'Z', 1, '2026-10-30', 'N'], ['1', 'A', 5, '2026-11-01', 'L1'], ['2', 'B', 3, '2026-11-02', 'L2'])
+    assert corrigir_lotes(df_l, listados, editados) == 1
+    assert df_l['qtd'].tolist() == [1, 5, 0]
+    assert corrigir_lotes(lotes(['1', 'A', 5, '2026-11-01', 'L1']), listados, editados) == 0
@@ -0,0 +1,15 @@
+import pandas as pd
+from nucleo.util import linhas_ainda_ausentes
+
+
+def test_conta_as_repeticoes():
+    novo = pd.DataFrame({'a': ["1", "1", "1", "2"], 'b': ["x", "x", "x", "y"]})
+    existente = pd.DataFrame({'a': ["1"], 'b': ["x"], 'extra': ["?"]})
+    assert linhas_ainda_ausentes(novo, existente).index.tolist() == [1, 2, 3]
+
+
+def test_compara_como_texto():
+    novo = pd.DataFrame({'a': [1, 2], 'b': [None, "z"]})
+    existente = pd.DataFrame({'a': ["1"], 'b': [""]})
+    assert linhas_ainda_ausentes(novo, existente)['a'].tolist() == [2]
+    assert linhas_ainda_ausentes(novo, pd.DataFrame()).equals(novo)